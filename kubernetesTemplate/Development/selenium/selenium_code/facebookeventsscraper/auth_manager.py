@@ -9,16 +9,134 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException
+from tracer import sleep
+from utils import ConfigManager
+
+# Classifies the current login page into one auth state with a single script call.
+# Order matters: code entry pages also mention the authentication app, and the
+# cookie dialog overlays the login form.
+PAGE_STATE_SCRIPT = """
+var url = window.location.href.toLowerCase();
+var text = document.body ? document.body.innerText.toLowerCase() : '';
+var authUrl = /login|checkpoint|two_step|two_factor|auth_platform/.test(url);
+// Only present on an authenticated page, so posts quoting 2FA phrases cannot hide a valid session
+var loggedInMarker = document.querySelector(
+    "[role='feed'], [aria-label='Your profile'], [aria-label='Account controls and settings']");
+
+function has(phrases) {
+    for (var i = 0; i < phrases.length; i++) {
+        if (text.indexOf(phrases[i]) !== -1) { return true; }
+    }
+    return false;
+}
+
+function cookieButton() {
+    var buttons = document.querySelectorAll('button, [role="button"]');
+    for (var i = 0; i < buttons.length; i++) {
+        var label = (buttons[i].innerText || '').toLowerCase();
+        if (label.indexOf('allow all') !== -1 || label.indexOf('accept all') !== -1 ||
+            label.indexOf('allow cookies') !== -1) {
+            return true;
+        }
+    }
+    return false;
+}
+
+var state = 'unknown';
+if (!document.body || document.readyState === 'loading') {
+    state = 'loading';
+} else if (!authUrl && loggedInMarker) {
+    state = 'logged_in';
+} else if (document.querySelector("input[name='approvals_code']")) {
+    state = 'legacy_code';
+} else if (has(['go to your authentication app', 'enter the 6-digit code', 'two-factor authentication app', '6-digit code'])) {
+    state = 'code_entry';
+} else if (has(['choose a way to confirm', 'available confirmation methods', 'notification on another device'])) {
+    state = 'method_selection';
+} else if (has(['check your notifications on another device', 'we sent a notification', 'waiting for approval', 'try another way'])) {
+    state = 'device_approval';
+} else if (has(['save browser', 'trust this device', 'remember browser'])) {
+    state = 'trust_device';
+} else if (cookieButton()) {
+    state = 'cookie_consent';
+} else if (document.querySelector('#email') && document.querySelector('#pass')) {
+    state = 'login_form';
+} else if (!authUrl) {
+    state = 'logged_in';
+}
+return {state: state, url: url};
+"""
+
+# States that are terminal or transient and therefore have no handler
+TERMINAL_STATES = ('logged_in', 'unknown')
 
 class AuthManager:
-    def __init__(self, browser_manager, op_manager):
+    def __init__(self, browser_manager, op_manager, session_store=None):
         self.browser = browser_manager
         self.driver = browser_manager.get_driver()
         self.op_manager = op_manager
+        self.session_store = session_store
+        self.state_timings = []  # (state, seconds) in the order states were visited
     
     def login(self):
         """Enhanced login with specific Facebook 2FA flow"""
+        if self._restore_saved_session():
+            return True
+        
+        try:
+            if not self._full_login():
+                return False
+        finally:
+            # Secrets are only needed during login
+            self.op_manager.clear_cache()
+        
+        self._save_session()
+        return True
+    
+    def _restore_saved_session(self):
+        """Restore the stored session for this account and verify it with one probe"""
+        if not self.session_store:
+            return False
+        
+        account = self.op_manager.item_name
+        session_data = self.session_store.load(account)
+        if not session_data:
+            print("ℹ️ No stored session, using full login")
+            return False
+        
+        print("♻️ Restoring stored session...")
+        if not self.browser.restore_session(session_data):
+            return False
+        
+        if self._probe_session():
+            print("🎉 Stored session is valid, skipping login and 2FA")
+            return True
+        
+        print("⚠️ Stored session rejected, falling back to full login")
+        self.session_store.delete(account)
+        self.driver.delete_all_cookies()
+        return False
+    
+    def _probe_session(self):
+        """Load the home page once and classify it with a single script call"""
+        try:
+            self.driver.get("https://www.facebook.com/")
+            return self._classify_page()["state"] == "logged_in"
+        except Exception as e:
+            print(f"⚠️ Session probe failed: {e}")
+            return False
+    
+    def _save_session(self):
+        """Persist the authenticated session for the next run"""
+        if not self.session_store:
+            return
+        
+        session_data = self.browser.export_session()
+        if session_data:
+            self.session_store.save(self.op_manager.item_name, session_data)
+    
+    def _full_login(self):
+        """Full login with credentials and the Facebook 2FA flow, driven as a state machine"""
         print("🔑 Logging in with enhanced 2FA handling...")
         
         # Get credentials
@@ -27,78 +145,123 @@ class AuthManager:
             print("❌ Could not get credentials from 1Password")
             return False
         
-        # Go to Facebook
-        self.driver.get("https://facebook.com")
-        time.sleep(3)
-        
-        # Handle cookies first
-        self._handle_cookies()
-        
-        # Check if already logged in
-        current_url = self.driver.current_url.lower()
-        if "login" not in current_url and len(current_url.split('/')) <= 4:
-            print("🎉 Already logged in!")
-            return True
-        
-        # Go to login page
+        # Facebook redirects /login to the home page when already logged in
         self.driver.get("https://facebook.com/login")
-        time.sleep(3)
         
         try:
-            # Fill login form
-            if not self._fill_login_form(username, password):
+            return self._run_state_machine(username, password)
+        except Exception as e:
+            print(f"❌ Login error: {e}")
+            return False
+        finally:
+            self._print_state_timings()
+    
+    def _run_state_machine(self, username, password):
+        """Handle the detected state, then wait for the page to move to the next one"""
+        handlers = {
+            'cookie_consent': self._handle_cookies,
+            'login_form': lambda: self._fill_login_form(username, password),
+            'device_approval': self._handle_device_approval_screen,
+            'method_selection': self._handle_authentication_method_selection,
+            'code_entry': self._handle_authenticator_code_entry,
+            'legacy_code': self._handle_legacy_2fa,
+            'trust_device': self._click_continue_button,
+        }
+        visits = {}
+        self.state_timings = []
+        
+        state_started = time.monotonic()
+        state = self._wait_for_state_change('loading')['state']
+        
+        for _ in range(ConfigManager.AUTH_MAX_STEPS):
+            print(f"🧭 Auth state: {state}")
+            
+            if state in TERMINAL_STATES:
+                self._record_state(state, state_started)
+                if state == 'logged_in':
+                    print("✅ Login successful!")
+                    return True
+                
+                self.browser.take_screenshot("auth_unknown_state.png", failure=True)
+                print(f"❌ Login stuck on an unrecognised page: {self.driver.current_url}")
                 return False
             
-            # Handle 2FA flow with device approval → authenticator app
-            auth_success = self._handle_enhanced_2fa_flow()
-            
-            if not auth_success:
-                print("❌ 2FA authentication failed")
+            # Returning to a state we already handled means the previous action did not work
+            visits[state] = visits.get(state, 0) + 1
+            if visits[state] > ConfigManager.AUTH_MAX_STATE_VISITS.get(state, 2):
+                self._record_state(state, state_started)
+                print(f"❌ Login did not get past state '{state}'")
                 return False
             
-            # Verify login
-            if "login" not in self.driver.current_url.lower():
-                print("✅ Login successful!")
-                return True
-            else:
-                print("❌ Login failed")
+            if not handlers[state]():
+                self._record_state(state, state_started)
+                print(f"❌ Could not handle auth state '{state}'")
                 return False
-                
-        except Exception as e:
-            print(f"❌ Login error: {e}")
-            return False
+            
+            next_state = self._wait_for_state_change(state)['state']
+            self._record_state(state, state_started)
+            state_started = time.monotonic()
+            state = next_state
+        
+        print("❌ Login exceeded the maximum number of auth steps")
+        return False
     
-    def _handle_cookies(self):
-        """Handle cookie dialog"""
+    def _classify_page(self):
+        """Run the page state probe; errors count as a page that is still loading"""
         try:
-            print("🍪 Handling cookies...")
-            time.sleep(2)
-            
-            buttons = self.driver.find_elements(By.TAG_NAME, "button")
-            
-            for button in buttons:
-                try:
-                    text = button.text.strip().lower()
-                    if any(phrase in text for phrase in ['allow all', 'accept all', 'allow cookies']):
-                        print(f"🎯 Found cookie button: '{text}'")
-                        self._enhanced_click(button)
-                        print("✅ Cookies accepted")
-                        time.sleep(2)
-                        return
-                except:
-                    continue
-                    
-            print("⚠️ No cookie button found, continuing...")
-        except Exception as e:
-            print(f"⚠️ Cookie handling error: {e}")
+            return self.driver.execute_script(PAGE_STATE_SCRIPT) or {'state': 'loading', 'url': ''}
+        except Exception:
+            return {'state': 'loading', 'url': ''}
+    
+    def _wait_for_state_change(self, previous_state, timeout=None):
+        """Poll the page state with exponential backoff until it leaves previous_state"""
+        timeout = ConfigManager.AUTH_STATE_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        delay = ConfigManager.AUTH_POLL_INITIAL
+        
+        while True:
+            probe = self._classify_page()
+            if probe['state'] not in (previous_state, 'loading'):
+                return probe
+            if time.monotonic() >= deadline:
+                # A page still loading after the timeout is not a recognisable state
+                if probe['state'] == 'loading':
+                    probe['state'] = 'unknown'
+                return probe
+            sleep(delay)
+            delay = min(delay * 2, ConfigManager.AUTH_POLL_MAX)
+    
+    def _record_state(self, state, started):
+        """Record how long the flow spent in a state"""
+        self.state_timings.append((state, time.monotonic() - started))
+    
+    def _print_state_timings(self):
+        """Print where login time went"""
+        if not self.state_timings:
+            return
+        total = sum(seconds for _, seconds in self.state_timings)
+        summary = ", ".join(f"{state} {seconds:.1f}s" for state, seconds in self.state_timings)
+        print(f"⏱️ Login took {total:.1f}s: {summary}")
+    
+    def get_state_timings(self):
+        """Get (state, seconds) pairs from the last full login"""
+        return list(self.state_timings)
+    
+    def _handle_cookies(self):
+        """Handle cookie dialog with the browser's ranked consent strategies"""
+        # The state probe already saw the dialog, so there is nothing to wait for
+        if self.browser.handle_cookie_consent(settle_seconds=0):
+            print("✅ Cookies accepted")
+            return True
+        
+        print("⚠️ No cookie button found, continuing...")
+        return False
     
     def _fill_login_form(self, username, password):
         """Fill the login form with credentials"""
         try:
-            # Fill login form
-            email_field = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "email"))
-            )
+            # The state probe already saw the form, so no wait is needed
+            email_field = self.driver.find_element(By.ID, "email")
             password_field = self.driver.find_element(By.ID, "pass")
             
             email_field.clear()
@@ -117,7 +280,6 @@ class AuthManager:
                 return False
             
             print("⏳ Logging in...")
-            time.sleep(5)
             return True
             
         except Exception as e:
@@ -132,7 +294,6 @@ class AuthManager:
             ("ActionChains click", lambda el: ActionChains(self.driver).move_to_element(el).click().perform()),
             ("Scroll and click", lambda el: (
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", el),
-                time.sleep(1),
                 el.click()
             )),
             ("Send ENTER key", lambda el: el.send_keys(Keys.RETURN)),
@@ -142,7 +303,6 @@ class AuthManager:
             try:
                 print(f"   Trying: {method_name}")
                 click_func(element)
-                time.sleep(1)
                 print(f"   ✅ {method_name} succeeded")
                 return True
             except Exception as e:
@@ -151,114 +311,56 @@ class AuthManager:
         
         return False
     
-    def _handle_enhanced_2fa_flow(self):
-        """Handle the specific Facebook 2FA flow"""
-        try:
-            print("🔐 Checking for 2FA challenges...")
-            time.sleep(3)
-            
-            # Take screenshot to see current state
-            self.browser.take_screenshot("2fa_initial_state.png")
-            print("📸 Initial 2FA screenshot: 2fa_initial_state.png")
-            
-            print(f"🔍 Current URL: {self.driver.current_url.lower()}")
-            
-            # Step 1: Check for device approval screen
-            if self._handle_device_approval_screen():
-                print("✅ Handled device approval screen")
-                time.sleep(3)
-            
-            # Step 2: Check for authentication method selection
-            if self._handle_authentication_method_selection():
-                print("✅ Selected authentication app")
-                time.sleep(3)
-            
-            # Step 3: Handle authenticator app code entry
-            if self._handle_authenticator_code_entry():
-                print("✅ Entered authenticator code")
-                return True
-            
-            # Fallback: Try direct OTP field (legacy 2FA)
-            if self._handle_legacy_2fa():
-                print("✅ Handled legacy 2FA")
-                return True
-            
-            print("ℹ️ No 2FA challenge detected or all methods handled")
-            return True
-            
-        except Exception as e:
-            print(f"❌ 2FA flow error: {e}")
-            return False
+    def _find_first_clickable(self, selectors):
+        """Return the first displayed element matching any XPath (//...) or CSS selector"""
+        for selector in selectors:
+            by = By.XPATH if selector.startswith("//") else By.CSS_SELECTOR
+            try:
+                for element in self.driver.find_elements(by, selector):
+                    if element.is_displayed() and element.is_enabled():
+                        return selector, element
+            except Exception:
+                continue
+        return None, None
     
     def _handle_device_approval_screen(self):
         """Handle device approval screen - Click 'Try another way'"""
         try:
-            print("🔍 Looking for device approval screen...")
+            print("📱 Device approval screen detected!")
             
-            # Look for indicators of device approval screen
-            device_indicators = [
-                "check your notifications on another device",
-                "we sent a notification",
-                "waiting for approval",
-                "try another way"
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            is_device_approval = any(indicator in page_text for indicator in device_indicators)
+            # Take screenshot
+            self.browser.take_screenshot("device_approval_screen.png")
+            
+            # Look for "Try another way" button
+            selector, try_another_element = self._find_first_clickable([
+                "//button[contains(text(), 'Try another way')]",
+                "//a[contains(text(), 'Try another way')]",
+                "//div[contains(text(), 'Try another way')]",
+                "//span[contains(text(), 'Try another way')]",
+                "button[value*='try']",
+                "[data-testid*='try']"
+            ])
+            
+            if try_another_element:
+                print(f"🎯 Found 'Try another way' button: {selector}")
+                self._enhanced_click(try_another_element)
+                print("✅ Clicked 'Try another way'")
+                return True
             
-            if is_device_approval:
-                print("📱 Device approval screen detected!")
-                
-                # Take screenshot
-                self.browser.take_screenshot("device_approval_screen.png")
-                print("📸 Device approval screenshot: device_approval_screen.png")
-                
-                # Look for "Try another way" button
-                try_another_selectors = [
-                    "//button[contains(text(), 'Try another way')]",
-                    "//a[contains(text(), 'Try another way')]",
-                    "//div[contains(text(), 'Try another way')]",
-                    "button[value*='try']",
-                    "[data-testid*='try']"
-                ]
-                
-                for selector in try_another_selectors:
-                    try:
-                        if selector.startswith("//"):
-                            try_another_element = WebDriverWait(self.driver, 3).until(
-                                EC.element_to_be_clickable((By.XPATH, selector))
-                            )
-                        else:
-                            try_another_element = WebDriverWait(self.driver, 3).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                            )
-                        
-                        print(f"🎯 Found 'Try another way' button: {selector}")
-                        self._enhanced_click(try_another_element)
-                        print("✅ Clicked 'Try another way'")
-                        time.sleep(3)
+            # Fallback: Look for any button with "another" in text
+            all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
+            for button in all_buttons:
+                try:
+                    button_text = button.text.strip().lower()
+                    if "another" in button_text or "try" in button_text:
+                        print(f"🎯 Found alternative button: '{button_text}'")
+                        self._enhanced_click(button)
+                        print("✅ Clicked alternative 'Try another way' button")
                         return True
-                        
-                    except TimeoutException:
-                        continue
-                
-                # Fallback: Look for any button with "another" in text
-                all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
-                for button in all_buttons:
-                    try:
-                        button_text = button.text.strip().lower()
-                        if "another" in button_text or "try" in button_text:
-                            print(f"🎯 Found alternative button: '{button_text}'")
-                            self._enhanced_click(button)
-                            print("✅ Clicked alternative 'Try another way' button")
-                            time.sleep(3)
-                            return True
-                    except:
-                        continue
-                
-                print("⚠️ Could not find 'Try another way' button")
-                return False
+                except:
+                    continue
             
+            print("⚠️ Could not find 'Try another way' button")
             return False
             
         except Exception as e:
@@ -268,80 +370,46 @@ class AuthManager:
     def _handle_authentication_method_selection(self):
         """Handle authentication method selection - Select 'Authentication app'"""
         try:
-            print("🔍 Looking for authentication method selection...")
+            print("📋 Authentication method selection screen detected!")
             
             # Take screenshot
             self.browser.take_screenshot("auth_method_selection.png")
-            print("📸 Auth method screenshot: auth_method_selection.png")
-            
-            # Look for indicators of method selection screen
-            method_indicators = [
-                "choose a way to confirm",
-                "authentication app",
-                "available confirmation methods",
-                "notification on another device"
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            is_method_selection = any(indicator in page_text for indicator in method_indicators)
             
-            if is_method_selection:
-                print("📋 Authentication method selection screen detected!")
+            # Look for Authentication app option
+            selector, auth_app_element = self._find_first_clickable([
+                "//div[contains(text(), 'Authentication app')]",
+                "//label[contains(text(), 'Authentication app')]",
+                "//span[contains(text(), 'Authentication app')]",
+                "[data-testid*='auth']",
+                "input[value*='auth']"
+            ])
+            
+            if auth_app_element:
+                print(f"🎯 Found 'Authentication app' option: {selector}")
+                self._enhanced_click(auth_app_element)
+                print("✅ Selected 'Authentication app'")
                 
-                # Look for Authentication app option
-                auth_app_selectors = [
-                    "//div[contains(text(), 'Authentication app')]",
-                    "//label[contains(text(), 'Authentication app')]",
-                    "//span[contains(text(), 'Authentication app')]",
-                    "[data-testid*='auth']",
-                    "input[value*='auth']"
-                ]
-                
-                for selector in auth_app_selectors:
-                    try:
-                        if selector.startswith("//"):
-                            auth_app_element = WebDriverWait(self.driver, 3).until(
-                                EC.element_to_be_clickable((By.XPATH, selector))
-                            )
-                        else:
-                            auth_app_element = WebDriverWait(self.driver, 3).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                            )
-                        
-                        print(f"🎯 Found 'Authentication app' option: {selector}")
-                        self._enhanced_click(auth_app_element)
-                        print("✅ Selected 'Authentication app'")
-                        time.sleep(2)
-                        
-                        # Look for and click Continue button
-                        self._click_continue_button()
-                        return True
+                # Look for and click Continue button
+                return self._click_continue_button()
+            
+            # Fallback: Look for radio buttons and select the one related to auth app
+            radio_buttons = self.driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
+            for radio in radio_buttons:
+                try:
+                    # Look for associated text
+                    parent = radio.find_element(By.XPATH, "./..")
+                    parent_text = parent.text.lower()
+                    if "authentication" in parent_text or "app" in parent_text:
+                        print(f"🎯 Found auth app radio button: '{parent_text}'")
+                        self._enhanced_click(radio)
+                        print("✅ Selected authentication app radio button")
                         
-                    except TimeoutException:
-                        continue
-                
-                # Fallback: Look for radio buttons and select the one related to auth app
-                radio_buttons = self.driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-                for radio in radio_buttons:
-                    try:
-                        # Look for associated text
-                        parent = radio.find_element(By.XPATH, "./..")
-                        parent_text = parent.text.lower()
-                        if "authentication" in parent_text or "app" in parent_text:
-                            print(f"🎯 Found auth app radio button: '{parent_text}'")
-                            self._enhanced_click(radio)
-                            print("✅ Selected authentication app radio button")
-                            time.sleep(2)
-                            
-                            # Click continue
-                            self._click_continue_button()
-                            return True
-                    except:
-                        continue
-                
-                print("⚠️ Could not find 'Authentication app' option")
-                return False
+                        # Click continue
+                        return self._click_continue_button()
+                except:
+                    continue
             
+            print("⚠️ Could not find 'Authentication app' option")
             return False
             
         except Exception as e:
@@ -352,8 +420,9 @@ class AuthManager:
         """Find and click Continue button"""
         continue_button = None
         try:
-            continue_button = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue')]"))
+            # The Continue button is enabled a moment after an option is selected
+            continue_button = WebDriverWait(self.driver, 5, poll_frequency=0.25).until(
+                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue')] | //*[@role='button'][.//text()[contains(., 'Continue')]]"))
             )
         except:
             try:
@@ -365,100 +434,66 @@ class AuthManager:
             print("🎯 Found Continue button")
             self._enhanced_click(continue_button)
             print("✅ Clicked Continue")
-            time.sleep(3)
+            return True
+        
+        print("⚠️ Could not find Continue button")
+        return False
     
     def _handle_authenticator_code_entry(self):
         """Handle authenticator code entry - Enter code from 1Password"""
         try:
-            print("🔍 Looking for authenticator code entry screen...")
+            print("🔐 Authenticator code entry screen detected!")
             
             # Take screenshot
             self.browser.take_screenshot("auth_code_entry.png")
-            print("📸 Auth code screenshot: auth_code_entry.png")
             
-            # Look for indicators of code entry screen
-            code_indicators = [
-                "go to your authentication app",
-                "enter the 6-digit code",
-                "two-factor authentication app",
-                "6-digit code"
-            ]
+            # Get OTP from 1Password
+            print("🔑 Getting OTP from 1Password...")
+            otp_code = self.op_manager.get_otp()
             
-            page_text = self.driver.page_source.lower()
-            is_code_entry = any(indicator in page_text for indicator in code_indicators)
+            if not otp_code:
+                print("❌ Could not get OTP from 1Password")
+                return False
             
-            if is_code_entry:
-                print("🔐 Authenticator code entry screen detected!")
-                
-                # Get OTP from 1Password
-                print("🔑 Getting OTP from 1Password...")
-                otp_code = self.op_manager.get_otp()
-                
-                if not otp_code:
-                    print("❌ Could not get OTP from 1Password")
-                    return False
-                
-                print(f"✅ Retrieved OTP: {otp_code}")
-                
-                # Look for code input field
-                code_field_selectors = [
-                    "input[placeholder*='Code']",
-                    "input[placeholder*='code']",
-                    "input[aria-label*='code']",
-                    "input[name*='code']",
-                    "input[id*='code']",
-                    "input[type='text']",
-                    "input[maxlength='6']"
-                ]
-                
-                for selector in code_field_selectors:
-                    try:
-                        code_field = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                        
-                        print(f"🎯 Found code input field: {selector}")
-                        code_field.clear()
-                        code_field.send_keys(otp_code)
-                        print("✅ Entered OTP code")
-                        time.sleep(2)
-                        
-                        # Look for and click Continue button
-                        continue_selectors = [
-                            "//button[contains(text(), 'Continue')]",
-                            "button[type='submit']",
-                            "input[type='submit']"
-                        ]
-                        
-                        for continue_selector in continue_selectors:
-                            try:
-                                if continue_selector.startswith("//"):
-                                    continue_button = self.driver.find_element(By.XPATH, continue_selector)
-                                else:
-                                    continue_button = self.driver.find_element(By.CSS_SELECTOR, continue_selector)
-                                
-                                print(f"🎯 Found continue button: {continue_selector}")
-                                self._enhanced_click(continue_button)
-                                print("✅ Clicked Continue")
-                                time.sleep(5)
-                                return True
-                                
-                            except:
-                                continue
-                        
-                        # If no continue button, try Enter key
-                        code_field.send_keys(Keys.RETURN)
-                        print("✅ Pressed Enter to submit")
-                        time.sleep(5)
-                        return True
-                        
-                    except TimeoutException:
-                        continue
-                
+            print(f"✅ Retrieved OTP: {otp_code}")
+            
+            # Look for code input field
+            selector, code_field = self._find_first_clickable([
+                "input[placeholder*='Code']",
+                "input[placeholder*='code']",
+                "input[aria-label*='code']",
+                "input[name*='code']",
+                "input[id*='code']",
+                "input[type='text']",
+                "input[maxlength='6']"
+            ])
+            
+            if not code_field:
                 print("⚠️ Could not find code input field")
                 return False
             
-            return False
+            print(f"🎯 Found code input field: {selector}")
+            code_field.clear()
+            code_field.send_keys(otp_code)
+            print("✅ Entered OTP code")
+            
+            # Look for and click Continue button
+            selector, continue_button = self._find_first_clickable([
+                "//button[contains(text(), 'Continue')]",
+                "button[type='submit']",
+                "input[type='submit']"
+            ])
+            
+            if continue_button:
+                print(f"🎯 Found continue button: {selector}")
+                self._enhanced_click(continue_button)
+                print("✅ Clicked Continue")
+                return True
+            
+            # If no continue button, try Enter key
+            code_field.send_keys(Keys.RETURN)
+            print("✅ Pressed Enter to submit")
+            return True
             
         except Exception as e:
             print(f"❌ Authenticator code entry error: {e}")
@@ -467,9 +502,7 @@ class AuthManager:
     def _handle_legacy_2fa(self):
         """Handle legacy 2FA (direct OTP field)"""
         try:
-            otp_field = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.NAME, "approvals_code"))
-            )
+            otp_field = self.driver.find_element(By.NAME, "approvals_code")
             
             print("🔐 Legacy 2FA detected! Getting OTP from 1Password...")
             otp_code = self.op_manager.get_otp()
@@ -482,15 +515,11 @@ class AuthManager:
                 submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
                 self._enhanced_click(submit_button)
                 print("📤 Submitted legacy 2FA code...")
-                time.sleep(5)
                 return True
             else:
                 print("❌ Could not get OTP for legacy 2FA")
                 return False
                 
-        except TimeoutException:
-            print("ℹ️ No legacy 2FA challenge detected")
-            return False
         except Exception as e:
             print(f"⚠️ Legacy 2FA error: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark
+Replays a recorded (or synthetic) session offline and measures each scraping phase:
+wall time, WebDriver commands and time spent in time.sleep
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from selenium.webdriver.common.by import By
+
+from auth_manager import AuthManager, PAGE_STATE_SCRIPT
+from browser_manager import BrowserManager
+from date_parser import DateParser
+from events_scraper import EventsScraper, NEW_EVENT_ANCHORS_SCRIPT, WAIT_FOR_NEW_EVENTS_SCRIPT, VERIFY_DATE_FILTER_SCRIPT
+from http_fetcher import HttpFetcher, HttpEventFetcher
+from near_duplicates import NearDuplicateIndex
+from replay_driver import ReplayDriver, RecordingBuilder
+from search_url import SearchUrlBuilder
+from strategy_ranker import StrategyRanker
+from utils import ConfigManager, Event, EventDeduplicator
+
+class SleepMeter:
+    """Replaces time.sleep to measure (and optionally skip) scraper sleeps"""
+
+    def __init__(self, scale=0.0):
+        self.scale = scale
+        self.total = 0.0
+        self._original = None
+
+    def __enter__(self):
+        self._original = time.sleep
+        time.sleep = self._sleep
+        return self
+
+    def __exit__(self, *exc):
+        time.sleep = self._original
+
+    def _sleep(self, seconds):
+        self.total += seconds
+        if self.scale:
+            self._original(seconds * self.scale)
+
+
+class PhaseRecorder:
+    """Collects wall time, command count and sleep time per phase"""
+
+    def __init__(self, browser, sleep_meter):
+        self.browser = browser
+        self.sleep_meter = sleep_meter
+        self.phases = []
+
+    def run(self, name, func, *args):
+        commands_before = self.browser.command_count
+        sleep_before = self.sleep_meter.total
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.phases.append({
+                "phase": name,
+                "wall_seconds": round(time.perf_counter() - start, 4),
+                "commands": self.browser.command_count - commands_before,
+                "sleep_seconds": round(self.sleep_meter.total - sleep_before, 2)
+            })
+
+
+class FakeOnePassword:
+    """Offline stand-in for OnePasswordManager"""
+
+    item_name = "Benchmark"
+
+    def get_credentials(self):
+        return "benchmark@example.com", "password"
+
+    def get_otp(self):
+        return "123456"
+
+    def clear_cache(self):
+        pass
+
+
+def build_synthetic_recording(city_name="Timișoara", total_events=60, batch_size=20):
+    """Deterministic recording of a login + search + scroll session for CI"""
+    builder = RecordingBuilder()
+    element = RecordingBuilder.element
+
+    # Login: form → code entry → logged in, with a repeated probe to exercise backoff
+    builder.add("execute_script", PAGE_STATE_SCRIPT,
+                {"state": "login_form", "url": "https://www.facebook.com/login/"},
+                {"state": "login_form", "url": "https://www.facebook.com/login/"},
+                {"state": "code_entry", "url": "https://www.facebook.com/checkpoint/"},
+                {"state": "code_entry", "url": "https://www.facebook.com/checkpoint/"},
+                {"state": "logged_in", "url": "https://www.facebook.com/"})
+    for locator in [(By.ID, "email"), (By.ID, "pass"), (By.NAME, "login")]:
+        builder.add("find_element", locator, element(tag_name="input"))
+    builder.add("find_elements", (By.CSS_SELECTOR, "input[placeholder*='Code']"), [element(tag_name="input")])
+    builder.add("find_elements", (By.XPATH, "//button[contains(text(), 'Continue')]"), [element("Continue", "button")])
+
+    # Date filter: the URL filter is confirmed by the page; the first "This week" pattern
+    # (UI fallback) matches an unchecked checkbox
+    search_url = SearchUrlBuilder(city_name).this_week().build()
+    builder.add("get", search_url, search_url)
+    builder.add("execute_script", VERIFY_DATE_FILTER_SCRIPT, "this week")
+    builder.add("find_element", (By.XPATH, ConfigManager.THIS_WEEK_PATTERNS[0]), element(tag_name="input", type="checkbox"))
+
+    # Scrolling: anchors arrive in batches, then the page is exhausted
+    anchors = [
+        {
+            "href": f"https://www.facebook.com/events/{100000 + i}/?acontext=benchmark",
+            "text": f"Today at {18 + i % 6}:00\nBenchmark event number {i}\n{city_name}, Romania",
+            "aria_label": ""
+        }
+        for i in range(total_events)
+    ]
+    # The page returns only anchors it has not returned before, so each batch arrives once
+    builder.add("execute_script", NEW_EVENT_ANCHORS_SCRIPT,
+                {"count": batch_size, "anchors": anchors[:batch_size]},
+                {"count": total_events, "anchors": []})
+
+    waits = []
+    for count in range(batch_size * 2, total_events + 1, batch_size):
+        waits.append({"count": count, "anchors": anchors[count - batch_size:count], "elapsed_ms": 650, "reason": "loaded"})
+    waits.append({"count": total_events, "anchors": [], "elapsed_ms": 1500, "reason": "timeout"})
+    builder.add("execute_async_script", WAIT_FOR_NEW_EVENTS_SCRIPT, *waits)
+    return builder.recording
+
+
+def run_benchmark(recording, city_name="Timișoara", latency=0.0, sleep_scale=0.0):
+    """Replay the recording through each scraper phase and return per-phase metrics"""
+    driver = ReplayDriver(recording, latency=latency)
+    browser = BrowserManager([])
+    browser.attach_driver(driver)
+    browser.strategy_ranker = StrategyRanker()  # In memory, so runs do not learn from each other
+
+    with SleepMeter(sleep_scale) as sleep_meter:
+        recorder = PhaseRecorder(browser, sleep_meter)
+        auth = AuthManager(browser, FakeOnePassword())
+        scraper = EventsScraper(browser)
+
+        recorder.run("authenticate", auth.login)
+        search = SearchUrlBuilder(city_name).this_week()
+        recorder.run("search", driver.get, search.build())
+        recorder.run("date_filter", scraper._apply_date_filter, search)
+        recorder.run("scroll", scraper._scroll_to_load_events)
+        events = recorder.run("extract", scraper._extract_events_enhanced, city_name, 1, True)
+        unique_events = recorder.run("dedup", scraper._remove_duplicates, events)
+
+    return {
+        "events": len(unique_events),
+        "phases": recorder.phases,
+        "total": {
+            "wall_seconds": round(sum(p["wall_seconds"] for p in recorder.phases), 4),
+            "commands": sum(p["commands"] for p in recorder.phases),
+            "sleep_seconds": round(sum(p["sleep_seconds"] for p in recorder.phases), 2)
+        }
+    }
+
+
+LEGACY_DATE_WORDS = [
+    'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
+    'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+    'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
+    'today', 'tomorrow', 'tonight', 'this week', 'next week'
+]
+
+
+def legacy_parse_event_text(lines):
+    """Previous substring-based parser, kept only as the benchmark baseline"""
+    event_title = max(lines, key=len).strip()
+    event_date = ""
+    event_location = ""
+    for line in lines:
+        lower_line = line.strip().lower()
+        if not event_date and any(word in lower_line for word in LEGACY_DATE_WORDS):
+            event_date = line.strip()
+        elif not event_location and (len(line.strip().split()) > 1 and len(line.strip()) > 5):
+            if line.strip() != event_title:
+                event_location = line.strip()
+    if event_date and event_title == event_date and len(lines) > 1:
+        for i in range(1, len(lines)):
+            if not any(word in lines[i].strip().lower() for word in LEGACY_DATE_WORDS) and \
+                    not (len(lines[i].strip().split()) > 1 and len(lines[i].strip()) > 5):
+                event_title = lines[i].strip()
+                break
+    return event_title, event_date, event_location
+
+
+def build_text_corpus(size):
+    """Deterministic event card texts, including words that used to pollute dates"""
+    dates = ["Sat, Oct 25", "Tomorrow at 20:00", "Fri, 7 PM", "This week", "Nov 3 – Nov 5"]
+    titles = ["Jazz night with Simon", "Sunset rooftop party", "Monument walking tour",
+              "Techno marathon", "Decorations workshop", "Maybe later open mic"]
+    venues = ["Club Control, Timișoara", "Sunset Bar", "Piața Unirii", "Online"]
+    corpus = []
+    for i in range(size):
+        lines = [titles[i % len(titles)], venues[i % len(venues)]]
+        if i % 3:
+            lines.insert(0, dates[i % len(dates)])
+        corpus.append(lines)
+    return corpus
+
+
+def benchmark_text_parsing(size=100000):
+    """Compare the compiled matcher with the legacy substring parser"""
+    scraper = EventsScraper.__new__(EventsScraper)
+    corpus = build_text_corpus(size)
+
+    start = time.perf_counter()
+    legacy = [legacy_parse_event_text(lines) for lines in corpus]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [scraper._parse_event_text(lines) for lines in corpus]
+    compiled_seconds = time.perf_counter() - start
+
+    legacy_dates = sum(1 for _, date, _ in legacy if date)
+    compiled_dates = sum(1 for _, date, _ in compiled if date)
+    print(f"Parsed {size:,} event cards")
+    print(f"   legacy substring scan: {legacy_seconds:.3f}s ({legacy_dates:,} dates)")
+    print(f"   compiled matcher:      {compiled_seconds:.3f}s ({compiled_dates:,} dates)")
+    print(f"   speedup: {legacy_seconds / compiled_seconds:.2f}x, false dates removed: {legacy_dates - compiled_dates:,}")
+
+    # Date strings repeat across cards, so most parses are cache hits; the window test is two comparisons
+    date_parser = DateParser()
+    start = time.perf_counter()
+    timestamps = [date_parser.timestamps(date) for _, date, _ in compiled if date]
+    dates_seconds = time.perf_counter() - start
+    window = date_parser.this_week()
+    start = time.perf_counter()
+    in_window = sum(1 for first, last in timestamps if DateParser.in_window(first, last, window))
+    window_seconds = time.perf_counter() - start
+    print(f"   date parsing:          {dates_seconds:.3f}s ({len(date_parser._cache)} distinct strings, "
+          f"{date_parser.cache_hits:,} cache hits)")
+    print(f"   this week filter:      {window_seconds:.3f}s ({in_window:,} of {len(timestamps):,} dated events)")
+    return {"events": size, "legacy_seconds": legacy_seconds, "compiled_seconds": compiled_seconds,
+            "legacy_dates": legacy_dates, "compiled_dates": compiled_dates,
+            "date_parse_seconds": dates_seconds, "date_cache_hits": date_parser.cache_hits,
+            "window_seconds": window_seconds}
+
+
+class LegacyDeduplicator:
+    """String-keyed duplicate check (link without query, title filtered per character), the baseline"""
+
+    def __init__(self):
+        self.seen_links = set()
+        self.seen_titles = set()
+
+    def add(self, event):
+        link = (event.get('Link') or '').strip().split('?')[0].rstrip('/')
+        title = ''.join(filter(str.isalnum, (event.get('Title') or '').strip()[:70].lower()))
+        title = title if len(title) > 10 else ''
+        if (link and link in self.seen_links) or (title and title in self.seen_titles):
+            return False
+        if link:
+            self.seen_links.add(link)
+        if title:
+            self.seen_titles.add(title)
+        return True
+
+
+def iter_dedup_corpus(size, with_ids):
+    """Events with realistic 16 digit ids; every tenth repeats an earlier event under another tracking link"""
+    for i in range(size):
+        n = i - 7 if i % 10 == 9 else i
+        event_id = 1000000000000000 + n * 7919
+        event = {
+            'Title': f"Benchmark event {n}" if n % 2 else "",  # Half the cards have no usable title
+            'Link': f"https://www.facebook.com/events/{event_id}/?acontext=%7B%22ref%22%3A{i % 52}%7D"
+        }
+        if with_ids:
+            event['Event_Id'] = event_id  # Set at extraction time by the scraper
+        yield event
+
+
+def set_memory(*sets):
+    """Bytes held by sets and their keys"""
+    return sum(sys.getsizeof(keys) + sum(sys.getsizeof(key) for key in keys) for keys in sets)
+
+
+def benchmark_dedup(size=1000000):
+    """Dedup of `size` events: string link keys against integer event ids"""
+    start = time.perf_counter()
+    for _ in iter_dedup_corpus(size, True):
+        pass
+    corpus_seconds = time.perf_counter() - start
+
+    results = {}
+    for name, deduplicator, with_ids in (("string links", LegacyDeduplicator(), False),
+                                         ("integer ids", EventDeduplicator(), True)):
+        start = time.perf_counter()
+        unique = sum(1 for event in iter_dedup_corpus(size, with_ids) if deduplicator.add(event))
+        seconds = time.perf_counter() - start - corpus_seconds  # Dedup cost only
+        key_sets = [deduplicator.seen_links] + ([deduplicator.seen_ids] if with_ids else [])
+        results[name] = {"seconds": seconds, "unique": unique,
+                         "key_bytes": set_memory(*key_sets), "title_bytes": set_memory(deduplicator.seen_titles)}
+        del deduplicator
+
+    print(f"Deduplicated {size:,} events (building them took {corpus_seconds:.3f}s, not counted)")
+    for name, result in results.items():
+        print(f"   {name:<13} {result['seconds']:.3f}s, {result['unique']:,} unique, "
+              f"keys {result['key_bytes'] / 2 ** 20:.1f} MiB, titles {result['title_bytes'] / 2 ** 20:.1f} MiB")
+    return results
+
+
+def build_near_duplicate_corpus(size, copy_every=10, seed=7):
+    """Distinct events plus reposted copies (new id, altered case and punctuation); returns (events, copy ids)"""
+    rng = random.Random(seed)
+    syllables = ["ja", "zz", "tek", "no", "sun", "set", "ro", "of", "pe", "ra", "co", "me", "dy", "mar",
+                 "ket", "work", "shop", "fes", "ti", "val", "ni", "ght", "li", "ve", "qu", "iz", "bru", "nch"]
+    venues = [f"{rng.choice(syllables).title()}{rng.choice(syllables)} {kind}"
+              for kind in ("Club", "Hall", "Bar", "Garden", "Theatre") for _ in range(8)]
+    events, copies, titles = [], set(), set()
+    for i in range(size):
+        if i % copy_every == copy_every - 1:
+            original = events[i - 3]
+            title = original.title.upper().replace(" ", " - ", 1) + "!"
+            events.append(Event(title=title, link=f"https://www.facebook.com/events/{2000000 + i}/",
+                                venue=original.venue, start_timestamp=original.start_timestamp, event_id=2000000 + i))
+            copies.add(2000000 + i)
+            continue
+        title = None
+        while not title or title in titles:
+            title = " ".join("".join(rng.choice(syllables) for _ in range(rng.randint(2, 3)))
+                             for _ in range(rng.randint(3, 5))).capitalize()
+        titles.add(title)
+        events.append(Event(title=title, link=f"https://www.facebook.com/events/{1000000 + i}/",
+                            venue=rng.choice(venues), start_timestamp=1790000000 + rng.randrange(180) * 86400,
+                            event_id=1000000 + i))
+    return events, copies
+
+
+def benchmark_near_duplicates(size=10000):
+    """Index `size` events: candidate comparisons per event against an all-pairs scan, and copies found"""
+    events, copies = build_near_duplicate_corpus(size)
+    index = NearDuplicateIndex()
+
+    start = time.perf_counter()
+    index.annotate(events, "Benchmark")
+    seconds = time.perf_counter() - start
+
+    flagged = {event.event_id for event in events if event.duplicate_of}
+    all_pairs = size * (size - 1) // 2
+    print(f"Indexed {size:,} events in {seconds:.3f}s ({seconds / size * 1000:.2f} ms per event)")
+    print(f"   comparisons: {index.comparisons:,} ({index.comparisons / size:.1f} per event, all-pairs {all_pairs:,})")
+    print(f"   copies found: {len(flagged & copies):,} of {len(copies):,}, false matches: {len(flagged - copies):,}")
+    return {"events": size, "seconds": seconds, "comparisons": index.comparisons, "all_pairs": all_pairs,
+            "copies": len(copies), "found": len(flagged & copies), "false_matches": len(flagged - copies)}
+
+
+# Fixture page for the request blocking benchmark: (path, content type, size in bytes)
+FIXTURE_ASSETS = (
+    [(f"/img/photo_{i}.jpg", "image/jpeg", 256 * 1024) for i in range(12)] +
+    [("/media/clip.mp4", "video/mp4", 2 * 1024 * 1024),
+     ("/fonts/display.woff2", "font/woff2", 128 * 1024),
+     ("/tracking/pixel.js", "application/javascript", 64 * 1024)]
+)
+FIXTURE_TRACKING_PATTERNS = ["*/tracking/*"]
+
+
+class HeavyAssetsHandler(BaseHTTPRequestHandler):
+    """Serves an events page with heavy images, video, fonts and a tracking script"""
+
+    def do_GET(self):
+        assets = {path: (content_type, size) for path, content_type, size in FIXTURE_ASSETS}
+        if self.path in assets:
+            content_type, size = assets[self.path]
+            body = bytes(size)
+        else:
+            content_type = "text/html; charset=utf-8"
+            images = "".join(f'<img src="{path}">' for path, kind, _ in FIXTURE_ASSETS if kind == "image/jpeg")
+            body = (
+                "<html><head><style>@font-face{font-family:d;src:url(/fonts/display.woff2)}"
+                "body{font-family:d}</style><script src=\"/tracking/pixel.js\"></script></head><body>"
+                f"{images}<video src=\"/media/clip.mp4\" preload=\"auto\"></video>"
+                + "".join(f'<a href="/events/{100000 + i}/">Fixture event {i}</a>' for i in range(20))
+                + "</body></html>"
+            ).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def benchmark_request_blocking(selenium_ports, fixture_host="localhost", settle_seconds=3):
+    """Load a local heavy-asset page with and without CDP blocking on a live browser and compare
+
+    Manual check: needs Chrome reachable on one of selenium_ports or a local chromedriver.
+    tests/test_request_blocker.py runs it when chromedriver is installed.
+    """
+    server = ThreadingHTTPServer(("0.0.0.0", 0), HeavyAssetsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{fixture_host}:{server.server_address[1]}/"
+
+    browser = BrowserManager(selenium_ports)
+    blocker = browser.request_blocker
+    blocker.enabled = False  # Baseline first; blocking is switched on below
+    if not browser.setup_driver():
+        print("❌ Request blocking benchmark needs a live Chrome (remote Selenium or local chromedriver)")
+        server.shutdown()
+        return None
+
+    results = {}
+    try:
+        browser.execute_cdp("Network.enable")
+        browser.execute_cdp("Network.setCacheDisabled", {"cacheDisabled": True})
+        blocker.patterns += FIXTURE_TRACKING_PATTERNS
+
+        for label, blocking in (("unblocked", False), ("blocked", True)):
+            blocker.enabled = blocking
+            if blocking:
+                blocker.enable()
+            else:
+                blocker.disable()
+            browser.poll_network_events()
+            blocker._reset()
+
+            browser.driver.get(url)
+            time.sleep(settle_seconds)  # Let the video preload and late assets finish
+            results[label] = blocker.report(f"fixture ({label})")
+    finally:
+        browser.quit()
+        server.shutdown()
+
+    unblocked, blocked = results["unblocked"], results["blocked"]
+    print(f"Request blocking on {url}")
+    print(f"   unblocked: {unblocked['loaded_requests']} requests, {unblocked['loaded_bytes'] / 1024:.0f} KiB")
+    print(f"   blocked:   {blocked['loaded_requests']} requests, {blocked['loaded_bytes'] / 1024:.0f} KiB "
+          f"({blocked['blocked_requests']} blocked)")
+    print(f"   saved: {unblocked['loaded_requests'] - blocked['loaded_requests']} requests, "
+          f"{(unblocked['loaded_bytes'] - blocked['loaded_bytes']) / 1024:.0f} KiB measured, "
+          f"{blocked['estimated_bytes_saved'] / 1024:.0f} KiB estimated by the blocker")
+    return results
+
+
+def build_recorded_search_pages(city_name, total_events=60, page_size=20):
+    """Lightweight search result pages as the HTML variant serves them, each linking to the next"""
+    pages = []
+    for start in range(0, total_events, page_size):
+        cards = "".join(
+            f'<div><a href="/events/{100000 + i}/?acontext=benchmark"><div><span>Today at {18 + i % 6}:00</span></div>'
+            f'<div>Benchmark event number {i}</div><div>{city_name}, Romania</div></a></div>'
+            for i in range(start, min(start + page_size, total_events))
+        )
+        next_link = ""
+        if start + page_size < total_events:
+            next_link = f'<a href="/events/search/?{urlencode({"q": city_name, "page": len(pages) + 1})}">See more</a>'
+        pages.append(
+            '<html><head><title>Events</title></head><body><a href="/events/">Events</a>'
+            f'<a href="/events/discovery/">Discover</a>{cards}{next_link}</body></html>'
+        )
+    return pages
+
+
+class RecordedSearchHandler(BaseHTTPRequestHandler):
+    """Stand-in for the search host: serves recorded pages, redirects to a checkpoint without the session cookie"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real host
+    pages = []
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/checkpoint"):
+            self._send(200, "<html><body><form action='/checkpoint/submit'>Confirm your identity</form></body></html>")
+        elif "c_user=" not in (self.headers.get("Cookie") or ""):
+            self._send(302, "", {"Location": "/checkpoint/?next=search"})
+        else:
+            page = int(parse_qs(parts.query).get("page", ["0"])[0])
+            self._send(200, self.pages[min(page, len(self.pages) - 1)], {"Set-Cookie": "fr=rotated; Path=/"})
+
+    def _send(self, status, html, headers=None):
+        body = html.encode("utf-8")
+        self.send_response(status)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def benchmark_http_fetch(city_name="Timișoara", total_events=60, page_size=20, latency=0.0):
+    """Scrape recorded search pages from a local server over HTTP, then check the checkpoint fallback"""
+    RecordedSearchHandler.pages = build_recorded_search_pages(city_name, total_events, page_size)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedSearchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/events/search/"
+    original_base_url = ConfigManager.HTTP_SEARCH_BASE_URL
+    ConfigManager.HTTP_SEARCH_BASE_URL = base_url
+
+    results = {}
+    try:
+        session_cookies = [{"name": "c_user", "value": "1000", "domain": "127.0.0.1"}]
+        for label, cookies in (("http", session_cookies), ("checkpoint_fallback", [])):
+            # The replayed browser only runs when the HTTP engine hands over
+            driver = ReplayDriver(build_synthetic_recording(city_name, total_events), latency=latency)
+            browser = BrowserManager([])
+            browser.attach_driver(driver)
+            browser.strategy_ranker = StrategyRanker()
+            client = HttpFetcher(cookies)
+            scraper = EventsScraper(browser, http_fetcher=HttpEventFetcher(client))
+
+            with SleepMeter() as sleep_meter:
+                start = time.perf_counter()
+                events = list(scraper.iter_events(city_name))
+                seconds = time.perf_counter() - start
+            client.close()
+
+            results[label] = {
+                "events": len(events),
+                "wall_seconds": round(seconds, 4),
+                "http_requests": client.requests,
+                "http_bytes": client.bytes_received,
+                "webdriver_commands": browser.command_count,
+                "sleep_seconds": round(sleep_meter.total, 2)
+            }
+    finally:
+        ConfigManager.HTTP_SEARCH_BASE_URL = original_base_url
+        server.shutdown()
+
+    print("\n" + "=" * 72)
+    print(f"{'mode':<22}{'events':>8}{'wall (s)':>10}{'http req':>10}{'KiB':>8}{'wd cmds':>8}{'sleep':>6}")
+    print("-" * 72)
+    for label, row in results.items():
+        print(f"{label:<22}{row['events']:>8}{row['wall_seconds']:>10.4f}{row['http_requests']:>10}"
+              f"{row['http_bytes'] / 1024:>8.1f}{row['webdriver_commands']:>8}{row['sleep_seconds']:>6.1f}")
+    print("=" * 72)
+    return results
+
+
+def print_report(result):
+    """Print a compact per-phase table"""
+    print("\n" + "=" * 60)
+    print(f"{'phase':<14}{'wall (s)':>12}{'commands':>12}{'sleep (s)':>12}")
+    print("-" * 60)
+    for phase in result["phases"] + [dict(result["total"], phase="TOTAL")]:
+        print(f"{phase['phase']:<14}{phase['wall_seconds']:>12.4f}{phase['commands']:>12}{phase['sleep_seconds']:>12.2f}")
+    print("=" * 60)
+    print(f"Events extracted: {result['events']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark on a recorded session")
+    parser.add_argument("--recording", help="Recording JSON from FacebookEventsScraper(record_path=...); synthetic if omitted")
+    parser.add_argument("--city", default="Timișoara")
+    parser.add_argument("--events", type=int, default=60, help="Events in the synthetic recording")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected seconds per WebDriver command")
+    parser.add_argument("--sleep-scale", type=float, default=0.0, help="Fraction of requested sleeps to actually sleep")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--parser-events", type=int, help="Only run the text parsing micro-benchmark on N events")
+    parser.add_argument("--dedup-events", type=int, help="Only run the dedup micro-benchmark on N events (e.g. 1000000)")
+    parser.add_argument("--near-duplicate-events", type=int,
+                        help="Only run the MinHash/LSH near-duplicate micro-benchmark on N events")
+    parser.add_argument("--blocking-fixture", action="store_true",
+                        help="Only compare page weight with/without request blocking on a live browser")
+    parser.add_argument("--ports", type=int, nargs="*", default=ConfigManager.DEFAULT_SELENIUM_PORTS,
+                        help="Selenium ports for --blocking-fixture")
+    parser.add_argument("--fixture-host", default="localhost", help="Host name the browser uses to reach this machine")
+    parser.add_argument("--http-fixture", action="store_true",
+                        help="Only scrape recorded search pages over HTTP from a local server (and check the fallback)")
+    args = parser.parse_args()
+
+    if args.parser_events:
+        benchmark_text_parsing(args.parser_events)
+        return
+
+    if args.dedup_events:
+        benchmark_dedup(args.dedup_events)
+        return
+
+    if args.near_duplicate_events:
+        benchmark_near_duplicates(args.near_duplicate_events)
+        return
+
+    if args.blocking_fixture:
+        benchmark_request_blocking(args.ports, args.fixture_host)
+        return
+
+    if args.http_fixture:
+        benchmark_http_fetch(args.city, args.events, latency=args.latency)
+        return
+
+    recording = args.recording or build_synthetic_recording(args.city, args.events)
+    result = run_benchmark(recording, args.city, args.latency, args.sleep_scale)
+    print_report(result)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"💾 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
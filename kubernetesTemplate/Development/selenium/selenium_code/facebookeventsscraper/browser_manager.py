@@ -3,17 +3,32 @@ Browser Manager Module
 Handles all browser setup, connection, and basic operations
 """
 
+import json
 import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from request_blocker import RequestBlocker
+from screenshot_manager import ScreenshotManager
+from strategy_ranker import StrategyRanker
+from tracer import sleep
+from utils import ConfigManager
 
 class BrowserManager:
     def __init__(self, selenium_ports=[30479, 30444, 4444]):
         self.selenium_ports = selenium_ports
         self.driver = None
+        self.command_count = 0  # WebDriver commands sent over the remote link
+        self.screenshots = ScreenshotManager()
+        self.network_listeners = []  # Called with (method, params) for each Network.* event
+        self.request_blocker = RequestBlocker(self)
+        self.strategy_ranker = StrategyRanker.shared()  # Which cookie/date-filter strategies worked before
 
     def setup_driver(self):
         """Use proven remote Selenium setup"""
@@ -22,6 +37,8 @@ class BrowserManager:
             
             if self.connect():
                 print("✅ Connected to remote Selenium successfully!")
+                self._track_commands()
+                self.request_blocker.enable()
                 return True
             else:
                 print("❌ Could not connect to remote Selenium")
@@ -40,12 +57,14 @@ class BrowserManager:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")  # Speed up by not loading images
-        chrome_options.add_argument("--disable-javascript")  # Optional: disable JS if not needed
+        # Images, media and fonts are blocked over CDP (RequestBlocker); Chrome has no
+        # --disable-images/--disable-javascript switches
+        # Network events go to the performance log so pages can be measured
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
 
-        # Try remote Selenium first
-        for port in self.selenium_ports:
+        # Try remote Selenium first, best-ranked healthy endpoint first
+        for port in self._rank_selenium_endpoints():
             try:
                 print(f"🔍 Trying to connect to remote Selenium at port {port}...")
                 self.driver = webdriver.Remote(
@@ -53,6 +72,7 @@ class BrowserManager:
                     options=chrome_options
                 )
                 print(f"✅ Connected to remote Selenium on port {port}")
+                self._remember_endpoint(port)
                 return True
             except Exception as e:
                 print(f"❌ Remote port {port} failed: {str(e)[:100]}...")
@@ -75,6 +95,85 @@ class BrowserManager:
         print("❌ All browser connection attempts failed")
         return False
     
+    def _rank_selenium_endpoints(self):
+        """Probe all Selenium /status endpoints concurrently and return every port, best first
+
+        Ready ports come first, then ports that answered HTTP but are busy or have no usable /status
+        (a busy grid can still queue the session). Refused or timed-out ports are dropped so
+        webdriver.Remote does not wait out their connect timeout, unless no port answered at all.
+        """
+        if not self.selenium_ports:
+            return []
+
+        print(f"📡 Probing {len(self.selenium_ports)} Selenium endpoints...")
+        with ThreadPoolExecutor(max_workers=len(self.selenium_ports)) as executor:
+            probes = list(executor.map(self._probe_selenium_endpoint, self.selenium_ports))
+
+        last_good = self._load_last_endpoint()
+        ready = [probe for probe in probes if probe["ready"]]
+        for probe in probes:
+            if probe["ready"]:
+                print(f"   ✅ Port {probe['port']}: ready, {probe['free_slots']} free slots, {probe['latency'] * 1000:.0f}ms")
+            else:
+                print(f"   ❌ Port {probe['port']}: {probe['error'] or 'not ready'}")
+
+        # The last endpoint that worked while it has a free slot, then most free slots, then the fastest answer
+        ready.sort(key=lambda probe: (not (probe["port"] == last_good and probe["free_slots"]),
+                                      -probe["free_slots"], probe["latency"]))
+        not_ready = sorted((probe for probe in probes if not probe["ready"] and probe["answered"]),
+                           key=lambda probe: probe["port"] != last_good)
+        if not ready and not not_ready:
+            print("   ⚠️ No Selenium endpoint answered; trying every port anyway")
+            return sorted(self.selenium_ports, key=lambda port: port != last_good)
+        return [probe["port"] for probe in ready + not_ready]
+
+    def _probe_selenium_endpoint(self, port):
+        """Query one grid's status endpoint with a short timeout"""
+        probe = {"port": port, "ready": False, "answered": False, "free_slots": 0, "latency": 0.0, "error": None}
+        start = time.monotonic()
+        try:
+            url = f"http://localhost:{port}/wd/hub/status"
+            with urllib.request.urlopen(url, timeout=ConfigManager.SELENIUM_PROBE_TIMEOUT) as response:
+                probe["answered"] = True
+                status = json.loads(response.read().decode("utf-8")).get("value", {})
+        except urllib.error.HTTPError as e:
+            # A server is listening, /status just is not served there
+            probe["answered"] = True
+            probe["error"] = f"HTTP {e.code}"
+            return probe
+        except Exception as e:
+            probe["error"] = str(e)[:80]
+            return probe
+
+        probe["latency"] = time.monotonic() - start
+        probe["ready"] = bool(status.get("ready"))
+
+        nodes = status.get("nodes")
+        if nodes is None:
+            # Selenium 3 and some standalone builds do not report slots
+            probe["free_slots"] = 1 if probe["ready"] else 0
+        else:
+            probe["free_slots"] = sum(
+                1 for node in nodes for slot in node.get("slots", []) if slot.get("session") is None
+            )
+        return probe
+
+    def _load_last_endpoint(self):
+        """Read the last known-good Selenium port"""
+        try:
+            with open(ConfigManager.SELENIUM_ENDPOINT_CACHE, "r", encoding="utf-8") as f:
+                return json.load(f).get("port")
+        except Exception:
+            return None
+
+    def _remember_endpoint(self, port):
+        """Cache the Selenium port that worked for the next run"""
+        try:
+            with open(ConfigManager.SELENIUM_ENDPOINT_CACHE, "w", encoding="utf-8") as f:
+                json.dump({"port": port, "timestamp": time.time()}, f)
+        except Exception as e:
+            print(f"⚠️ Could not cache Selenium endpoint: {e}")
+
     def _try_local_chrome_with_chromedriver(self, chrome_options):
         """Try local Chrome with ChromeDriver"""
         print("🔄 Trying local Chrome with system ChromeDriver...")
@@ -136,9 +235,126 @@ class BrowserManager:
         except Exception:
             return False
 
+    def attach_driver(self, driver):
+        """Use an existing driver (e.g. a replay driver) instead of connecting"""
+        self.driver = driver
+        self._track_commands()
+        return True
+
+    def start_recording(self, path):
+        """Record command responses of this session for offline replay
+
+        The recording is plaintext JSON holding HTML snapshots of logged-in pages (feed,
+        search results, names); treat it like a session cookie and never commit it. Run the
+        login inside recording_redacted() so login, 2FA and device approval pages are left out.
+        """
+        from replay_driver import RecordingDriver
+        self.driver = RecordingDriver(self.driver, path)
+        return self.driver
+
+    def recording_redacted(self):
+        """Context in which a recording keeps no page snapshots or typed values (no-op when not recording)"""
+        if hasattr(self.driver, "redacted"):
+            return self.driver.redacted()
+        return nullcontext()
+
+    def _track_commands(self):
+        """Count every WebDriver command (driver and element calls) sent to Selenium"""
+        original_execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.command_count += 1
+            return original_execute(driver_command, params)
+
+        self.driver.execute = counting_execute
+
+    def execute_cdp(self, cmd, params=None):
+        """Run a Chrome DevTools Protocol command on local or remote Chrome"""
+        executor = getattr(self.driver, "command_executor", None)
+        if executor is not None and hasattr(executor, "get_command") and not executor.get_command("executeCdpCommand"):
+            # Plain RemoteConnection does not know the chromedriver CDP endpoint
+            executor.add_command("executeCdpCommand", "POST", "/session/$sessionId/goog/cdp/execute")
+        return self.driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
+
+    def add_network_listener(self, listener):
+        """Register a callable(method, params) for Network.* events from the performance log"""
+        self.network_listeners.append(listener)
+
+    def poll_network_events(self):
+        """Drain Chrome's performance log and pass each Network.* event to the listeners"""
+        if not self.driver:
+            return 0
+        try:
+            entries = self.driver.execute("getLog", {"type": "performance"})["value"] or []
+        except Exception as e:
+            print(f"⚠️ Could not read performance log: {str(e)[:100]}")
+            return 0
+
+        count = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get("method", "")
+            if not method.startswith("Network."):
+                continue
+            count += 1
+            for listener in self.network_listeners:
+                listener(method, message.get("params", {}))
+        return count
+
+    def export_session(self):
+        """Export cookies and local storage of the current site"""
+        try:
+            return {
+                "cookies": self.driver.get_cookies(),
+                # Read past any recorder: local storage holds session tokens
+                "local_storage": getattr(self.driver, "unrecorded", self.driver).execute_script(
+                    "var data = {};"
+                    "for (var i = 0; i < localStorage.length; i++) {"
+                    "  var key = localStorage.key(i); data[key] = localStorage.getItem(key);"
+                    "}"
+                    "return data;"
+                ) or {}
+            }
+        except Exception as e:
+            print(f"⚠️ Could not export session: {e}")
+            return None
+
+    def restore_session(self, session_data, origin="https://www.facebook.com/robots.txt"):
+        """Restore cookies and local storage; the origin is a cheap page on the same domain"""
+        try:
+            # Cookies can only be added for the domain currently loaded
+            self.driver.get(origin)
+            restored = 0
+            for cookie in session_data.get("cookies", []):
+                try:
+                    self.driver.add_cookie(cookie)
+                    restored += 1
+                except Exception:
+                    continue
+
+            local_storage = session_data.get("local_storage") or {}
+            if local_storage:
+                self.driver.execute_script(
+                    "var data = arguments[0];"
+                    "for (var key in data) { localStorage.setItem(key, data[key]); }",
+                    local_storage
+                )
+
+            print(f"🍪 Restored {restored} cookies and {len(local_storage)} local storage keys")
+            return restored > 0
+        except Exception as e:
+            print(f"⚠️ Could not restore session: {e}")
+            return False
+
     def quit(self):
         """Close the browser"""
+        self.screenshots.flush(ConfigManager.SCREENSHOT_FLUSH_TIMEOUT)
         if self.driver:
+            if hasattr(self.driver, "save") and hasattr(self.driver, "_recording"):
+                self.driver.save()
             print("🔒 Closing browser...")
             self.driver.quit()
 
@@ -146,13 +362,11 @@ class BrowserManager:
         """Get the WebDriver instance"""
         return self.driver
 
-    def take_screenshot(self, filename):
-        """Take a screenshot for debugging"""
+    def take_screenshot(self, filename, failure=False):
+        """Take a debug screenshot if the screenshot policy keeps it (failure screenshots always are unless off)"""
         if self.driver:
             try:
-                self.driver.save_screenshot(filename)
-                print(f"📸 Screenshot saved: {filename}")
-                return True
+                return self.screenshots.capture(self.driver, filename, failure) is not None
             except Exception as e:
                 print(f"Failed to save screenshot: {e}")
                 return False
@@ -223,7 +437,7 @@ class BrowserManager:
         """Scroll element into view"""
         try:
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(1)
+            sleep(1)
             return True
         except Exception as e:
             print(f"Warning: Could not scroll to element: {e}")
@@ -271,45 +485,26 @@ class BrowserManager:
             print(f"⚠️ Could not get current URL: {e}")
             return ""
 
-    def handle_cookie_consent(self):
-        """Handle Facebook cookie consent dialog"""
+    def handle_cookie_consent(self, settle_seconds=3):
+        """Handle Facebook cookie consent dialog, trying the historically best strategy first"""
         print("🍪 Checking for cookie consent dialog...")
         try:
-            time.sleep(3)
+            sleep(settle_seconds)
             self.take_screenshot("cookie_debug.png")
-            print("📸 Debug screenshot saved: cookie_debug.png")
-
-            print("🔍 Finding all buttons on the page...")
-            all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
-            print(f"Found {len(all_buttons)} buttons total")
-
-            for i, button in enumerate(all_buttons[:15]):
-                try:
-                    button_text = button.text.strip()
-                    if button_text:
-                        print(f"   Button {i+1}: '{button_text}'")
-                        text_lower = button_text.lower()
-                        if any(phrase in text_lower for phrase in [
-                            'allow all cookies', 'accept all cookies',
-                            'allow all', 'accept all',
-                            'allow cookies', 'accept cookies'
-                        ]):
-                            print(f"🎯 Found cookie button: '{button_text}'")
-                            self.scroll_to_element(button)
-                            if self.safe_click(button):
-                                print("✅ Successfully clicked cookie button!")
-                                time.sleep(3)
-                                return True
-                except Exception:
-                    continue
 
-            # Try specific Facebook cookie selectors
-            success = self._try_facebook_cookie_selectors()
-            if success:
-                return True
+            # (key, strategy) pairs; each strategy takes the wait timeout for its selector
+            candidates = [("button_text", lambda timeout: self._try_cookie_button_text())]
+            candidates += [
+                (f"css:{selector}", lambda timeout, selector=selector: self._try_cookie_selector(selector, timeout))
+                for selector in ConfigManager.COOKIE_CONSENT_SELECTORS
+            ]
+            candidates += [("blue_buttons", lambda timeout: self._try_blue_buttons())]
 
-            # Last resort: look for blue buttons
-            success = self._try_blue_buttons()
+            success = self.strategy_ranker.run(
+                "cookie_consent", candidates,
+                lambda strategy, timeout: strategy(timeout),
+                ConfigManager.STRATEGY_DEFAULT_TIMEOUT
+            )
             if success:
                 return True
 
@@ -319,41 +514,48 @@ class BrowserManager:
             print(f"ℹ️ Cookie consent handling error: {e}")
             return False
 
-    def _try_facebook_cookie_selectors(self):
-        """Try specific Facebook cookie selectors"""
-        print("🔍 Trying specific Facebook cookie selectors...")
-        selectors = [
-            "button[data-cookiebanner*='accept']",
-            "button[data-testid*='accept']",
-            "button[data-testid*='cookie']",
-            "div[data-testid*='cookie'] button",
-            "div[role='dialog'] button[type='submit']",
-            "[aria-label*='cookie'] button",
-            "button[style*='rgb(24, 119, 242)']",
-            "button[style*='#1877f2']",
-            "div[role='dialog'] button:last-child",
-            "div[role='dialog'] button[class*='primary']",
-            "button[class*='_42ft']",
-            "button[class*='_4jy0']",
-        ]
+    def _try_cookie_button_text(self):
+        """Click the first button whose text accepts all cookies"""
+        print("🔍 Finding all buttons on the page...")
+        all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
+        print(f"Found {len(all_buttons)} buttons total")
 
-        for selector in selectors:
+        for i, button in enumerate(all_buttons[:15]):
             try:
-                print(f"🔍 Trying: {selector}")
-                button = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
                 button_text = button.text.strip()
-                print(f"   Found button with text: '{button_text}'")
-                self.scroll_to_element(button)
-                if self.safe_click(button):
-                    print("✅ Successfully clicked Facebook cookie button!")
-                    time.sleep(3)
-                    return True
+                if button_text:
+                    print(f"   Button {i+1}: '{button_text}'")
+                    text_lower = button_text.lower()
+                    if any(phrase in text_lower for phrase in [
+                        'allow all cookies', 'accept all cookies',
+                        'allow all', 'accept all',
+                        'allow cookies', 'accept cookies'
+                    ]):
+                        print(f"🎯 Found cookie button: '{button_text}'")
+                        self.scroll_to_element(button)
+                        if self.safe_click(button):
+                            print("✅ Successfully clicked cookie button!")
+                            sleep(3)
+                            return True
             except Exception:
                 continue
         return False
 
+    def _try_cookie_selector(self, selector, timeout):
+        """Click a cookie button matched by one CSS selector"""
+        print(f"🔍 Trying: {selector} ({timeout:.1f}s)")
+        button = WebDriverWait(self.driver, timeout).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+        )
+        button_text = button.text.strip()
+        print(f"   Found button with text: '{button_text}'")
+        self.scroll_to_element(button)
+        if self.safe_click(button):
+            print("✅ Successfully clicked Facebook cookie button!")
+            sleep(3)
+            return True
+        return False
+
     def _try_blue_buttons(self):
         """Last resort: look for blue buttons"""
         print("🔍 Last resort: looking for blue buttons...")
@@ -369,7 +571,7 @@ class BrowserManager:
                             print(f"🎯 Found blue button: '{element_text}'")
                             if self.safe_click(element):
                                 print("✅ Successfully clicked blue button!")
-                                time.sleep(3)
+                                sleep(3)
                                 return True
                 except:
                     continue
@@ -0,0 +1,215 @@
+"""
+Date Parser Module
+Turns scraped date strings (English and Romanian) into timezone-aware start/end datetimes
+"""
+
+import re
+import unicodedata
+from datetime import datetime, time, timedelta
+from typing import Optional, Tuple
+
+from utils import ConfigManager
+
+WEEKDAYS = {
+    'mon': 0, 'monday': 0, 'tue': 1, 'tues': 1, 'tuesday': 1, 'wed': 2, 'wednesday': 2,
+    'thu': 3, 'thur': 3, 'thurs': 3, 'thursday': 3, 'fri': 4, 'friday': 4,
+    'sat': 5, 'saturday': 5, 'sun': 6, 'sunday': 6,
+    'lun': 0, 'luni': 0, 'mar': 1, 'marti': 1, 'mie': 2, 'miercuri': 2, 'joi': 3,
+    'vin': 4, 'vineri': 4, 'sam': 5, 'sambata': 5, 'dum': 6, 'duminica': 6
+}
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'ian': 1, 'ianuarie': 1, 'feb': 2, 'february': 2, 'februarie': 2,
+    'mar': 3, 'march': 3, 'martie': 3, 'apr': 4, 'april': 4, 'aprilie': 4, 'may': 5, 'mai': 5,
+    'jun': 6, 'june': 6, 'iun': 6, 'iunie': 6, 'jul': 7, 'july': 7, 'iul': 7, 'iulie': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9, 'septembrie': 9,
+    'oct': 10, 'october': 10, 'octombrie': 10, 'nov': 11, 'november': 11, 'noi': 11, 'noiembrie': 11,
+    'dec': 12, 'december': 12, 'decembrie': 12
+}
+
+# Day offsets of single relative words
+RELATIVE_DAYS = {
+    'today': 0, 'tonight': 0, 'now': 0, 'azi': 0, 'astazi': 0, 'diseara': 0, 'deseara': 0, 'acum': 0,
+    'tomorrow': 1, 'maine': 1
+}
+
+# Multi-day phrases: (first day offset from Monday of the current week, number of days, week offset)
+RELATIVE_RANGES = [
+    (re.compile(r"\b(?:this weekend|weekendul (?:acesta|asta))\b"), 5, 2, 0),
+    (re.compile(r"\b(?:next week|saptamana viitoare)\b"), 0, 7, 1),
+    (re.compile(r"\b(?:this week|saptamana (?:aceasta|asta))\b"), 0, 7, 0),
+]
+
+TIME_PATTERN = re.compile(r"\b(1[0-2]|0?[1-9])(?:[:.]([0-5]\d))?\s*(am|pm)\b|\b([01]?\d|2[0-3])[:.]([0-5]\d)\b")
+ISO_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2})?)?(?:z|[+-]\d{2}:?\d{2})?$")
+# Range separators: dashes with spaces, "until", "to" and the Romanian "până la"
+RANGE_SEPARATOR = re.compile(r"\s+(?:-|until|to|pana la)\s+")
+
+def event_timezone():
+    """Timezone of scraped events (ConfigManager.EVENT_TIMEZONE), else the local one"""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(ConfigManager.EVENT_TIMEZONE)
+    except Exception:
+        return datetime.now().astimezone().tzinfo
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII (diacritics removed), dashes unified, punctuation except ':' '.' '-' '+' dropped"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[–—−]", " - ", text)
+    text = re.sub(r"[^\w:.+\- ]", " ", text)
+    return " ".join(text.split())
+
+class DateParser:
+    """Parses date strings relative to a reference time, memoizing repeated strings"""
+
+    def __init__(self, reference: Optional[datetime] = None, timezone=None):
+        self.timezone = timezone or event_timezone()
+        self.reference = (reference or datetime.now(self.timezone)).astimezone(self.timezone)
+        self.today = self.reference.date()
+        self._cache = {}
+        self.cache_hits = 0
+
+    def parse(self, text: str) -> Optional[Tuple[datetime, datetime]]:
+        """(start, end) with end exclusive: next midnight for whole days, the start itself for a bare time"""
+        if not text:
+            return None
+        if text in self._cache:
+            self.cache_hits += 1
+            return self._cache[text]
+
+        try:
+            result = self._parse(normalize(text))
+        except ValueError:
+            result = None  # Impossible dates such as Feb 30
+        self._cache[text] = result
+        return result
+
+    def timestamps(self, text: str) -> Tuple[Optional[int], Optional[int]]:
+        """Epoch seconds of start and end, or (None, None)"""
+        parsed = self.parse(text)
+        if not parsed:
+            return None, None
+        return int(parsed[0].timestamp()), int(parsed[1].timestamp())
+
+    def urgency(self, timestamp: Optional[int]) -> Optional[str]:
+        """'Today', 'Tomorrow' or 'This Week' for a start timestamp"""
+        if timestamp is None:
+            return None
+        days = (datetime.fromtimestamp(timestamp, self.timezone).date() - self.today).days
+        if days <= 0:
+            return 'Today'
+        if days == 1:
+            return 'Tomorrow'
+        if days < 7 - self.today.weekday():
+            return 'This Week'
+        return None
+
+    def this_week(self) -> Tuple[int, int]:
+        """Timestamps from today's midnight to next Monday's, the range of the 'This week' filter"""
+        start = self._midnight(self.today)
+        return int(start.timestamp()), int(self._midnight(self.today + timedelta(days=7 - self.today.weekday())).timestamp())
+
+    @staticmethod
+    def in_window(start: Optional[int], end: Optional[int], window: Tuple[int, int]) -> bool:
+        """True when an event overlaps the window; undated events are kept"""
+        if start is None:
+            return True
+        return start < window[1] and (end or start) >= window[0]
+
+    def _parse(self, text):
+        if ISO_PATTERN.match(text):
+            start = datetime.fromisoformat(text.upper().replace('Z', '+00:00'))
+            start = start.replace(tzinfo=self.timezone) if start.tzinfo is None else start
+            return start, start
+
+        for pattern, first_day, days, week_offset in RELATIVE_RANGES:
+            if pattern.search(text):
+                monday = self.today - timedelta(days=self.today.weekday()) + timedelta(weeks=week_offset)
+                first = max(self.today, monday + timedelta(days=first_day))
+                return self._midnight(first), self._midnight(monday + timedelta(days=first_day + days))
+
+        parts = RANGE_SEPARATOR.split(text, maxsplit=1)
+        start_day, start_time = self._parse_part(parts[0])
+        if start_day is None:
+            return None
+        start = self._combine(start_day, start_time)
+
+        if len(parts) == 1:
+            return start, start if start_time else self._midnight(start_day + timedelta(days=1))
+
+        end_day, end_time = self._parse_part(parts[1], start_day)
+        end_day = end_day or start_day
+        if end_time:
+            end = self._combine(end_day, end_time)
+            if end < start:
+                end += timedelta(days=1)  # "22:00 - 02:00" ends after midnight
+        else:
+            end = self._midnight(end_day + timedelta(days=1))
+        return start, max(start, end)
+
+    def _parse_part(self, text, base_day=None):
+        """(date or None, time or None); base_day supplies month and year to an end like '27'"""
+        clock = None
+        match = TIME_PATTERN.search(text)
+        if match:
+            hour, minute, meridiem, hour24, minute24 = match.groups()
+            if hour24 is not None:
+                clock = time(int(hour24), int(minute24))
+            else:
+                clock = time(int(hour) % 12 + (12 if meridiem == 'pm' else 0), int(minute or 0))
+            text = text[:match.start()] + " " + text[match.end():]
+
+        tokens = [token.strip('.') for token in text.split()]
+        numbers = [int(token) for token in tokens if token.isdigit()]
+        year = next((n for n in numbers if n > 1900), None)
+        days = [n for n in numbers if 1 <= n <= 31]
+
+        # A month needs a day number next to it ("oct 25", "25 oct."); "mar" may also be
+        # Tuesday in Romanian, so unambiguous month names are tried first
+        month_indexes = sorted((i for i, token in enumerate(tokens) if token in MONTHS),
+                               key=lambda i: tokens[i] in WEEKDAYS)
+        for index in month_indexes:
+            neighbours = tokens[index + 1:index + 2] + tokens[max(0, index - 1):index]
+            day = next((int(n) for n in neighbours if n.isdigit() and 1 <= int(n) <= 31), None)
+            if day:
+                return self._resolve_year(MONTHS[tokens[index]], day, year), clock
+
+        for token in tokens:
+            if token in RELATIVE_DAYS:
+                return self.today + timedelta(days=RELATIVE_DAYS[token]), clock
+
+        for token in tokens:
+            if token in WEEKDAYS:
+                return self.today + timedelta(days=(WEEKDAYS[token] - self.today.weekday()) % 7), clock
+
+        if base_day and days:
+            # Range end with only a day number: same month as the start
+            day = base_day.replace(day=days[0])
+            return (day if day >= base_day else self._add_month(day)), clock
+
+        if clock and base_day:
+            return base_day, clock
+        if clock:
+            return self.today, clock
+        return None, None
+
+    def _resolve_year(self, month, day, year=None):
+        """Dates without a year are in the coming twelve months (a month back at most)"""
+        if year:
+            return datetime(year, month, day).date()
+        candidate = datetime(self.today.year, month, day).date()
+        if candidate < self.today - timedelta(days=31):
+            candidate = datetime(self.today.year + 1, month, day).date()
+        return candidate
+
+    @staticmethod
+    def _add_month(day):
+        return day.replace(year=day.year + 1, month=1) if day.month == 12 else day.replace(month=day.month + 1)
+
+    def _combine(self, day, clock):
+        return datetime.combine(day, clock or time(0), self.timezone)
+
+    def _midnight(self, day):
+        return datetime.combine(day, time(0), self.timezone)
@@ -0,0 +1,161 @@
+"""
+Event Diff Module
+Set difference between two scrape results: added, removed and changed events
+"""
+
+import json
+import os
+
+from utils import Event, EventDeduplicator, FileManager
+
+# Fields compared to decide whether a matched event changed
+COMPARED_FIELDS = ['Title', 'Date/Time', 'Location']
+
+class EventDiff:
+    """Diffs current events against previous ones in O(n) with hashed indexes"""
+
+    def __init__(self, current_events):
+        self.current = []
+        self.by_link = {}
+        self.by_title = {}
+        self.previous_count = 0  # Previous events read by the last iter_changes
+
+        for event in current_events:
+            event = event.to_dict() if isinstance(event, Event) else event
+            index = len(self.current)
+            self.current.append(event)
+
+            link_key = self.link_key(event)
+            if link_key:
+                self.by_link.setdefault(link_key, index)
+            title_key = self.title_key(event)
+            if title_key:
+                self.by_title.setdefault(title_key, []).append(index)
+
+    @staticmethod
+    def link_key(event):
+        """Integer event id, else the link without tracking parameters"""
+        return EventDeduplicator.event_key(event)
+
+    @staticmethod
+    def title_key(event):
+        """Title fingerprint used when links differ (same rule as deduplication)"""
+        return EventDeduplicator.title_key(event.get('Title')) or None
+
+    def iter_changes(self, previous_events):
+        """Stream ('removed'|'changed'|'added', event, details) tuples; previous may be any iterable
+
+        Every previous event is matched by id or link first; only those left over are matched by title
+        afterwards, so a title match cannot take a current event that a later previous event matches exactly.
+        Just the unmatched previous events are kept in memory.
+        """
+        matched = set()
+        unmatched = []
+        self.previous_count = 0
+
+        for previous in previous_events:
+            self.previous_count += 1
+            index = self.by_link.get(self.link_key(previous))
+            if index is None or index in matched:
+                unmatched.append(previous)
+                continue
+            matched.add(index)
+            change = self._compare(previous, index)
+            if change:
+                yield change
+
+        for previous in unmatched:
+            index = next((index for index in self.by_title.get(self.title_key(previous), ())
+                          if index not in matched), None)
+            if index is None:
+                yield 'removed', previous, None
+                continue
+            matched.add(index)
+            change = self._compare(previous, index)
+            if change:
+                yield change
+
+        for index, event in enumerate(self.current):
+            if index not in matched:
+                yield 'added', event, None
+
+    def _compare(self, previous, index):
+        """('changed', current, fields) when a compared field differs, else None"""
+        current = self.current[index]
+        changed_fields = {
+            field: {'old': previous.get(field), 'new': current.get(field)}
+            for field in COMPARED_FIELDS
+            if (previous.get(field) or None) != (current.get(field) or None)
+        }
+        return ('changed', current, changed_fields) if changed_fields else None
+
+    def compute(self, previous_events):
+        """Collect the full diff into added/removed/changed lists"""
+        result = {'added': [], 'removed': [], 'changed': []}
+        for change, event, details in self.iter_changes(previous_events):
+            if change == 'changed':
+                result['changed'].append({'event': event, 'fields': details})
+            else:
+                result[change].append(event)
+        return result
+
+    def write_delta(self, previous_events, city_name, filename=None):
+        """Stream the diff to a JSON Lines artifact and return (filename, counts, added events)"""
+        if not filename:
+            filename = EventDiff.get_delta_filename(city_name)
+
+        counts = {'added': 0, 'removed': 0, 'changed': 0}
+        added = []
+        with open(filename, 'w', encoding='utf-8') as f:
+            for change, event, details in self.iter_changes(previous_events):
+                counts[change] += 1
+                if change == 'added':
+                    added.append(event)
+                record = {'change': change, 'event': event}
+                if details:
+                    record['fields'] = details
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        return filename, counts, added
+
+    @staticmethod
+    def get_delta_filename(city_name):
+        """Delta artifact next to the events file: facebook_events_<city>_delta.jsonl"""
+        base, _ = os.path.splitext(FileManager.get_events_filename(city_name))
+        return f"{base}_delta.jsonl"
+
+    @staticmethod
+    def iter_events_from_json(filename, chunk_size=65536):
+        """Yield events from a saved events JSON file without loading the whole list"""
+        decoder = json.JSONDecoder()
+        with open(filename, 'r', encoding='utf-8') as f:
+            buffer = ''
+            in_array = False
+
+            while True:
+                chunk = f.read(chunk_size)
+                buffer += chunk
+
+                if not in_array:
+                    start = buffer.find('"events"')
+                    bracket = buffer.find('[', start) if start != -1 else -1
+                    if bracket == -1:
+                        if not chunk:
+                            return
+                        continue
+                    buffer = buffer[bracket + 1:]
+                    in_array = True
+
+                while True:
+                    buffer = buffer.lstrip().lstrip(',').lstrip()
+                    if buffer.startswith(']'):
+                        return
+                    try:
+                        event, end = decoder.raw_decode(buffer)
+                    except json.JSONDecodeError:
+                        break  # Object continues in the next chunk
+                    yield event
+                    buffer = buffer[end:]
+
+                if not chunk:
+                    return
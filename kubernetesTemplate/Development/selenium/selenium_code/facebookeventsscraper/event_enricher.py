@@ -0,0 +1,250 @@
+"""
+Event Enricher Module
+Loads event detail pages in a few tabs of the logged-in session and merges exact times, venue and organizer
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from datetime import datetime
+
+from date_parser import event_timezone
+from tracer import sleep
+from utils import ConfigManager, EventDeduplicator
+
+# Reads details from the loaded event page without shipping its (large) JSON back:
+# schema.org Event markup first, then fields of the embedded GraphQL payloads.
+# Returns the page URL and readyState so the caller can tell a finished load.
+EVENT_DETAILS_SCRIPT = """
+var result = {url: location.href, ready: document.readyState === 'complete'};
+if (!result.ready) { return result; }
+
+function unescape(value) {
+    try { return JSON.parse('"' + value + '"'); } catch (e) { return value; }
+}
+
+var ld = document.querySelectorAll("script[type='application/ld+json']");
+for (var i = 0; i < ld.length; i++) {
+    try {
+        var data = JSON.parse(ld[i].textContent);
+        if (data['@type'] !== 'Event') { continue; }
+        var place = data.location || {}, address = place.address || {};
+        result.start = data.startDate || null;
+        result.end = data.endDate || null;
+        result.venue = place.name || null;
+        result.address = typeof address === 'string' ? address :
+            [address.streetAddress, address.addressLocality].filter(Boolean).join(', ') || null;
+        result.organizer = (data.organizer || {}).name || null;
+        return result;
+    } catch (e) {}
+}
+
+var text = '';
+var scripts = document.querySelectorAll("script[type='application/json']");
+for (var j = 0; j < scripts.length; j++) {
+    if (scripts[j].textContent.indexOf('start_timestamp') !== -1) { text += scripts[j].textContent; }
+}
+var patterns = {
+    start_timestamp: /"start_timestamp":(\\d+)/,
+    end_timestamp: /"end_timestamp":(\\d+)/,
+    venue: /"event_place":\\{[^{}]*?"name":"((?:[^"\\\\]|\\\\.)*)"/,
+    address: /"one_line_address":"((?:[^"\\\\]|\\\\.)*)"/,
+    organizer: /"event_creator":\\{[^{}]*?"name":"((?:[^"\\\\]|\\\\.)*)"/
+};
+for (var key in patterns) {
+    var match = text.match(patterns[key]);
+    if (match) { result[key] = key.indexOf('timestamp') !== -1 ? Number(match[1]) : unescape(match[1]); }
+}
+return result;
+"""
+
+# Fields merged into Event, in cache entries
+DETAIL_FIELDS = ('start_time', 'end_time', 'venue', 'address', 'organizer')
+
+# A time of day in a date string ("20:00", "8 PM"); without it the start time is worth fetching
+TIME_OF_DAY_PATTERN = re.compile(r"\d{1,2}:\d{2}|\d\s*[ap]\.?m\b", re.IGNORECASE)
+
+class EnrichmentCache:
+    """Event details by event id, each entry expiring after a TTL"""
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path  # None keeps entries in memory only
+        self.ttl = ConfigManager.ENRICHMENT_CACHE_TTL if ttl is None else ttl
+        self.entries = {}  # event id -> {'fetched_at': epoch seconds, 'details': {...}}
+        self._load()
+
+    def get(self, event_id):
+        """Cached details, or None when missing or expired"""
+        entry = self.entries.get(event_id)
+        if not entry or time.time() - entry['fetched_at'] > self.ttl:
+            return None
+        return entry['details']
+
+    def put(self, event_id, details):
+        self.entries[event_id] = {'fetched_at': time.time(), 'details': details}
+
+    def save(self):
+        """Drop expired entries and atomically write the cache file"""
+        if not self.path:
+            return
+        now = time.time()
+        self.entries = {key: entry for key, entry in self.entries.items() if now - entry['fetched_at'] <= self.ttl}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ Could not save enrichment cache: {e}")
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable enrichment cache {self.path}: {e}")
+            self.entries = {}
+
+
+class EventEnricher:
+    """Fetches detail pages in a bounded set of tabs and merges the details into Event objects"""
+
+    def __init__(self, browser_manager, cache=None, max_tabs=None):
+        self.browser = browser_manager
+        self.cache = cache or EnrichmentCache(ConfigManager.ENRICHMENT_CACHE_PATH)
+        self.max_tabs = max_tabs or ConfigManager.ENRICHMENT_MAX_TABS
+        self.fetched = 0
+        self.cache_hits = 0
+        self.failed = 0
+
+    def enrich(self, events, limit=None):
+        """Merge details into up to `limit` events (cached ones are free); returns how many were enriched"""
+        limit = ConfigManager.ENRICHMENT_MAX_EVENTS if limit is None else limit
+        jobs = {}
+        enriched = 0
+
+        for event in events:
+            event_id = event.event_id or EventDeduplicator.parse_event_id(event.link)
+            if event_id is None:
+                continue
+            event_id = str(event_id)  # Cache keys are JSON object keys
+            details = self.cache.get(event_id)
+            if details is not None:
+                self.cache_hits += 1
+                enriched += self.merge(event, details)
+            elif len(jobs) < limit and event_id not in jobs:
+                jobs[event_id] = event
+
+        if jobs:
+            print(f"🔎 Enriching {len(jobs)} events in up to {self.max_tabs} tabs ({self.cache_hits} cached)...")
+            for event_id, details in self._fetch_details(list(jobs)).items():
+                self.cache.put(event_id, details)
+                enriched += self.merge(jobs[event_id], details)
+            self.cache.save()
+
+        print(f"✅ Enriched {enriched} events ({self.fetched} fetched, {self.cache_hits} cached, {self.failed} failed)")
+        return enriched
+
+    @staticmethod
+    def merge(event, details):
+        """Copy details onto an Event; vague dates and inferred locations are replaced. Returns 1 if anything was set"""
+        changed = 0
+        for field in DETAIL_FIELDS:
+            if details.get(field):
+                setattr(event, field, details[field])
+                changed = 1
+
+        for field in ('start', 'end'):
+            # Exact detail page times replace timestamps parsed from the card's date text
+            try:
+                value = getattr(event, f"{field}_time")
+                if value:
+                    setattr(event, f"{field}_timestamp", int(datetime.fromisoformat(value).timestamp()))
+            except ValueError:
+                pass
+        
+        if event.start_time and not TIME_OF_DAY_PATTERN.search(event.date_time or ""):
+            try:
+                event.date_time = datetime.fromisoformat(event.start_time).strftime("%a, %b %d at %H:%M")
+            except ValueError:
+                pass
+        if event.venue and (not event.location or event.location.startswith("Near ")):
+            event.location = ", ".join(part for part in (event.venue, event.address) if part)
+        return changed
+
+    def _fetch_details(self, event_ids):
+        """Load detail pages concurrently: navigation is started in every free tab, then tabs are polled"""
+        driver = self.browser.get_driver()
+        main_handle = driver.current_window_handle
+        pending = deque(event_ids)
+        active = {}  # tab handle -> (event id, started at)
+        results = {}
+        tabs = []
+
+        try:
+            for _ in range(min(self.max_tabs, len(event_ids))):
+                driver.switch_to.new_window('tab')
+                tabs.append(driver.current_window_handle)
+                self.browser.request_blocker.enable()  # Blocked URLs are set per tab
+
+            while pending or active:
+                for handle in tabs:
+                    if handle not in active and pending:
+                        event_id = pending.popleft()
+                        driver.switch_to.window(handle)
+                        # Assigning location returns at once, unlike driver.get which waits for the load
+                        driver.execute_script("window.location.href = arguments[0];",
+                                              f"https://www.facebook.com/events/{event_id}/")
+                        active[handle] = (event_id, time.perf_counter())
+
+                sleep(ConfigManager.ENRICHMENT_POLL_INTERVAL)
+
+                for handle, (event_id, started) in list(active.items()):
+                    driver.switch_to.window(handle)
+                    page = driver.execute_script(EVENT_DETAILS_SCRIPT) or {}
+                    if page.get('ready') and event_id in page.get('url', ''):
+                        del active[handle]
+                        details = self._details_from_page(page)
+                        if details:
+                            results[event_id] = details
+                            self.fetched += 1
+                        else:
+                            self.failed += 1
+                    elif time.perf_counter() - started > ConfigManager.ENRICHMENT_PAGE_TIMEOUT:
+                        del active[handle]
+                        self.failed += 1
+                        print(f"   ⌛ Detail page for event {event_id} did not load")
+
+        except Exception as e:
+            print(f"⚠️ Enrichment stopped: {str(e)[:100]}")
+        finally:
+            for handle in tabs:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except Exception:
+                    pass
+            driver.switch_to.window(main_handle)
+
+        return results
+
+    @staticmethod
+    def _details_from_page(page):
+        """Normalize script output to DETAIL_FIELDS; times become ISO 8601 in the event timezone"""
+        details = {
+            'start_time': page.get('start'),
+            'end_time': page.get('end'),
+            'venue': page.get('venue'),
+            'address': page.get('address'),
+            'organizer': page.get('organizer')
+        }
+        for field, key in (('start_time', 'start_timestamp'), ('end_time', 'end_timestamp')):
+            if not details[field] and page.get(key):
+                details[field] = datetime.fromtimestamp(page[key], event_timezone()).isoformat()
+        return {field: value for field, value in details.items() if value}
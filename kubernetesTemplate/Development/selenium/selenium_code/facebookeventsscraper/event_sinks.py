@@ -0,0 +1,76 @@
+"""
+Event Sinks Module
+Consumers that receive events one by one while a city is still being scraped
+"""
+
+import json
+import os
+
+from utils import Event, EventDisplayer, FileManager
+
+class EventSink:
+    """Base class for stream consumers; override the hooks you need"""
+
+    def open(self, city_name):
+        """Called before the first event of a city"""
+
+    def write(self, event):
+        """Called with each new Event as soon as it is found"""
+
+    def close(self, city_name, events, error=None):
+        """Called once the stream ends; error is set when scraping stopped early"""
+
+
+class DisplaySink(EventSink):
+    """Prints events as they arrive"""
+
+    def __init__(self):
+        self.count = 0
+
+    def open(self, city_name):
+        self.count = 0
+        print(f"\n📡 Streaming events for {city_name}...")
+
+    def write(self, event):
+        self.count += 1
+        EventDisplayer.display_event(event, self.count)
+
+
+class JsonLinesSink(EventSink):
+    """Appends one JSON object per event, flushed immediately, so partial runs leave a usable file"""
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.path = None
+        self._file = None
+
+    def open(self, city_name):
+        if self.filename:
+            self.path = self.filename
+        else:
+            base, _ = os.path.splitext(FileManager.get_events_filename(city_name))
+            self.path = f"{base}_stream.jsonl"
+        self._file = open(self.path, "w", encoding="utf-8")
+        print(f"📝 Streaming events to {self.path}")
+
+    def write(self, event):
+        data = event.to_dict() if isinstance(event, Event) else event
+        self._file.write(json.dumps(data, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self, city_name, events, error=None):
+        if self._file:
+            self._file.close()
+            self._file = None
+            status = f" (stopped early: {error})" if error else ""
+            print(f"💾 Streamed {len(events)} events to {self.path}{status}")
+
+
+class CallbackSink(EventSink):
+    """Hands each event to a callable, e.g. an MQTT publisher"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, event):
+        self.callback(event)
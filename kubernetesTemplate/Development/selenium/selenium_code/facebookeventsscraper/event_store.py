@@ -0,0 +1,212 @@
+"""
+Event Store Module
+Incremental SQLite history of scraped events, keyed by canonical event id
+"""
+
+import sqlite3
+from datetime import datetime
+
+from utils import ConfigManager, Event, EventDeduplicator, FileManager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    city TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    total_events INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_city ON runs (city, run_id);
+
+CREATE TABLE IF NOT EXISTS events (
+    city TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    date_time TEXT,
+    location TEXT,
+    city_match INTEGER NOT NULL DEFAULT 0,
+    source_approach INTEGER NOT NULL DEFAULT 1,
+    urgency TEXT,
+    start_timestamp INTEGER,
+    end_timestamp INTEGER,
+    last_position INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    first_run_id INTEGER NOT NULL,
+    last_run_id INTEGER NOT NULL,
+    PRIMARY KEY (city, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_events_last_run ON events (city, last_run_id);
+"""
+
+UPSERT_EVENT = """
+INSERT INTO events (city, event_id, title, link, date_time, location, city_match, source_approach,
+                    urgency, start_timestamp, end_timestamp, last_position, first_seen, last_seen,
+                    first_run_id, last_run_id)
+VALUES (:city, :event_id, :title, :link, :date_time, :location, :city_match, :source_approach,
+        :urgency, :start_timestamp, :end_timestamp, :position, :seen, :seen, :run_id, :run_id)
+ON CONFLICT (city, event_id) DO UPDATE SET
+    title = excluded.title,
+    link = excluded.link,
+    date_time = COALESCE(excluded.date_time, events.date_time),
+    location = COALESCE(excluded.location, events.location),
+    city_match = excluded.city_match,
+    source_approach = excluded.source_approach,
+    urgency = excluded.urgency,
+    start_timestamp = COALESCE(excluded.start_timestamp, events.start_timestamp),
+    end_timestamp = COALESCE(excluded.end_timestamp, events.end_timestamp),
+    last_position = excluded.last_position,
+    last_seen = excluded.last_seen,
+    last_run_id = excluded.last_run_id
+"""
+
+# Columns added after the first release: name -> type, added to older databases on open
+ADDED_COLUMNS = {
+    "start_timestamp": "INTEGER",
+    "end_timestamp": "INTEGER"
+}
+
+class EventStore:
+    def __init__(self, db_path=None):
+        self.db_path = db_path or ConfigManager.EVENT_STORE_PATH
+        # WAL lets readers query while a scrape is writing
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def record_run(self, city_name, events):
+        """Upsert the events of one scrape in a single transaction and return the run id"""
+        now = datetime.now().isoformat()
+        rows = []
+        skipped = 0
+        for position, event in enumerate(events):
+            event = event.to_dict() if isinstance(event, Event) else event
+            # Same identity as dedup and diff: the event id, else the link without tracking parameters
+            event_key = EventDeduplicator.event_key(event)
+            if event_key is None:
+                skipped += 1  # No id and no link: nothing to key the row on
+                continue
+            link = event.get("Link", "")
+            rows.append({
+                "city": city_name,
+                "event_id": str(event_key),
+                "title": event.get("Title", ""),
+                "link": link,
+                "date_time": event.get("Date/Time"),
+                "location": event.get("Location"),
+                "city_match": int(bool(event.get("City_Match"))),
+                "source_approach": event.get("Source_Approach", 1),
+                "urgency": event.get("Urgency"),
+                "start_timestamp": event.get("Start_Timestamp"),
+                "end_timestamp": event.get("End_Timestamp"),
+                "position": position,
+                "seen": now
+            })
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (city, started_at, total_events) VALUES (?, ?, ?)",
+                (city_name, now, len(rows))
+            )
+            run_id = cursor.lastrowid
+            for row in rows:
+                row["run_id"] = run_id
+            self.conn.executemany(UPSERT_EVENT, rows)
+
+        print(f"🗄️ Stored run {run_id} for {city_name}: {len(rows)} events upserted"
+              + (f", {skipped} without id or link skipped" if skipped else ""))
+        return run_id
+
+    def get_latest_run(self, city_name):
+        """Latest run row for a city (run_id, started_at, total_events) without reading events"""
+        row = self.conn.execute(
+            "SELECT run_id, started_at, total_events FROM runs WHERE city = ? ORDER BY run_id DESC LIMIT 1",
+            (city_name,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def load_latest_events(self, city_name, stream=False):
+        """Load the latest run in the same shape as FileManager.load_events_from_json
+
+        With stream=True "events" is a one-shot generator read from the database as it is consumed.
+        """
+        run = self.get_latest_run(city_name)
+        if not run:
+            return None
+
+        events = self._iter_last_run_events(city_name, run["run_id"])
+        return {
+            "city": city_name,
+            "timestamp": run["started_at"],
+            "total_events": run["total_events"],
+            "events": events if stream else list(events)
+        }
+
+    def export_json(self, city_name, filename=None):
+        """Export the latest run for a city to the existing JSON format"""
+        data = self.load_latest_events(city_name)
+        if not data:
+            print(f"📁 No stored runs for {city_name}")
+            return None
+
+        return FileManager.save_events_to_json(data["events"], city_name, filename)
+
+    def get_first_seen(self, city_name, since_run_id):
+        """Events first seen after a given run (new events)"""
+        cursor = self.conn.execute(
+            "SELECT * FROM events WHERE city = ? AND first_run_id > ? ORDER BY first_run_id, rowid",
+            (city_name, since_run_id)
+        )
+        return [self._row_to_dict(row) for row in cursor]
+
+    def get_events_between(self, city_name, start, end):
+        """Events overlapping [start, end) in epoch seconds, earliest first (uses the start index)"""
+        cursor = self.conn.execute(
+            "SELECT * FROM events WHERE city = ? AND start_timestamp < ? AND COALESCE(end_timestamp, start_timestamp) >= ? "
+            "ORDER BY start_timestamp",
+            (city_name, end, start)
+        )
+        return [self._row_to_dict(row) for row in cursor]
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def _migrate(self):
+        """Add columns missing from databases created by older versions"""
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(events)")}
+        with self.conn:
+            for name, column_type in ADDED_COLUMNS.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE events ADD COLUMN {name} {column_type}")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_start ON events (city, start_timestamp)")
+
+    def _iter_last_run_events(self, city_name, run_id):
+        """Events whose most recent sighting is the given run"""
+        cursor = self.conn.execute(
+            "SELECT * FROM events WHERE city = ? AND last_run_id = ? ORDER BY last_position",
+            (city_name, run_id)
+        )
+        for row in cursor:
+            yield self._row_to_dict(row)
+
+    @staticmethod
+    def _row_to_dict(row):
+        """Convert a database row to the event dictionary used in JSON files"""
+        return {
+            "Title": row["title"],
+            "Link": row["link"],
+            "Event_Id": int(row["event_id"]) if row["event_id"].isdigit() else None,
+            "Date/Time": row["date_time"],
+            "Location": row["location"],
+            "City_Match": bool(row["city_match"]),
+            "Source_Approach": row["source_approach"],
+            "Urgency": row["urgency"],
+            "Start_Timestamp": row["start_timestamp"],
+            "End_Timestamp": row["end_timestamp"],
+            "First_Seen": row["first_seen"],
+            "Last_Seen": row["last_seen"]
+        }
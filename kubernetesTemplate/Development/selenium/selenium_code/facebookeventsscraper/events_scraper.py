@@ -3,139 +3,441 @@ Events Scraper Module
 Handles all Facebook events scraping functionality
 """
 
-import time
+from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from date_parser import DateParser, event_timezone
+from http_fetcher import FetchBlocked
+from network_capture import GraphQLEventCapture
+from search_url import SearchUrlBuilder
+from tracer import Tracer, sleep
+from utils import ConfigManager, AdaptiveTimeout, EventDeduplicator, TextParser
+
+# Collects href and visible text of every event anchor in a single round trip
+EVENT_ANCHORS_SCRIPT = """
+var anchors = document.querySelectorAll("a[href*='/events/']");
+var results = [];
+for (var i = 0; i < anchors.length; i++) {
+    var anchor = anchors[i];
+    results.push({
+        href: anchor.href || '',
+        text: anchor.innerText || '',
+        aria_label: anchor.getAttribute('aria-label') || ''
+    });
+}
+return results;
+"""
+
+# Defines newEventAnchors(): event anchors whose href was not returned before on this
+# page, plus the total anchor count. The seen-set lives in a window variable, so it is
+# dropped on navigation. Anchors without text yet are left for a later call, because
+# cards render their text lazily.
+NEW_EVENT_ANCHORS_JS = """
+function newEventAnchors() {
+    var seen = window.__fbEventsSeen = window.__fbEventsSeen || {};
+    var anchors = document.querySelectorAll("a[href*='/events/']");
+    var fresh = [];
+    for (var i = 0; i < anchors.length; i++) {
+        var anchor = anchors[i], href = anchor.href || '';
+        if (!href || seen[href]) { continue; }
+        var text = anchor.innerText || '', ariaLabel = anchor.getAttribute('aria-label') || '';
+        if (!text.trim() && !ariaLabel.trim()) { continue; }
+        seen[href] = true;
+        fresh.push({href: href, text: text, aria_label: ariaLabel});
+    }
+    return {count: anchors.length, anchors: fresh};
+}
+"""
+
+# Returns {count, anchors} with only the anchors not seen before (see above)
+NEW_EVENT_ANCHORS_SCRIPT = NEW_EVENT_ANCHORS_JS + "return newEventAnchors();"
+
+# Optionally scrolls to the bottom, then resolves as soon as new event anchors appear
+# and the DOM has been quiet for a short period, or when the timeout elapses. The
+# result also carries the new anchors, so a scroll step needs a single round trip.
+# Arguments: baseline count, timeout in ms, quiet period in ms, scroll first, async callback.
+WAIT_FOR_NEW_EVENTS_SCRIPT = NEW_EVENT_ANCHORS_JS + """
+var baseline = arguments[0], timeoutMs = arguments[1], quietMs = arguments[2], scrollFirst = arguments[3];
+var done = arguments[arguments.length - 1];
+var selector = "a[href*='/events/']";
+var start = Date.now();
+var quietTimer = null, hardTimer = null, observer = null, finished = false;
+
+function count() { return document.querySelectorAll(selector).length; }
+
+function finish(reason) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    var result = newEventAnchors();
+    result.elapsed_ms = Date.now() - start;
+    result.reason = reason;
+    done(result);
+}
+
+function check() {
+    if (count() > baseline) {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(function() { finish('loaded'); }, quietMs);
+    }
+}
+
+observer = new MutationObserver(function(mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+        if (mutations[i].addedNodes.length) { check(); return; }
+    }
+});
+if (scrollFirst) { window.scrollTo(0, document.body.scrollHeight); }
+observer.observe(document.body, {childList: true, subtree: true});
+hardTimer = setTimeout(function() { finish('timeout'); }, timeoutMs);
+check();
+"""
+
+# Finds visible, enabled "load more" controls in one round trip. Arguments: texts to
+# match (lowercase), skip phrases, ids of buttons that failed before. Returns the event
+# anchor count and candidates best first, each with a stable id and its element.
+# Ids use nth-last-of-type because new events are inserted before these controls.
+FIND_LOAD_MORE_BUTTONS_SCRIPT = """
+var texts = arguments[0], skipPhrases = arguments[1], failed = arguments[2];
+var nodes = document.querySelectorAll("button, a, div, span, [role='button']");
+var seen = [], candidates = [];
+
+function ownText(el) {
+    var text = '';
+    for (var i = 0; i < el.childNodes.length; i++) {
+        if (el.childNodes[i].nodeType === 3) { text += el.childNodes[i].nodeValue; }
+    }
+    return text.trim().toLowerCase();
+}
+
+function visible(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+function stableId(el, text) {
+    var path = [], node = el;
+    for (var depth = 0; node && node !== document.body && depth < 6; depth++) {
+        var index = 1, sibling = node.nextElementSibling;
+        for (; sibling; sibling = sibling.nextElementSibling) {
+            if (sibling.tagName === node.tagName) { index++; }
+        }
+        path.unshift(node.tagName.toLowerCase() + ':' + index);
+        node = node.parentElement;
+    }
+    return text + '|' + (el.getAttribute('aria-label') || '') + '|' + path.join('>');
+}
+
+for (var i = 0; i < nodes.length; i++) {
+    var text = ownText(nodes[i]);
+    if (!text) { continue; }
+
+    var matched = '';
+    for (var t = 0; t < texts.length; t++) {
+        if (text.indexOf(texts[t]) !== -1 && texts[t].length > matched.length) { matched = texts[t]; }
+    }
+    if (!matched) { continue; }
+
+    var target = nodes[i].closest("button, a, [role='button']") || nodes[i];
+    if (seen.indexOf(target) !== -1 || !visible(target)) { continue; }
+    seen.push(target);
+    if (target.disabled || target.getAttribute('aria-disabled') === 'true') { continue; }
+
+    var fullText = (target.innerText || text).trim().toLowerCase();
+    var skip = false;
+    for (var s = 0; s < skipPhrases.length; s++) {
+        if (fullText.indexOf(skipPhrases[s]) !== -1) { skip = true; break; }
+    }
+    if (skip) { continue; }
+
+    var id = stableId(target, fullText);
+    if (failed.indexOf(id) !== -1) { continue; }
+
+    // Longer (more specific) phrases, real buttons and tight labels rank first
+    var tag = target.tagName.toLowerCase();
+    var score = matched.length * 2 - (fullText.length - matched.length) * 0.1;
+    if (tag === 'button' || target.getAttribute('role') === 'button') { score += 10; }
+    else if (tag === 'a') { score += 5; }
+
+    candidates.push({id: id, text: fullText, score: score, element: target});
+}
+
+candidates.sort(function(a, b) { return b.score - a.score; });
+return {count: document.querySelectorAll("a[href*='/events/']").length, candidates: candidates};
+"""
+
+# Returns the first of the given lowercase labels shown by a checked/selected control
+# (or its near ancestors), i.e. which date option the search page considers applied.
+VERIFY_DATE_FILTER_SCRIPT = """
+var labels = arguments[0];
+var checked = document.querySelectorAll("[aria-checked='true'], input:checked, [aria-selected='true']");
+for (var i = 0; i < checked.length; i++) {
+    var node = checked[i];
+    for (var depth = 0; node && depth < 4; depth++) {
+        var text = (node.innerText || node.textContent || '').toLowerCase();
+        if (text.length < 200) {
+            for (var l = 0; l < labels.length; l++) {
+                if (text.indexOf(labels[l]) !== -1) { return labels[l]; }
+            }
+        }
+        node = node.parentElement;
+    }
+}
+return null;
+"""
 
 class EventsScraper:
-    def __init__(self, browser_manager):
+    def __init__(self, browser_manager, bulk_extraction=True, tracer=None, network_extraction=None, http_fetcher=None):
         self.browser = browser_manager
         self.driver = browser_manager.get_driver()
         self.events_found = []
         self.failed_buttons = set()  # Track buttons that don't work across scrolls
+        self.bulk_extraction = bulk_extraction  # One execute_script instead of 2 commands per link
+        self.scroll_timeout = AdaptiveTimeout(ConfigManager.SCROLL_MIN_WAIT, ConfigManager.SCROLL_MAX_WAIT)
+        self._reset_anchor_delta()
+        self.tracer = tracer or Tracer(browser_manager)
+        # Structured events from GraphQL responses; DOM extraction is the fallback
+        self.network_capture = GraphQLEventCapture(browser_manager, network_extraction)
+        # Logged-in HttpEventFetcher tried before the browser (attached after login)
+        self.http_fetcher = http_fetcher
+        # Date strings become timestamps relative to the scrape time; None window keeps every event
+        self.date_parser = DateParser()
+        self.date_window = None
     
     def search_and_extract_events(self, city_name="Timișoara"):
-        """Search and extract events with simplified search terms"""
+        """Search and extract events with simplified search terms; keeps what was found if scraping fails midway"""
+        events = []
+        
+        try:
+            for event in self.iter_events(city_name):
+                events.append(event)
+        except Exception as e:
+            print(f"❌ Event search error after {len(events)} events: {e}")
+        
+        with self.tracer.span("sort", events=len(events)):
+            self.sort_by_relevance(events)
+        self.events_found = events
+        
+        print(f"\n📊 TOTAL RESULTS: {len(events)} unique events")
+        return events
+    
+    def iter_events(self, city_name="Timișoara", approach_num=1):
+        """Yield new, deduplicated event dictionaries as they appear while the results are scrolled
+
+        Events already on the page come first, then the ones each scroll step reveals, so consumers
+        get results long before scrolling ends and keep them if a later step fails.
+        """
         print(f"📅 Searching for events in {city_name}...")
+        self.events_found = []
+        self.date_parser = DateParser()  # 'Today' and 'Sat' are relative to this scrape
+        self.date_window = None
         
-        all_events = []
+        # Simplified search - just use city name, date range encoded in the URL
+        search = SearchUrlBuilder(city_name)
+        if ConfigManager.URL_DATE_FILTER:
+            search.this_week()
+            if ConfigManager.PYTHON_DATE_FILTER and self.http_fetcher:
+                # The lightweight pages do not confirm the filter, so enforce it on timestamps
+                self.date_window = self.date_parser.this_week()
+        
+        if self.http_fetcher:
+            try:
+                yield from self._iter_events_over_http(search, city_name, approach_num)
+                return
+            except FetchBlocked as e:
+                print(f"🌐 HTTP fetch not usable ({e}), falling back to the browser")
+        
+        url = search.build()
+        print(f"🔍 Using simplified search: {url}")
+        
+        with self.tracer.span("search_navigation", approach=approach_num):
+            self.network_capture.start()
+            self.driver.get(url)
+            self._reset_anchor_delta()
+            sleep(3)
+        
+        # Apply date filter for "This week"
+        with self.tracer.span("date_filter", approach=approach_num) as span:
+            span["method"] = self._apply_date_filter(search)
+            if span["method"] == "python":
+                self.date_window = self.date_parser.this_week()
+            if span["method"]:
+                print(f"✅ Applied 'This week' filter ({span['method']})")
+            else:
+                print("⚠️ Could not apply date filter, continuing without filter")
+                self.browser.take_screenshot("date_filter_failed.png", failure=True)
+        
+        deduplicator = EventDeduplicator()
         
         try:
-            # Simplified search approaches - just use city name
-            search_approaches = [
-                f"https://www.facebook.com/events/search/?q={city_name}",
-            ]
+            # Initial wait, then extract after every scroll step (step 0 is the first page)
+            sleep(3)
+            self._poll_event_anchors()
+            step = 0
+            scroll_steps = self._iter_scroll_steps()
+            while True:
+                with self.tracer.span("extract", approach=approach_num, step=step) as span:
+                    new_events = [
+                        event for event in self._extract_new_events(city_name, approach_num, first_page=step == 0)
+                        if self._in_date_window(event) and deduplicator.add(event)
+                    ]
+                    span["events"] = len(new_events)
+                
+                if new_events:
+                    print(f"   📤 Step {step}: {len(new_events)} new events (total {len(self.events_found) + len(new_events)})")
+                for event in new_events:
+                    self.events_found.append(event)
+                    yield event
+                
+                step = next(scroll_steps, None)
+                if step is None:
+                    break
             
-            print(f"🔍 Using simplified search: {search_approaches[0]}")
+            with self.tracer.span("screenshot", approach=approach_num):
+                self.browser.take_screenshot(f"events_loaded_approach_{approach_num}_{city_name}.png")
             
-            for i, approach in enumerate(search_approaches):
-                print(f"\n🔍 Approach {i+1}: {approach}")
-                
+            if not self.events_found:
+                self.browser.take_screenshot(f"no_events_approach_{approach_num}_{city_name}.png", failure=True)
+            print(f"✅ Found {len(self.events_found)} events for {city_name}")
+            
+        except Exception as e:
+            print(f"❌ Load and extract error after {len(self.events_found)} events: {e}")
+            self.browser.take_screenshot(f"extract_error_approach_{approach_num}_{city_name}.png", failure=True)
+            raise
+    
+    def _iter_events_over_http(self, search, city_name, approach_num=1):
+        """Yield new events page by page from the lightweight HTML search results
+
+        Raises FetchBlocked before yielding anything when the first page is unusable, so the
+        caller can still switch to the browser; later page failures just end the stream.
+        """
+        url = search.build(ConfigManager.HTTP_SEARCH_BASE_URL)
+        print(f"🌐 Fetching search results over HTTP: {url}")
+        
+        deduplicator = EventDeduplicator()
+        pages = self.http_fetcher.iter_pages(url)
+        page_number = 0
+        
+        while True:
+            with self.tracer.span("http_fetch", page=page_number + 1) as span:
                 try:
-                    self.driver.get(approach)
-                    time.sleep(3)
-                    
-                    # Apply date filter for "This week"
-                    if self._apply_this_week_filter():
-                        print(f"✅ Applied 'This week' filter for approach {i+1}")
-                        time.sleep(3)
-                    else:
-                        print("⚠️ Could not apply date filter, continuing without filter")
-                    
-                    # Load more events with smart scrolling
-                    events_from_approach = self._load_and_extract_events(city_name, approach_num=i+1)
-                    
-                    if events_from_approach:
-                        print(f"✅ Found {len(events_from_approach)} events from approach {i+1}")
-                        all_events.extend(events_from_approach)
-                    else:
-                        print(f"⚠️ No events from approach {i+1}")
-                        
+                    page = next(pages, None)
+                except FetchBlocked:
+                    raise
                 except Exception as e:
-                    print(f"❌ Approach {i+1} failed: {e}")
-                    continue
-            
-            # Remove duplicates
-            unique_events = self._remove_duplicates(all_events)
-            self.events_found = unique_events
+                    if page_number == 0:
+                        raise FetchBlocked(str(e)[:100])
+                    print(f"   ⚠️ HTTP page {page_number + 1} failed: {str(e)[:100]}")
+                    page = None
+                if page is None:
+                    break
+                page_number += 1
+                
+                events = [self._network_event_to_dict(item, city_name, approach_num) for item in page.events]
+                for i, (href, text) in enumerate(self._anchor_link_data(page.anchors)):
+                    event = self._process_event_data(href, text, city_name, approach_num, i)
+                    if event:
+                        events.append(event)
+                new_events = [event for event in events if self._in_date_window(event) and deduplicator.add(event)]
+                span["events"] = len(new_events)
             
-            print(f"\n📊 TOTAL RESULTS: {len(unique_events)} unique events")
-            return unique_events
+            if page_number == 1 and not new_events:
+                raise FetchBlocked("no events on the first page")
             
+            print(f"   🌐 Page {page_number}: {len(new_events)} new events "
+                  f"(total {len(self.events_found) + len(new_events)})")
+            for event in new_events:
+                self.events_found.append(event)
+                yield event
+        
+        print(f"✅ Found {len(self.events_found)} events for {city_name} over HTTP "
+              f"({self.http_fetcher.client.requests} requests, {self.http_fetcher.client.bytes_received / 1024:.0f} KiB)")
+    
+    def _extract_new_events(self, city_name, approach_num, first_page=False):
+        """Events captured from GraphQL responses since the last step; anchors are the fallback
+
+        The first page is embedded in the HTML and never arrives as a GraphQL response, so its anchors
+        are always parsed. Later steps parse anchors only when capture delivered nothing new.
+        """
+        events = self._extract_events_from_network(city_name, approach_num)
+        if events and not first_page:
+            self.new_anchors = []  # The captured responses already cover these links
+            return events
+        events.extend(self._extract_events_enhanced(city_name, approach_num, incremental=True))
+        return events
+    
+    def _apply_date_filter(self, search):
+        """Verify the URL-encoded date filter; if it did not apply, filter parsed timestamps or click 'This week'
+
+        Returns 'url', 'python', 'ui' or None when no filter could be applied.
+        """
+        if search.filters and self._verify_date_filter(search):
+            return "url"
+        
+        if ConfigManager.PYTHON_DATE_FILTER:
+            if search.filters:
+                print("⚠️ URL date filter not confirmed by the page, filtering event dates instead")
+            return "python"
+        
+        if search.filters:
+            print("⚠️ URL date filter not confirmed by the page, falling back to the filter UI")
+        if self._apply_this_week_filter():
+            sleep(3)
+            return "ui"
+        return None
+    
+    def _in_date_window(self, event):
+        """Whether an event dictionary overlaps the active date window (events without dates pass)"""
+        if not self.date_window:
+            return True
+        return DateParser.in_window(event.get('Start_Timestamp'), event.get('End_Timestamp'), self.date_window)
+    
+    def _verify_date_filter(self, search):
+        """The page kept the filters parameter and shows the date option as selected"""
+        try:
+            if "filters=" not in self.driver.current_url:
+                print("   ⚠️ Search page dropped the filters parameter")
+                return False
+            label = self.driver.execute_script(VERIFY_DATE_FILTER_SCRIPT, search.verification_labels())
         except Exception as e:
-            print(f"❌ Event search error: {e}")
-            return []
+            print(f"   ⚠️ Could not verify date filter: {e}")
+            return False
+        
+        if label:
+            print(f"   ✅ Date filter applied from URL (selected: '{label}')")
+            return True
+        return False
     
     def _apply_this_week_filter(self):
-        """Apply 'This week' date filter on Facebook Events search page"""
+        """Apply 'This week' date filter on Facebook Events search page, historical winners first"""
         try:
             print("📅 Applying 'This week' date filter...")
             
             # Take screenshot to see current state
             self.browser.take_screenshot("before_date_filter.png")
-            print("📸 Screenshot before filter: before_date_filter.png")
-            
-            # Method 1: Find the specific "This week" checkbox using more precise selectors
-            this_week_patterns = [
-                "//input[@type='checkbox'][following-sibling::*[contains(text(), 'This week')] or preceding-sibling::*[contains(text(), 'This week')]]",
-                "//input[@type='checkbox'][..//*[contains(text(), 'This week')]]",
-                "//label[contains(text(), 'This week')]//input[@type='checkbox']",
-                "//label[contains(text(), 'This week')]",
-                "//div[contains(text(), 'This week')]//input[@type='checkbox']",
-                "//div[contains(text(), 'This week')]//*[@role='checkbox']",
-                "//div[contains(text(), 'This week')]",
-                "//span[contains(text(), 'This week')]//input[@type='checkbox']",
-                "//span[contains(text(), 'This week')]/ancestor::*//input[@type='checkbox']",
-                "//span[contains(text(), 'This week')]",
-                "//div[@role='checkbox'][.//text()[contains(., 'This week')]]",
-                "//*[@role='checkbox'][contains(@aria-label, 'This week')]",
-                "//*[contains(@aria-label, 'This week')]",
-                "//*[contains(text(), 'This week') and (@role='checkbox' or @type='checkbox' or ancestor::label)]"
-            ]
             
-            for i, pattern in enumerate(this_week_patterns):
-                try:
-                    print(f"🔍 Trying pattern {i+1}: {pattern[:60]}...")
-                    
-                    element = WebDriverWait(self.driver, 2).until(
-                        EC.presence_of_element_located((By.XPATH, pattern))
-                    )
-                    
-                    if element.is_displayed():
-                        print(f"✅ Found 'This week' element with pattern {i+1}")
-                        
-                        # Check if it's already selected/checked
-                        is_selected = self._check_if_selected(element)
-                        
-                        if is_selected:
-                            print("ℹ️ 'This week' filter already applied")
-                            return True
-                        
-                        # Try to click it
-                        click_success = self._enhanced_click(element)
-                        if click_success:
-                            print("✅ Successfully applied 'This week' filter")
-                            time.sleep(3)
-                            
-                            # Take screenshot after applying filter
-                            self.browser.take_screenshot("after_date_filter.png")
-                            print("📸 Screenshot after filter: after_date_filter.png")
-                            
-                            return True
-                        else:
-                            print(f"❌ Could not click element from pattern {i+1}")
-                    
-                except TimeoutException:
-                    continue
-                except Exception as e:
-                    print(f"⚠️ Pattern {i+1} error: {e}")
-                    continue
+            # XPath patterns first, then the broader page-analysis methods
+            candidates = [
+                (f"xpath:{pattern}", lambda timeout, pattern=pattern: self._try_this_week_pattern(pattern, timeout))
+                for pattern in ConfigManager.THIS_WEEK_PATTERNS
+            ]
+            candidates += [
+                ("facebook_ui_structure", lambda timeout: self._try_facebook_ui_structure()),
+                ("javascript", lambda timeout: self._try_javascript_approach()),
+                ("checkbox_analysis", lambda timeout: self._try_checkbox_analysis())
+            ]
             
-            # Additional methods if patterns fail
-            if self._try_facebook_ui_structure() or self._try_javascript_approach() or self._try_checkbox_analysis():
+            if self.browser.strategy_ranker.run(
+                "this_week_filter", candidates,
+                lambda strategy, timeout: strategy(timeout),
+                ConfigManager.STRATEGY_DEFAULT_TIMEOUT
+            ):
                 return True
             
             print("❌ Could not find or click 'This week' option after trying all methods")
@@ -146,6 +448,38 @@ class EventsScraper:
             print(f"❌ Date filter error: {e}")
             return False
     
+    def _try_this_week_pattern(self, pattern, timeout):
+        """Find the 'This week' option with one XPath pattern and select it"""
+        print(f"🔍 Trying pattern ({timeout:.1f}s): {pattern[:60]}...")
+        
+        try:
+            element = WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.XPATH, pattern))
+            )
+        except TimeoutException:
+            return False
+        
+        if not element.is_displayed():
+            return False
+        print("✅ Found 'This week' element")
+        
+        # Check if it's already selected/checked
+        if self._check_if_selected(element):
+            print("ℹ️ 'This week' filter already applied")
+            return True
+        
+        # Try to click it
+        if self._enhanced_click(element):
+            print("✅ Successfully applied 'This week' filter")
+            sleep(3)
+            
+            # Take screenshot after applying filter
+            self.browser.take_screenshot("after_date_filter.png")
+            return True
+        
+        print("❌ Could not click 'This week' element")
+        return False
+    
     def _check_if_selected(self, element):
         """Check if element is already selected/checked"""
         try:
@@ -166,7 +500,7 @@ class EventsScraper:
             ("JavaScript click", lambda el: self.driver.execute_script("arguments[0].click();", el)),
             ("Scroll and click", lambda el: (
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", el),
-                time.sleep(1),
+                sleep(1),
                 el.click()
             )),
         ]
@@ -206,7 +540,7 @@ class EventsScraper:
                                 print(f"🎯 Found 'This week' in dates container")
                                 if self._enhanced_click(element):
                                     print("✅ Successfully clicked 'This week' in container")
-                                    time.sleep(3)
+                                    sleep(3)
                                     return True
                 except:
                     continue
@@ -270,7 +604,7 @@ class EventsScraper:
             
             if "Clicked" in result:
                 print("✅ JavaScript successfully clicked 'This week'")
-                time.sleep(3)
+                sleep(3)
                 return True
             return False
                 
@@ -298,7 +632,7 @@ class EventsScraper:
                         if not checkbox.is_selected():
                             if self._enhanced_click(checkbox):
                                 print("✅ Successfully checked 'This week' checkbox")
-                                time.sleep(3)
+                                sleep(3)
                                 return True
                         else:
                             print("ℹ️ 'This week' checkbox already checked")
@@ -333,190 +667,179 @@ class EventsScraper:
                 continue
         return checkbox_context
     
-    def _load_and_extract_events(self, city_name, approach_num=1):
-        """Load more events with aggressive scrolling and extract"""
-        try:
-            print(f"📜 Loading events for approach {approach_num}...")
-            
-            # Initial wait
-            time.sleep(3)
-            
-            # Get initial count
-            initial_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']")
-            print(f"   Initial event links found: {len(initial_links)}")
-            
-            # Aggressive scrolling to load more events
-            self._scroll_to_load_events()
-            
-            # Take screenshot
-            screenshot_name = f"events_loaded_approach_{approach_num}_{city_name}.png"
-            self.browser.take_screenshot(screenshot_name)
-            print(f"   📸 Screenshot: {screenshot_name}")
-            
-            # Extract events
-            return self._extract_events_enhanced(city_name, approach_num)
-            
-        except Exception as e:
-            print(f"❌ Load and extract error: {e}")
-            return []
-    
     def _scroll_to_load_events(self):
         """Perform enhanced scrolling to load ALL events with smart exit conditions"""
+        for _ in self._iter_scroll_steps():
+            pass
+    
+    def _iter_scroll_steps(self):
+        """Scroll until no more events load, yielding the step number after each scroll"""
         print("   🔄 Starting enhanced scrolling to load all events...")
 
-        max_scrolls = 20
-        scroll_pause_time = 5
-        last_count = 0
+        max_scrolls = ConfigManager.MAX_SCROLLS
+        last_count = self._poll_event_anchors()
+        print(f"   Initial event links found: {last_count}")
         stable_count = 0
         
         for scroll in range(max_scrolls):
-            print(f"   📜 Scroll {scroll+1}/{max_scrolls}: Scrolling to bottom...")
+            # One span per step; the yield stays outside so consumer time is not counted
+            with self.tracer.span("scroll_step", step=scroll+1, links=last_count) as span:
+                last_count, stable_count, finished = self._scroll_step(scroll, last_count, stable_count)
+                span["links"] = last_count
+            yield scroll + 1
+            if finished:
+                break
 
-            # Scroll to bottom of page
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        print(f"   🏁 Scrolling completed. Final count: {last_count} event links")
 
-            # Wait 5 seconds for content to load
-            print(f"   ⏳ Waiting {scroll_pause_time} seconds for content to load...")
-            time.sleep(scroll_pause_time)
+        # Take final screenshot (moved here from previous duplicate method)
+        self.browser.take_screenshot("final_scroll_state.png")
+    
+    def _scroll_step(self, scroll, last_count, stable_count):
+        """One scroll to the bottom plus load-more fallbacks; returns (link count, stable cycles, finished)"""
+        max_scrolls = ConfigManager.MAX_SCROLLS
+        print(f"   📜 Scroll {scroll+1}/{max_scrolls}: Scrolling to bottom...")
 
-            # Check if more content loaded
-            current_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']")
-            current_count = len(current_links)
+        # Scroll to bottom and return as soon as new anchors settle instead of sleeping a fixed interval
+        current_count = self._wait_for_new_events(last_count, scroll=True)
 
-            print(f"   📊 After scroll {scroll+1}: {current_count} event links found")
+        print(f"   📊 After scroll {scroll+1}: {current_count} event links found")
 
-            if current_count == last_count:
-                stable_count += 1
-                print(f"   ⚠️ No new content loaded (stable cycle {stable_count})")
+        if current_count > last_count:
+            # Content increased, reset counters
+            print(f"   ✅ Loaded {current_count - last_count} new events! Total: {current_count}")
+            return current_count, 0, False
 
-                # Try clicking "load more" buttons. Pass self.failed_buttons to avoid re-trying
-                button_worked = self._click_load_more_buttons()
+        stable_count += 1
+        print(f"   ⚠️ No new content loaded (stable cycle {stable_count})")
 
-                if button_worked:
-                    print("   ✅ Load more button worked, resetting counters...")
-                    stable_count = 0
-                    last_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
-                    continue
-                else:
-                    print("   ℹ️ No effective load more button found or clicked in this cycle.")
-
-                # If still no change after multiple attempts, try advanced techniques
-                if stable_count >= 2:  # Consider stopping after 2-3 stable counts
-                    print(f"   🛑 No new content after {stable_count} attempts, trying advanced loading...")
-                    if self._try_advanced_loading_techniques():
-                        print("   ✅ Advanced loading worked, resetting counters...")
-                        stable_count = 0
-                        last_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
-                        continue
-                    else:
-                        print(f"   🏁 Stopping scrolling at {current_count} events (no more content)")
-                        break # No more content or techniques worked
+        # Try clicking "load more" buttons. Pass self.failed_buttons to avoid re-trying
+        if self._click_load_more_buttons():
+            print("   ✅ Load more button worked, resetting counters...")
+            return self.anchor_count, 0, False
+        print("   ℹ️ No effective load more button found or clicked in this cycle.")
 
-            else:
-                # Content increased, reset counters
-                stable_count = 0
-                new_events = current_count - last_count
-                print(f"   ✅ Loaded {new_events} new events! Total: {current_count}")
+        # If still no change after multiple attempts, try advanced techniques
+        if stable_count >= 2:  # Consider stopping after 2-3 stable counts
+            print(f"   🛑 No new content after {stable_count} attempts, trying advanced loading...")
+            if self._try_advanced_loading_techniques():
+                print("   ✅ Advanced loading worked, resetting counters...")
+                return self.anchor_count, 0, False
+            print(f"   🏁 Stopping scrolling at {current_count} events (no more content)")
+            return current_count, stable_count, True  # No more content or techniques worked
 
-            last_count = current_count
+        return current_count, stable_count, False
 
-        print(f"   🏁 Scrolling completed. Final count: {last_count} event links")
-
-        # Take final screenshot (moved here from previous duplicate method)
-        self.browser.take_screenshot("final_scroll_state.png")
-        print("   📸 Final state screenshot: final_scroll_state.png")
+    def _wait_for_new_events(self, baseline_count, scroll=False):
+        """Wait until more than baseline_count event anchors exist, or the adaptive timeout elapses"""
+        timeout = self.scroll_timeout.current()
+        quiet_period = ConfigManager.SCROLL_QUIET_PERIOD
+        print(f"   ⏳ Waiting up to {timeout:.1f}s for new events...")
+        
+        try:
+            self.driver.set_script_timeout(timeout + quiet_period + 5)
+            result = self.driver.execute_async_script(
+                WAIT_FOR_NEW_EVENTS_SCRIPT, baseline_count, int(timeout * 1000), int(quiet_period * 1000), scroll
+            ) or {}
+        except Exception as e:
+            print(f"   ⚠️ In-page watcher failed, falling back to fixed wait: {str(e)[:80]}")
+            if scroll:
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            sleep(ConfigManager.SCROLL_PAUSE_TIME)
+            return self._poll_event_anchors()
+        
+        self._record_anchor_delta(result)
+        
+        elapsed = result.get('elapsed_ms', 0) / 1000
+        if result.get('reason') == 'loaded':
+            # Learn from the time until the first new anchor, not the trailing quiet period
+            self.scroll_timeout.record(max(0.0, elapsed - quiet_period))
+            print(f"   ⚡ New events appeared after {elapsed:.2f}s")
+        else:
+            print(f"   ⌛ No new events within {elapsed:.2f}s")
+        
+        return self.anchor_count
 
+    def _reset_anchor_delta(self):
+        """Forget collected anchors; the in-page seen-set is dropped by navigation"""
+        self.new_anchors = []  # Anchors returned by the page but not extracted yet
+        self.anchor_count = 0
+        self.anchor_delta_failed = False
+    
+    def _poll_event_anchors(self):
+        """Collect anchors not seen before on this page in one script call; returns the total anchor count"""
+        try:
+            result = self.driver.execute_script(NEW_EVENT_ANCHORS_SCRIPT) or {}
+        except Exception as e:
+            print(f"   ⚠️ Incremental anchor collection failed: {str(e)[:80]}")
+            self.anchor_delta_failed = True
+            self.anchor_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
+            return self.anchor_count
+        return self._record_anchor_delta(result)
+    
+    def _record_anchor_delta(self, result):
+        """Queue the new anchors of a delta script result and remember the anchor count"""
+        self.new_anchors.extend(result.get('anchors') or [])
+        self.anchor_count = result.get('count', self.anchor_count)
+        return self.anchor_count
 
     def _click_load_more_buttons(self):
         """
-        Unified method to find and click "load more" buttons.
-        Returns True if a button was successfully clicked and new content loaded, False otherwise.
+        Find "load more" candidates with one script call and click the best one.
+        Returns True if the click loaded new events, False otherwise.
         """
-        load_more_texts = [
-            "see more", "load more", "show more", "more events", 
-            "view more", "see all", "show all", "meer weergeven",
-            "load more events", "show more events", "view all events"
-        ]
+        try:
+            result = self.driver.execute_script(
+                FIND_LOAD_MORE_BUTTONS_SCRIPT,
+                ConfigManager.LOAD_MORE_TEXTS,
+                ConfigManager.LOAD_MORE_SKIP_PHRASES,
+                list(self.failed_buttons)  # Skip buttons that previously failed
+            ) or {}
+        except Exception as e:
+            print(f"   ⚠️ Load more button search failed: {e}")
+            return False
         
-        # Filter out generic buttons that likely don't work (e.g., Facebook links)
-        skip_phrases = ["see more on facebook", "view on facebook", "go to facebook"]
+        candidates = result.get('candidates') or []
+        if not candidates:
+            print("   ℹ️ No effective load more buttons found or clicked.")
+            return False
         
-        current_event_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
+        best = candidates[0]
+        button_id = best['id']
+        button_text = best['text']
+        current_event_count = result.get('count', 0)
+        print(f"   🎯 Trying load more button: '{button_text}' (best of {len(candidates)})")
         
-        for text in load_more_texts:
-            try:
-                selectors = [
-                    f"//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text}')]",
-                    f"//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text}')]",
-                    f"//div[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text}')]",
-                    f"//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text}')]"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                        for element in elements:
-                            if not element.is_displayed() or not element.is_enabled():
-                                continue
-
-                            button_text = element.text.strip().lower()
-
-                            # Skip known non-working buttons
-                            if any(skip in button_text for skip in skip_phrases):
-                                continue
-                            
-                            # Create a unique identifier for this button
-                            button_id = f"{button_text}_{element.location}"
-                            if button_id in self.failed_buttons:
-                                continue # Skip buttons that previously failed
-
-                            print(f"   🎯 Trying load more button: '{button_text}'")
-
-                            # Scroll to button and click
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                            time.sleep(1) # Short wait before click
-
-                            if self._enhanced_click(element):
-                                print(f"   ✅ Clicked: '{button_text}', checking for new content...")
-                                time.sleep(3) # Wait for content to load after click
-
-                                new_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
-                                if new_count > current_event_count:
-                                    print(f"   🎉 Button worked! {current_event_count} → {new_count} events")
-                                    return True # A button worked and added content
-                                else:
-                                    print(f"   ❌ Button didn't add content, marking as failed: '{button_text}'")
-                                    self.failed_buttons.add(button_id) # Mark as failed for future attempts
-                            else:
-                                print(f"   ❌ Could not click button: '{button_text}'")
-                                self.failed_buttons.add(button_id) # Mark as failed if click itself failed
-                    except NoSuchElementException:
-                        continue # If selector doesn't find elements, just continue to next
-                    except Exception as e:
-                        print(f"   ⚠️ Error processing button element: {e}")
-                        continue
-            except Exception as e:
-                print(f"   ⚠️ Error with selector for '{text}': {e}")
-                continue
+        if not self._enhanced_click(best['element']):
+            print(f"   ❌ Could not click button: '{button_text}'")
+            self.failed_buttons.add(button_id)  # Mark as failed if click itself failed
+            return False
+        
+        print(f"   ✅ Clicked: '{button_text}', checking for new content...")
+        new_count = self._wait_for_new_events(current_event_count)
+        if new_count > current_event_count:
+            print(f"   🎉 Button worked! {current_event_count} → {new_count} events")
+            return True
         
-        print("   ℹ️ No effective load more buttons found or clicked.")
-        return False # No buttons worked to load new content
+        print(f"   ❌ Button didn't add content, marking as failed: '{button_text}'")
+        self.failed_buttons.add(button_id)  # Mark as failed for future attempts
+        return False
 
     def _try_advanced_loading_techniques(self):
         """Try advanced techniques to load more content with better success detection"""
         print("   🔍 Trying advanced loading techniques...")
         
-        initial_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
+        initial_count = self.anchor_count
         
         # Technique 1: Multiple rapid scrolls
         try:
             print("   📜 Technique 1: Rapid scroll bursts...")
             for i in range(3):
                 self.driver.execute_script("window.scrollBy(0, 800);")
-                time.sleep(0.3)
-            time.sleep(2) # Give a moment for content to appear
+                sleep(0.3)
+            sleep(2) # Give a moment for content to appear
             
-            new_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
+            new_count = self._poll_event_anchors()
             if new_count > initial_count:
                 print(f"   ✅ Rapid scrolls worked: {initial_count} → {new_count}")
                 return True
@@ -528,11 +851,11 @@ class EventsScraper:
         try:
             print("   🔄 Technique 2: Lazy loading triggers...")
             self.driver.execute_script("window.scrollBy(0, -300);") # Scroll up slightly
-            time.sleep(1)
+            sleep(1)
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);") # Scroll back to bottom
-            time.sleep(2) # Wait for content
+            sleep(2) # Wait for content
             
-            new_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
+            new_count = self._poll_event_anchors()
             if new_count > initial_count:
                 print(f"   ✅ Lazy loading trigger worked: {initial_count} → {new_count}")
                 return True
@@ -545,9 +868,9 @@ class EventsScraper:
             print("   ⌨️ Technique 3: END key press...")
             body = self.driver.find_element(By.TAG_NAME, "body")
             body.send_keys(Keys.END)
-            time.sleep(3)
+            sleep(3)
             
-            new_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']"))
+            new_count = self._poll_event_anchors()
             if new_count > initial_count:
                 print(f"   ✅ END key worked: {initial_count} → {new_count}")
                 return True
@@ -558,23 +881,90 @@ class EventsScraper:
         print("   ℹ️ Advanced loading techniques didn't find new content.")
         return False
     
-    def _extract_events_enhanced(self, city_name, approach_num=1):
-        """Enhanced event extraction with more aggressive collection"""
+    def _extract_events_from_network(self, city_name, approach_num=1):
+        """Build events from GraphQL responses captured since the last call; empty when nothing new arrived"""
+        if not self.network_capture.enabled:
+            return []
+        
+        try:
+            captured = self.network_capture.collect()
+        except Exception as e:
+            print(f"   ⚠️ Network extraction failed: {e}")
+            return []
+        
+        if not captured:
+            print("   📡 No new event data captured from network responses")
+            return []
+        
+        events = [self._network_event_to_dict(item, city_name, approach_num) for item in captured]
+        print(f"   📡 Decoded {len(events)} new events ({self.network_capture.responses} GraphQL responses so far)")
+        return events
+    
+    def _network_event_to_dict(self, item, city_name, approach_num):
+        """Map a decoded GraphQL event to the scraper's event dictionary"""
+        event = {
+            'Title': TextParser.clean_title(item['title'], ConfigManager.MAX_TITLE_LENGTH),
+            'Link': item['url'],
+            'Event_Id': int(item['id']),
+            'City_Match': city_name.lower() in f"{item['city'] or ''} {item['venue'] or ''}".lower(),
+            'Source_Approach': approach_num
+        }
+        
+        date_text = item['date_text']
+        if not date_text and item['start_timestamp']:
+            date_text = datetime.fromtimestamp(item['start_timestamp'], event_timezone()).strftime("%a, %b %d at %H:%M")
+        if date_text:
+            event['Date/Time'] = date_text
+        
+        # The payload timestamp is exact; the date text is only parsed when it is missing
+        start, end = self.date_parser.timestamps(date_text or "")
+        if item['start_timestamp']:
+            start, end = int(item['start_timestamp']), max(int(item['start_timestamp']), end or 0)
+        self._set_timestamps(event, start, end)
+        
+        parts = [item['venue']] if item['venue'] else []
+        if item['city'] and item['city'] not in (item['venue'] or ''):
+            parts.append(item['city'])
+        location = ", ".join(parts)
+        if item['is_online'] and not location:
+            location = "Online"
+        if location:
+            event['Location'] = location
+        
+        urgency = self.date_parser.urgency(start) or TextParser.extract_urgency_from_text(date_text or "")
+        if urgency:
+            event['Urgency'] = urgency
+        
+        return event
+    
+    @staticmethod
+    def _set_timestamps(event, start, end):
+        """Store epoch-second bounds on an event dictionary when the date could be parsed"""
+        if start is not None:
+            event['Start_Timestamp'] = start
+            event['End_Timestamp'] = end
+    
+    def _extract_events_enhanced(self, city_name, approach_num=1, incremental=False):
+        """Enhanced event extraction; incremental only processes anchors collected since the last call"""
         events = []
+        commands_before = self.browser.command_count
         
         try:
             print(f"🔍 Extracting events from approach {approach_num}...")
             
-            # Get all event links
-            event_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']")
-            print(f"   Found {len(event_links)} potential event links")
+            # Bulk mode: read every anchor in one script call, no per-link round trips
+            link_data = None
+            if self.bulk_extraction:
+                link_data = self._take_new_anchors() if incremental else None
+                if link_data is None:
+                    link_data = self._collect_event_link_data()
             
-            # Process more events (increased from previous limit)
-            max_events_to_process = min(100, len(event_links)) # Increased to 100 for more comprehensive scraping
+            if link_data is None:
+                link_data = self._collect_event_link_data_per_element()
             
-            for i, link in enumerate(event_links[:max_events_to_process]):
+            for i, (href, text) in enumerate(link_data):
                 try:
-                    event = self._process_event_link(link, city_name, approach_num, i)
+                    event = self._process_event_data(href, text, city_name, approach_num, i)
                     if event:
                         events.append(event)
                         
@@ -588,17 +978,63 @@ class EventsScraper:
                     continue
             
             print(f"   📊 Extracted {len(events)} events from approach {approach_num}")
+            print(f"   📡 WebDriver commands used for extraction: {self.browser.command_count - commands_before}")
             return events
             
         except Exception as e:
             print(f"❌ Enhanced extraction error: {e}")
             return []
     
-    def _process_event_link(self, link, city_name, approach_num, index):
-        """Process a single event link and extract information"""
-        href = link.get_attribute('href')
-        text = link.text.strip()
+    def _collect_event_link_data(self):
+        """Collect (href, text) for all event anchors with a single execute_script call"""
+        try:
+            anchors = self.driver.execute_script(EVENT_ANCHORS_SCRIPT)
+        except Exception as e:
+            print(f"   ⚠️ Bulk extraction failed, falling back to per-element reads: {e}")
+            return None
         
+        if anchors is None:
+            return None
+        
+        print(f"   Found {len(anchors)} potential event links (bulk)")
+        return self._anchor_link_data(anchors)
+    
+    def _take_new_anchors(self):
+        """(href, text) of anchors collected since the last call; None if the page cannot track them"""
+        if self.anchor_delta_failed:
+            return None
+        
+        anchors, self.new_anchors = self.new_anchors, []
+        print(f"   Found {len(anchors)} new event links (incremental)")
+        return self._anchor_link_data(anchors)
+    
+    @staticmethod
+    def _anchor_link_data(anchors):
+        """(href, text) pairs from anchor dictionaries, the aria-label standing in for missing text"""
+        link_data = []
+        for anchor in anchors:
+            text = (anchor.get('text') or '').strip() or (anchor.get('aria_label') or '').strip()
+            link_data.append((anchor.get('href') or '', text))
+        return link_data
+    
+    def _collect_event_link_data_per_element(self):
+        """Legacy extraction: read href and text from each WebElement (2 commands per link)"""
+        event_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/events/']")
+        print(f"   Found {len(event_links)} potential event links")
+        
+        # Capped because every link costs two remote round trips
+        max_events_to_process = min(ConfigManager.MAX_EVENTS_TO_PROCESS, len(event_links))
+        
+        link_data = []
+        for link in event_links[:max_events_to_process]:
+            try:
+                link_data.append((link.get_attribute('href') or '', link.text.strip()))
+            except Exception:
+                continue
+        return link_data
+    
+    def _process_event_data(self, href, text, city_name, approach_num, index):
+        """Build an event from an anchor's href and visible text"""
         # Debug output for first few and some random samples
         if index < 10 or index % 20 == 0: # Adjusted print frequency
             print(f"   Link {index+1}: '{text[:30]}...' -> {href[:50]}...")
@@ -633,17 +1069,21 @@ class EventsScraper:
         if len(event_title) > 120:
             event_title = event_title[:120].rsplit(' ', 1)[0] + "..." if ' ' in event_title[:120] else event_title[:120] + "..." # Clean cut
         
-        # Create event object
+        # Create event object, keyed by the numeric id whatever tracking parameters the link carries
         event = {
             'Title': event_title,
             'Link': href,
+            'Event_Id': EventDeduplicator.parse_event_id(href),
             'City_Match': city_name.lower() in text.lower(),
             'Source_Approach': approach_num
         }
         
         # Add date if found
+        start = None
         if event_date:
             event['Date/Time'] = event_date
+            start, end = self.date_parser.timestamps(event_date)
+            self._set_timestamps(event, start, end)
         
         # Add location if found
         if event_location:
@@ -652,13 +1092,9 @@ class EventsScraper:
             event['Location'] = f"Near {city_name}" # Infer location if city name is in text
         
         # Add additional metadata for sorting
-        lower_text = text.lower()
-        if 'tonight' in lower_text or 'today' in lower_text:
-            event['Urgency'] = 'Today'
-        elif 'tomorrow' in lower_text:
-            event['Urgency'] = 'Tomorrow'
-        elif 'this week' in lower_text:
-            event['Urgency'] = 'This Week'
+        urgency = self.date_parser.urgency(start) or TextParser.extract_urgency_from_text(text)
+        if urgency:
+            event['Urgency'] = urgency
         
         return event
     
@@ -676,32 +1112,21 @@ class EventsScraper:
         if not event_title and lines:
             event_title = lines[0].strip()
 
-        # Iterate through lines to find date and location
-        for line in lines:
-            lower_line = line.strip().lower()
-            if not event_date and any(word in lower_line for word in [
-                'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
-                'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
-                'today', 'tomorrow', 'tonight', 'this week', 'next week'
-            ]):
-                event_date = line.strip()
-            elif not event_location and (len(line.strip().split()) > 1 and len(line.strip()) > 5): # Simple check for a plausible location line
-                # Avoid setting title as location
-                if line.strip() != event_title:
-                    event_location = line.strip()
+        # Classify every line once, then pick date and location from the classification
+        classified = TextParser.classify_lines(lines)
+        for line, kind in classified:
+            if kind == 'date':
+                if not event_date:
+                    event_date = line
+            elif kind == 'location' and not event_location and line != event_title:
+                event_location = line
 
         # If title was a date, re-assign title from next line
         if event_date and event_title == event_date and len(lines) > 1:
             # Find next line that's not a date/location
-            for i in range(1, len(lines)):
-                if not any(word in lines[i].strip().lower() for word in [
-                    'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
-                    'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                    'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
-                    'today', 'tomorrow', 'tonight', 'this week', 'next week'
-                ]) and not (len(lines[i].strip().split()) > 1 and len(lines[i].strip()) > 5):
-                    event_title = lines[i].strip()
+            for line, kind in classified[1:]:
+                if kind == 'title':
+                    event_title = line
                     break
         
         return event_title, event_date, event_location
@@ -711,35 +1136,13 @@ class EventsScraper:
         try:
             print(f"🔄 Removing duplicates from {len(all_events)} total events...")
             
-            seen_titles = set()
-            seen_links = set()
-            unique_events = []
+            deduplicator = EventDeduplicator()
+            unique_events = [event for event in all_events if deduplicator.add(event)]
             
-            for event in all_events:
-                title = event.get('Title', '').strip()
-                link = event.get('Link', '').strip()
-                
-                # Create a normalized title for comparison (first 70 chars, lowercase, alphanumeric only)
-                title_key = ''.join(filter(str.isalnum, title[:70].lower()))
-                
-                is_duplicate = False
-                
-                if link and link in seen_links:
-                    is_duplicate = True
-                elif title_key and len(title_key) > 10 and title_key in seen_titles: # Require longer title key for more robust matching
-                    is_duplicate = True
-                
-                if not is_duplicate:
-                    unique_events.append(event)
-                    if title_key and len(title_key) > 10:
-                        seen_titles.add(title_key)
-                    if link:
-                        seen_links.add(link)
-                
             print(f"✅ Kept {len(unique_events)} unique events (removed {len(all_events) - len(unique_events)} duplicates)")
             
             # Sort by relevance (city matches first, then by date urgency)
-            unique_events.sort(key=self._sort_events_by_relevance)
+            self.sort_by_relevance(unique_events)
             print(f"📊 Sorted events by relevance (city matches and dates first)")
             
             return unique_events
@@ -748,8 +1151,14 @@ class EventsScraper:
             print(f"❌ Deduplication error: {e}")
             return all_events
     
+    def sort_by_relevance(self, events):
+        """Sort event dictionaries or Event objects in place, most relevant first"""
+        events.sort(key=lambda event: self._sort_events_by_relevance(
+            event if isinstance(event, dict) else event.to_dict()))
+        return events
+    
     def _sort_events_by_relevance(self, event):
-        """Sort events by relevance score"""
+        """Sort key: relevance score, then earliest start (undated events last)"""
         score = 0
         if event.get('City_Match'):
             score += 100
@@ -761,7 +1170,8 @@ class EventsScraper:
             score += 15
         if event.get('Date/Time'):
             score += 10
-        return -score  # Negative for descending order (higher score first)
+        start = event.get('Start_Timestamp')
+        return -score, start if start is not None else float('inf')  # Negative for descending order (higher score first)
     
     def get_events_found(self):
         """Get the list of found events"""
@@ -0,0 +1,259 @@
+"""
+HTTP Fetcher Module
+Fetches search result pages over keep-alive HTTP with the logged-in browser's cookies
+"""
+
+import gzip
+import http.client
+import json
+import threading
+import zlib
+from http.cookies import CookieError, SimpleCookie
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from network_capture import GraphQLEventCapture
+from utils import ConfigManager, EventDeduplicator
+
+# Event links are stored on the main host whichever lightweight host served the page
+EVENT_LINK_BASE = "https://www.facebook.com"
+
+# Elements that start a new line in innerText
+BLOCK_TAGS = {'div', 'p', 'br', 'li', 'ul', 'ol', 'tr', 'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+              'header', 'footer', 'section', 'article'}
+
+class FetchBlocked(Exception):
+    """The HTTP engine cannot serve this page; use the browser"""
+
+
+class EventPageParser(HTMLParser):
+    """One pass over a page: event anchors with innerText-like text, JSON script payloads and more-links"""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.anchors = []  # {href, text, aria_label}, the shape EVENT_ANCHORS_SCRIPT returns
+        self.payloads = []  # JSON documents embedded in <script type="application/json">
+        self.more_links = []  # Hrefs of 'see more' style links, used for pagination
+        self.has_login_form = False
+        self.events = []  # Filled from payloads by decode_events()
+        self._anchor = None
+        self._script = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'a':
+            self._anchor = {'href': urljoin(self.base_url, attrs.get('href') or ''),
+                            'aria_label': attrs.get('aria-label') or '', 'parts': []}
+        elif tag == 'script' and attrs.get('type') == 'application/json':
+            self._script = []
+        elif tag == 'form' and 'login' in (attrs.get('id') or '') + (attrs.get('action') or ''):
+            self.has_login_form = True
+        elif tag in BLOCK_TAGS and self._anchor is not None:
+            self._anchor['parts'].append('\n')
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._anchor is not None:
+            anchor, self._anchor = self._anchor, None
+            lines = (" ".join(line.split()) for line in "".join(anchor.pop('parts')).split('\n'))
+            anchor['text'] = "\n".join(line for line in lines if line)
+            if anchor['text'].lower() in ConfigManager.LOAD_MORE_TEXTS:
+                self.more_links.append(anchor['href'])
+            elif '/events/' in anchor['href']:
+                parts = urlsplit(anchor['href'])
+                anchor['href'] = EVENT_LINK_BASE + parts.path + (f"?{parts.query}" if parts.query else "")
+                self.anchors.append(anchor)
+        elif tag == 'script' and self._script is not None:
+            text, self._script = "".join(self._script), None
+            try:
+                self.payloads.append(json.loads(text))
+            except ValueError:
+                pass
+        elif tag in BLOCK_TAGS and self._anchor is not None:
+            self._anchor['parts'].append('\n')
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+        elif self._anchor is not None:
+            self._anchor['parts'].append(data)
+
+    def next_page_url(self):
+        """Href of a 'see more' style link, if the page has one"""
+        for href in self.more_links:
+            if urlsplit(href).query:
+                return href
+        return None
+
+    def decode_events(self):
+        """Structured events from the embedded JSON, decoded like GraphQL responses"""
+        events = {}
+        for payload in self.payloads:
+            for node in GraphQLEventCapture.iter_event_nodes(payload):
+                event = GraphQLEventCapture.decode_event(node)
+                if event and event['id'] not in events:
+                    events[event['id']] = event
+        self.events = list(events.values())
+        return self.events
+
+
+class HttpFetcher:
+    """Keep-alive HTTP client that carries the authenticated browser session's cookies"""
+
+    def __init__(self, cookies=None, user_agent=None, timeout=None):
+        self.cookies = {}  # name -> (domain, value)
+        self.user_agent = user_agent or ConfigManager.HTTP_USER_AGENT
+        self.timeout = timeout or ConfigManager.HTTP_TIMEOUT
+        self.requests = 0
+        self.bytes_received = 0
+        self._connections = {}  # (scheme, netloc) -> open connection, reused between requests
+        self._lock = threading.Lock()
+        self.update_cookies(cookies or [])
+
+    @classmethod
+    def from_browser(cls, browser_manager):
+        """Client using the browser's current cookies and user agent; None if they cannot be read"""
+        session = browser_manager.export_session()
+        if not session or not session.get("cookies"):
+            return None
+        try:
+            user_agent = browser_manager.execute_script("return navigator.userAgent;")
+        except Exception:
+            user_agent = None
+        return cls(session["cookies"], user_agent)
+
+    def update_cookies(self, cookies):
+        """Merge WebDriver-style cookie dictionaries (name, value, domain)"""
+        for cookie in cookies:
+            self.cookies[cookie['name']] = ((cookie.get('domain') or '').lstrip('.'), cookie['value'])
+
+    def get(self, url, max_redirects=None):
+        """GET following redirects; returns (final url, status, text)"""
+        max_redirects = ConfigManager.HTTP_MAX_REDIRECTS if max_redirects is None else max_redirects
+        for _ in range(max_redirects + 1):
+            status, headers, body = self._request(url)
+            location = headers.get('Location')
+            if status not in (301, 302, 303, 307, 308) or not location:
+                charset = headers.get_content_charset() or 'utf-8'
+                return url, status, body.decode(charset, 'replace')
+            url = urljoin(url, location)
+        return url, status, ""
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections = {}
+
+    def _request(self, url):
+        """One GET on a pooled connection, retried once on a fresh connection if the server dropped it"""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Connection": "keep-alive"
+        }
+        cookie_header = self._cookie_header(parts.hostname or "")
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+
+        with self._lock:
+            for attempt in range(2):
+                connection = self._connection(parts)
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.HTTPException, ConnectionError, OSError):
+                    connection.close()
+                    self._connections.pop((parts.scheme, parts.netloc), None)
+                    if attempt:
+                        raise
+
+        self.requests += 1
+        self.bytes_received += len(body)
+        self._store_cookies(parts.hostname or "", response.headers.get_all('Set-Cookie') or [])
+        return response.status, response.headers, self._decompress(body, response.headers.get('Content-Encoding'))
+
+    def _connection(self, parts):
+        key = (parts.scheme, parts.netloc)
+        connection = self._connections.get(key)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(parts.netloc, timeout=self.timeout)
+            self._connections[key] = connection
+        return connection
+
+    def _cookie_header(self, host):
+        return "; ".join(
+            f"{name}={value}" for name, (domain, value) in self.cookies.items()
+            if not domain or host == domain or host.endswith("." + domain)
+        )
+
+    def _store_cookies(self, host, set_cookie_headers):
+        """Keep rotated session cookies (e.g. fr, xs) so later requests stay logged in"""
+        for header in set_cookie_headers:
+            try:
+                cookie = SimpleCookie(header)
+            except CookieError:
+                continue
+            for name, morsel in cookie.items():
+                self.cookies[name] = ((morsel['domain'] or host).lstrip('.'), morsel.value)
+
+    @staticmethod
+    def _decompress(body, encoding):
+        if encoding == 'gzip':
+            return gzip.decompress(body)
+        if encoding == 'deflate':
+            return zlib.decompress(body)
+        return body
+
+
+class HttpEventFetcher:
+    """Search result pages over HTTP; yields nothing usable when the browser is needed instead"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def iter_pages(self, url, max_pages=None):
+        """Parsed pages, following 'see more' links; raises FetchBlocked if the first page is unusable"""
+        max_pages = max_pages or ConfigManager.HTTP_MAX_PAGES
+        for page_number in range(max_pages):
+            final_url, status, html = self.client.get(url)
+            page = EventPageParser(final_url)
+            page.feed(html)
+            page.close()
+            page.decode_events()
+
+            reason = self.blocked_reason(final_url, status, page)
+            if reason:
+                if page_number == 0:
+                    raise FetchBlocked(reason)
+                print(f"   🌐 Stopping HTTP pagination at page {page_number + 1}: {reason}")
+                return
+
+            yield page
+            url = page.next_page_url()
+            if not url:
+                return
+
+    @staticmethod
+    def blocked_reason(final_url, status, page):
+        """Why a page cannot be used: checkpoint, login redirect, error status or no events"""
+        path = urlsplit(final_url).path
+        if path.startswith("/checkpoint"):
+            return "checkpoint"
+        if path.startswith("/login") or page.has_login_form:
+            return "logged out"
+        if status >= 400:
+            return f"HTTP {status}"
+        # Navigation links like /events/ or /events/discovery/ do not make a page usable
+        if not page.events and not any(EventDeduplicator.parse_event_id(anchor['href']) for anchor in page.anchors):
+            return "empty page"
+        return None
@@ -4,22 +4,39 @@ Facebook Events Scraper - Refactored Version
 Enhanced 2FA Flow: Device approval → Try another way → Authentication app → 1Password code
 """
 
+import queue
+import threading
+
 from browser_manager import BrowserManager
 from auth_manager import AuthManager
 from events_scraper import EventsScraper
 from onepassword_manager import OnePasswordManager
-from utils import FileManager, EventDisplayer, Logger, Event, EventConverter
+from session_store import SessionStore
+from event_store import EventStore
+from event_diff import EventDiff
+from event_enricher import EventEnricher
+from near_duplicates import NearDuplicateIndex
+from http_fetcher import HttpFetcher, HttpEventFetcher
+from tracer import Tracer
+from utils import ConfigManager, FileManager, EventDisplayer, Logger, Event, EventConverter
 
 class FacebookEventsScraper:
     """Main scraper class that orchestrates all components"""
     
-    def __init__(self, selenium_ports=[30479, 30444, 4444]):
+    def __init__(self, selenium_ports=[30479, 30444, 4444], record_path=None, profile=False):
         # Initialize all managers
         self.browser = BrowserManager(selenium_ports)
+        self.record_path = record_path  # Record the session for offline replay (see benchmark.py)
+        self.tracer = Tracer(self.browser, profile=profile)  # Per-phase spans, exported to traces/
         self.op_manager = OnePasswordManager("Facebook")
+        self.session_store = SessionStore()
+        self.event_store = None  # Opened on first save/load
+        self.enricher = None  # Created on first enrichment
+        self.near_duplicates = None  # Loaded on first use, shared by every city of this session
         self.auth_manager = None
         self.events_scraper = None
         self.events_found = []
+        self.sinks = []  # Stream consumers fed while a city is being scraped (see event_sinks.py)
         
         Logger.log_info("Facebook Events Scraper initialized")
     
@@ -33,9 +50,13 @@ class FacebookEventsScraper:
                 Logger.log_error("Browser setup failed")
                 return False
             
+            if self.record_path:
+                self.browser.start_recording(self.record_path)
+                Logger.log_info(f"Recording session to {self.record_path}")
+            
             # Initialize other managers with browser
-            self.auth_manager = AuthManager(self.browser, self.op_manager)
-            self.events_scraper = EventsScraper(self.browser)
+            self.auth_manager = AuthManager(self.browser, self.op_manager, self.session_store)
+            self.events_scraper = EventsScraper(self.browser, tracer=self.tracer)
             
             Logger.log_success("All components setup successfully")
             return True
@@ -53,10 +74,13 @@ class FacebookEventsScraper:
                 Logger.log_error("Auth manager not initialized")
                 return False
             
-            success = self.auth_manager.login()
+            # Login, 2FA and device approval pages stay out of session recordings
+            with self.browser.recording_redacted():
+                success = self.auth_manager.login()
             
             if success:
                 Logger.log_success("Authentication completed successfully")
+                self.attach_http_fetcher()
             else:
                 Logger.log_error("Authentication failed")
             
@@ -66,34 +90,74 @@ class FacebookEventsScraper:
             Logger.log_error(f"Authentication error: {e}")
             return False
     
-    def scrape_events(self, city_name="Timișoara"):
-        """Scrape events for the specified city"""
+    def add_sink(self, sink):
+        """Subscribe a stream consumer to events as they are scraped"""
+        self.sinks.append(sink)
+        return sink
+    
+    def iter_events(self, city_name="Timișoara"):
+        """Yield Event objects as soon as they are found, feeding every subscribed sink"""
+        self.events_found = []
+        error = None
+        self._notify_sinks("open", city_name)
+        
         try:
-            Logger.log_info(f"Starting event scraping for {city_name}...")
-            
-            if not self.events_scraper:
-                Logger.log_error("Events scraper not initialized")
-                return []
-            
-            # Search and extract events
-            events = self.events_scraper.search_and_extract_events(city_name)
-            
-            if events:
-                # Convert to Event objects if they're dictionaries
-                self.events_found = [
-                    EventConverter.dict_to_event(event) if isinstance(event, dict) else event
-                    for event in events
-                ]
-                Logger.log_success(f"Successfully scraped {len(self.events_found)} events")
-            else:
-                Logger.log_warning("No events found")
-                self.events_found = []
-            
-            return self.events_found
-            
+            for event in self.events_scraper.iter_events(city_name):
+                event = EventConverter.dict_to_event(event) if isinstance(event, dict) else event
+                self.events_found.append(event)
+                self._notify_sinks("write", event)
+                yield event
         except Exception as e:
-            Logger.log_error(f"Event scraping error: {e}")
+            error = e
+            raise
+        finally:
+            self._notify_sinks("close", city_name, self.events_found, error)
+    
+    def _notify_sinks(self, method, *args):
+        """Call a hook on every sink; a failing sink must not stop the scrape"""
+        for sink in self.sinks:
+            try:
+                getattr(sink, method)(*args)
+            except Exception as e:
+                Logger.log_warning(f"Event sink {type(sink).__name__}.{method} failed: {e}")
+    
+    def attach_http_fetcher(self):
+        """Let the events scraper fetch search pages over HTTP with the logged-in cookies"""
+        if not ConfigManager.HTTP_FETCH_MODE or not self.events_scraper:
+            return False
+        
+        client = HttpFetcher.from_browser(self.browser)
+        if not client:
+            Logger.log_warning("Could not export browser cookies, HTTP fetch mode disabled")
+            return False
+        
+        if self.events_scraper.http_fetcher:
+            self.events_scraper.http_fetcher.client.close()
+        self.events_scraper.http_fetcher = HttpEventFetcher(client)
+        Logger.log_info(f"🌐 HTTP fetch mode enabled with {len(client.cookies)} session cookies")
+        return True
+    
+    def scrape_events(self, city_name="Timișoara"):
+        """Scrape events for the specified city, keeping the events found before any failure"""
+        Logger.log_info(f"Starting event scraping for {city_name}...")
+        
+        if not self.events_scraper:
+            Logger.log_error("Events scraper not initialized")
             return []
+        
+        try:
+            for _ in self.iter_events(city_name):
+                pass
+        except Exception as e:
+            Logger.log_error(f"Event scraping error after {len(self.events_found)} events: {e}")
+        
+        if self.events_found:
+            self.events_scraper.sort_by_relevance(self.events_found)
+            Logger.log_success(f"Successfully scraped {len(self.events_found)} events")
+        else:
+            Logger.log_warning("No events found")
+        
+        return self.events_found
     
     def save_results(self, city_name="Timișoara", filename=None):
         """Save scraped events to file with consistent naming"""
@@ -104,6 +168,9 @@ class FacebookEventsScraper:
             
             Logger.log_info("Saving events to file...")
             
+            # History first: upserts only, the JSON below is an export for existing consumers
+            self._get_event_store().record_run(city_name, self.events_found)
+            
             # If no custom filename provided, use the standard format
             if not filename:
                 filename = FileManager.get_events_filename(city_name)
@@ -129,15 +196,19 @@ class FacebookEventsScraper:
             return None
     
     def load_previous_results(self, city_name="Timișoara"):
-        """Load previously saved events for comparison"""
+        """Find previously saved events for comparison; the events are streamed when the diff runs"""
         try:
             Logger.log_info(f"Checking for previous results for {city_name}...")
             
-            previous_data = FileManager.load_events_from_json(city_name)
-            
+            previous_data = self._get_event_store().load_latest_events(city_name, stream=True)
             if previous_data:
-                Logger.log_success(f"Found previous results with {previous_data.get('total_events', 0)} events")
+                Logger.log_success(f"Found previous results with {previous_data['total_events']} events")
                 return previous_data
+            
+            filename = FileManager.get_events_filename(city_name)
+            if FileManager._file_exists(filename):
+                Logger.log_success(f"Found previous results in {filename}")
+                return {'events': EventDiff.iter_events_from_json(filename)}
             else:
                 Logger.log_info("No previous results found")
                 return None
@@ -146,6 +217,34 @@ class FacebookEventsScraper:
             Logger.log_error(f"Load previous results error: {e}")
             return None
     
+    def enrich_events(self):
+        """Merge detail page data into the scraped events; a failure leaves them as scraped"""
+        try:
+            if not self.enricher:
+                self.enricher = EventEnricher(self.browser)
+            return self.enricher.enrich(self.events_found)
+        except Exception as e:
+            Logger.log_error(f"Enrichment error: {e}")
+            return 0
+    
+    def mark_near_duplicates(self, city_name="Timișoara"):
+        """Flag events that repeat one seen earlier in this or a previous run, in any city"""
+        try:
+            if not self.near_duplicates:
+                self.near_duplicates = NearDuplicateIndex(ConfigManager.NEAR_DUPLICATE_INDEX_PATH)
+            duplicates = self.near_duplicates.annotate(self.events_found, city_name)
+            self.near_duplicates.save()
+            return duplicates
+        except Exception as e:
+            Logger.log_error(f"Near-duplicate detection error: {e}")
+            return 0
+    
+    def _get_event_store(self):
+        """Open the event history database on first use"""
+        if not self.event_store:
+            self.event_store = EventStore()
+        return self.event_store
+    
     def display_results(self, city_name="Timișoara"):
         """Display scraped events"""
         try:
@@ -158,78 +257,133 @@ class FacebookEventsScraper:
         Logger.log_info("🚀 ENHANCED 2FA FACEBOOK EVENTS SCRAPER")
         Logger.log_info("=" * 60)
         
+        self.tracer.begin_run(city_name)
         try:
-            # Check previous results if requested
-            previous_data = None
-            if compare_with_previous:
-                previous_data = self.load_previous_results(city_name)
-            
             # Setup
-            if not self.setup():
+            with self.tracer.span("setup") as span:
+                span["ok"] = self.setup()
+            if not span["ok"]:
                 return []
             
             # Authenticate
-            if not self.authenticate():
+            if not self.traced_authenticate():
                 return []
             
-            # Scrape events
-            events = self.scrape_events(city_name)
-            
-            if events:
-                # Display results
-                if display_results:
-                    self.display_results(city_name)
-                
-                # Compare with previous if available
-                if compare_with_previous and previous_data:
-                    self._compare_with_previous(events, previous_data)
-                
-                # Save to file (will replace existing file)
-                if save_file:
-                    saved_file = self.save_results(city_name)
-                    if saved_file:
-                        Logger.log_info(f"📁 Results saved to: {saved_file}")
-                        Logger.log_info(f"🔄 File will be replaced on next run")
-                
-                Logger.log_success(f"✅ Scraping completed! Found {len(events)} events")
-                Logger.log_info("💡 Used enhanced 2FA flow: Device approval → Try another way → Authentication app → 1Password")
-            else:
-                Logger.log_warning("😕 No events found or scraping failed")
-                Logger.log_info("📸 Check the screenshots for debugging")
-            
-            return events
+            return self.process_city(city_name, save_file, display_results, compare_with_previous)
             
         except Exception as e:
             Logger.log_error(f"Scraping process error: {e}")
             return []
         
         finally:
-            self.cleanup()
+            with self.tracer.span("cleanup"):
+                self.cleanup()
+            self.finish_trace()
+    
+    def traced_authenticate(self):
+        """Authenticate inside an 'authenticate' span annotated with the login state timings"""
+        with self.tracer.span("authenticate") as span:
+            span["ok"] = self.authenticate()
+            if self.auth_manager:
+                span["states"] = [[state, round(seconds, 3)] for state, seconds in self.auth_manager.get_state_timings()]
+            span["network"] = self.browser.request_blocker.report("login")
+        return span["ok"]
     
-    def _compare_with_previous(self, current_events, previous_data):
-        """Compare current results with previous scraping session"""
+    def finish_trace(self):
+        """Export the Chrome trace for the current run and log its summary line"""
+        trace_file = self.tracer.export()
+        Logger.log_info(f"⏱️ {self.tracer.summary_line()}")
+        if trace_file:
+            Logger.log_info(f"Trace written to {trace_file}")
+        return trace_file
+    
+    def process_city(self, city_name="Timișoara", save_file=True, display_results=True, compare_with_previous=False):
+        """Scrape, display, compare and save one city on an already authenticated session"""
+        # Check previous results if requested
+        previous_data = None
+        if compare_with_previous:
+            with self.tracer.span("load_previous"):
+                previous_data = self.load_previous_results(city_name)
+        
+        # Scrape events
+        with self.tracer.span("scrape", city=city_name) as span:
+            events = self.scrape_events(city_name)
+            span["events"] = len(events)
+            span["network"] = self.browser.request_blocker.report(city_name)
+        
+        # Exact times, venue and organizer from the event pages
+        if events and ConfigManager.ENRICH_EVENTS:
+            with self.tracer.span("enrich", events=len(events)) as span:
+                span["enriched"] = self.enrich_events()
+        
+        # After enrichment, so venues and exact start times are part of the fingerprint
+        if events and ConfigManager.NEAR_DUPLICATE_DETECTION:
+            with self.tracer.span("near_duplicates", events=len(events)) as span:
+                span["duplicates"] = self.mark_near_duplicates(city_name)
+        
+        if events:
+            # Display results
+            if display_results:
+                with self.tracer.span("display"):
+                    self.display_results(city_name)
+            
+            # Compare with previous if available
+            if compare_with_previous and previous_data:
+                with self.tracer.span("compare"):
+                    self._compare_with_previous(events, previous_data, city_name)
+            
+            # Save to file (will replace existing file)
+            if save_file:
+                with self.tracer.span("save"):
+                    saved_file = self.save_results(city_name)
+                if saved_file:
+                    Logger.log_info(f"📁 Results saved to: {saved_file}")
+                    Logger.log_info(f"🔄 File will be replaced on next run")
+            
+            Logger.log_success(f"✅ Scraping completed! Found {len(events)} events")
+            Logger.log_info("💡 Used enhanced 2FA flow: Device approval → Try another way → Authentication app → 1Password")
+        else:
+            Logger.log_warning("😕 No events found or scraping failed")
+            Logger.log_info("📸 Check the screenshots for debugging")
+        
+        return events
+    
+    def _compare_with_previous(self, current_events, previous_data, city_name="Timișoara"):
+        """Diff current results against the previous session and write the delta artifact"""
         try:
             previous_events = previous_data.get('events', [])
-            previous_count = len(previous_events)
-            current_count = len(current_events)
+            
+            diff = EventDiff(current_events)
+            delta_file, counts, added_events = diff.write_delta(previous_events, city_name)
             
             Logger.log_info(f"📊 Comparison with previous results:")
-            Logger.log_info(f"   Previous: {previous_count} events")
-            Logger.log_info(f"   Current:  {current_count} events")
-            Logger.log_info(f"   Change:   {current_count - previous_count:+d} events")
+            Logger.log_info(f"   Previous: {diff.previous_count} events")
+            Logger.log_info(f"   Current:  {len(current_events)} events")
+            Logger.log_info(f"   Added:    {counts['added']}  Removed: {counts['removed']}  Changed: {counts['changed']}")
+            Logger.log_info(f"   Delta written to: {delta_file}")
             
-            if current_count > previous_count:
-                Logger.log_success(f"🆕 Found {current_count - previous_count} new events!")
-            elif current_count < previous_count:
-                Logger.log_warning(f"📉 {previous_count - current_count} fewer events than before")
-            else:
-                Logger.log_info("🔄 Same number of events as previous run")
+            if counts['added']:
+                Logger.log_success(f"🆕 Found {counts['added']} new events!")
+                for event in added_events:
+                    Logger.log_info(f"   🆕 {event.get('Title', 'N/A')} → {event.get('Link', 'N/A')}")
+            elif not counts['removed'] and not counts['changed']:
+                Logger.log_info("🔄 Same events as previous run")
+            
+            return counts
                 
         except Exception as e:
             Logger.log_error(f"Comparison error: {e}")
+            return None
     
     def cleanup(self):
         """Clean up resources"""
+        if self.events_scraper and self.events_scraper.http_fetcher:
+            self.events_scraper.http_fetcher.client.close()
+        
+        if self.event_store:
+            self.event_store.close()
+            self.event_store = None
+        
         try:
             if self.browser:
                 self.browser.quit()
@@ -246,12 +400,12 @@ class ScraperFactory:
     """Factory class for creating scraper instances"""
     
     @staticmethod
-    def create_scraper(selenium_ports=None):
+    def create_scraper(selenium_ports=None, profile=False):
         """Create a new scraper instance"""
         if selenium_ports is None:
             selenium_ports = [30479, 30444, 4444]
         
-        return FacebookEventsScraper(selenium_ports)
+        return FacebookEventsScraper(selenium_ports, profile=profile)
     
     @staticmethod
     def create_simple_scraper():
@@ -259,6 +413,100 @@ class ScraperFactory:
         return FacebookEventsScraper()
 
 
+class ScraperPool:
+    """Pool of authenticated scraper sessions that take cities from a shared work queue"""
+    
+    def __init__(self, selenium_ports=None, max_sessions=None):
+        if selenium_ports is None:
+            selenium_ports = [30479, 30444, 4444]
+        
+        # One session per Selenium endpoint; a standalone node only serves one session
+        self.selenium_ports = list(selenium_ports)
+        self.max_sessions = max_sessions or len(self.selenium_ports)
+        self.results = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+    
+    def run(self, cities, save_file=True, display_results=False, compare_with_previous=False, on_result=None):
+        """Scrape all cities in parallel and return {city: events}"""
+        work_queue = queue.Queue()
+        for city in cities:
+            work_queue.put(city)
+        
+        session_count = min(self.max_sessions, len(self.selenium_ports), len(cities))
+        if session_count < 1:
+            return {}
+        
+        Logger.log_info(f"🚦 Scraping {len(cities)} cities with {session_count} parallel sessions")
+        
+        workers = []
+        for port in self.selenium_ports[:session_count]:
+            worker = threading.Thread(
+                target=self._worker,
+                args=(port, work_queue, save_file, display_results, compare_with_previous, on_result),
+                name=f"scraper-{port}",
+                daemon=True
+            )
+            worker.start()
+            workers.append(worker)
+        
+        for worker in workers:
+            worker.join()
+        
+        # Cities left in the queue had no working session to run on
+        while not work_queue.empty():
+            self._report(work_queue.get_nowait(), None, "No authenticated session available", on_result)
+        
+        Logger.log_info(f"🏁 Parallel scrape finished: {len(self.results) - len(self.failures)} succeeded, {len(self.failures)} failed")
+        return self.results
+    
+    def _worker(self, port, work_queue, save_file, display_results, compare_with_previous, on_result):
+        """Set up and authenticate one session, then drain cities from the queue"""
+        scraper = ScraperFactory.create_scraper([port])
+        
+        try:
+            # Session start-up is traced once; each city then gets its own trace
+            scraper.tracer.begin_run(f"session_{port}")
+            with scraper.tracer.span("setup") as span:
+                span["ok"] = scraper.setup()
+            started = span["ok"] and scraper.traced_authenticate()
+            scraper.finish_trace()
+            if not started:
+                Logger.log_error(f"Session on port {port} could not start, leaving its cities to other sessions")
+                return
+            
+            while True:
+                try:
+                    city = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                
+                scraper.tracer.begin_run(city)
+                try:
+                    events = scraper.process_city(city, save_file, display_results, compare_with_previous)
+                    self._report(city, events, None, on_result)
+                except Exception as e:
+                    self._report(city, None, str(e), on_result)
+                finally:
+                    scraper.finish_trace()
+        finally:
+            scraper.cleanup()
+    
+    def _report(self, city, events, error, on_result):
+        """Record and announce a finished city"""
+        with self._lock:
+            if error:
+                self.failures[city] = error
+                self.results[city] = []
+                Logger.log_error(f"❌ Failed to scrape {city}: {error}")
+            else:
+                self.results[city] = events
+                Logger.log_success(f"✅ Completed {city}: {len(events)} events found")
+            
+            if on_result:
+                on_result(city, events or [], error)
+
+
 def main():
     """Main entry point"""
     try:
@@ -328,6 +576,12 @@ def scrape_multiple_cities(cities, selenium_ports=None):
     return all_results
 
 
+def scrape_multiple_cities_parallel(cities, selenium_ports=None, max_sessions=None, save_file=True):
+    """Scrape events for multiple cities using a pool of authenticated sessions"""
+    pool = ScraperPool(selenium_ports, max_sessions)
+    return pool.run(cities, save_file=save_file)
+
+
 if __name__ == "__main__":
     # Example usage:
     
@@ -341,6 +595,16 @@ if __name__ == "__main__":
     # for city, events in results.items():
     #     print(f"{city}: {len(events)} events found")
     
+    # Parallel multi-city scraping, one session per Selenium port (uncomment to use)
+    # results = scrape_multiple_cities_parallel(cities, selenium_ports=[30479, 30444])
+    
+    # Streaming: events reach the sinks while scrolling continues (uncomment to use)
+    # from event_sinks import DisplaySink, JsonLinesSink
+    # scraper = ScraperFactory.create_simple_scraper()
+    # scraper.add_sink(JsonLinesSink())
+    # scraper.add_sink(DisplaySink())
+    # events = scraper.run_full_scrape("Timișoara", display_results=False)
+    
     # Custom scraping (uncomment to use)
     # scraper = ScraperFactory.create_scraper([30479, 4444])  # Custom ports
     # events = scraper.run_full_scrape("Your City Name", save_file=True)
\ No newline at end of file
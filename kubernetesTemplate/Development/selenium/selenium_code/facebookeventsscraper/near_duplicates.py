@@ -0,0 +1,201 @@
+"""
+Near Duplicates Module
+MinHash fingerprints of title, date and venue in LSH buckets, persisted across runs and cities
+"""
+
+import base64
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from datetime import datetime
+
+from date_parser import event_timezone, normalize
+from utils import ConfigManager, Event, EventDeduplicator
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 4 rows per band: pairs above ~0.5 similarity usually share a bucket
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed: signatures are persisted, so every run must use the same hash functions
+_rng = random.Random(20240501)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+                for _ in range(MINHASH_PERMUTATIONS)]
+
+WORD_SEPARATOR = re.compile(r"[^a-z0-9]+")
+
+# Instances scraping in parallel threads share the history file
+_save_lock = threading.Lock()
+
+def shingles(event: Event, city_name: str = "") -> set:
+    """Character trigrams of title and venue plus the event day
+
+    Venue trigrams keep a touring show in two cities apart; a single date token lets
+    recurring instances of the same title and venue still score high.
+    """
+    title = " ".join(WORD_SEPARATOR.split(normalize(event.title or "")))
+    venue = event.venue or event.location or ""
+    if venue.startswith("Near "):
+        venue = city_name or venue[5:]
+    venue = " ".join(WORD_SEPARATOR.split(normalize(venue)))
+
+    result = {"t" + title[i:i + 3] for i in range(max(1, len(title) - 2))}
+    result.update("v" + venue[i:i + 3] for i in range(len(venue) - 2))
+    if event.start_timestamp:
+        result.add("d" + datetime.fromtimestamp(event.start_timestamp, event_timezone()).strftime("%Y-%m-%d"))
+    return result
+
+def minhash(tokens) -> array:
+    """MinHash signature: the minimum of each permuted hash over all tokens, as 32-bit values"""
+    hashes = [zlib.crc32(token.encode("utf-8")) for token in tokens] or [0]
+    return array('I', (min((a * h + b) % MERSENNE_PRIME for h in hashes) & 0xFFFFFFFF for a, b in PERMUTATIONS))
+
+def shingles_hash(tokens) -> int:
+    """Checksum of a shingle set, stored to notice when an indexed event's title, venue or day changed"""
+    return zlib.crc32("\n".join(sorted(tokens)).encode("utf-8"))
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity: the share of equal signature positions"""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+class NearDuplicateIndex:
+    """Signatures of every event seen, bucketed so a new event is compared with a few candidates only"""
+
+    def __init__(self, path=None, threshold=None, history_days=None):
+        self.path = path  # None keeps the index in memory only
+        self.threshold = threshold or ConfigManager.NEAR_DUPLICATE_THRESHOLD
+        self.history_days = history_days or ConfigManager.NEAR_DUPLICATE_HISTORY_DAYS
+        self.entries = {}  # event key -> {'city', 'title', 'link', 'cluster', 'seen_at', 'shingles', 'signature'}
+        self.buckets = {}  # (band, band values) -> [event keys]
+        self.comparisons = 0
+        self._dirty = set()  # Keys to merge into the file on save
+        self._load()
+
+    def match(self, key, signature):
+        """Key of the most similar indexed event above the threshold, or None"""
+        best_key, best_score = None, self.threshold
+        for candidate in self.candidates(signature):
+            if candidate == key:
+                continue
+            self.comparisons += 1
+            score = similarity(signature, self.entries[candidate]['signature'])
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def candidates(self, signature):
+        """Keys sharing at least one LSH bucket with the signature"""
+        found = set()
+        for bucket in self._bucket_keys(signature):
+            found.update(self.buckets.get(bucket, ()))
+        return found
+
+    def add(self, key, signature, city_name, title, link, cluster=None, shingles_checksum=None):
+        """Index an event, replacing its previous signature; cluster is the key of the first event of its group"""
+        if key in self.entries:
+            self._remove_from_buckets(key)
+        self.entries[key] = {'city': city_name, 'title': title, 'link': link, 'cluster': cluster or key,
+                             'seen_at': time.time(), 'shingles': shingles_checksum, 'signature': signature}
+        for bucket in self._bucket_keys(signature):
+            self.buckets.setdefault(bucket, []).append(key)
+        self._dirty.add(key)
+
+    def annotate(self, events, city_name):
+        """Set duplicate_of on events that repeat an earlier one (this run or history); returns how many"""
+        duplicates = 0
+        for event in events:
+            key = str(EventDeduplicator.event_key(event.to_dict()) or "")
+            if not key:
+                continue
+
+            tokens = shingles(event, city_name)
+            checksum = shingles_hash(tokens)
+            entry = self.entries.get(key)
+            if entry and entry.get('shingles') == checksum:
+                # Seen before unchanged: keep its cluster, refresh it so it is not pruned
+                entry['seen_at'] = time.time()
+                self._dirty.add(key)
+                cluster = entry['cluster']
+            else:
+                # New, or its title, venue or day changed (e.g. after enrichment): fingerprint it again
+                signature = minhash(tokens)
+                match = self.match(key, signature)
+                cluster = self.entries[match]['cluster'] if match else key
+                self.add(key, signature, city_name, event.title, event.link, cluster, checksum)
+
+            canonical = self.entries.get(cluster)
+            if cluster != key and canonical:
+                event.duplicate_of = canonical['link']
+                duplicates += 1
+
+        print(f"🧬 {duplicates} near-duplicate events in {city_name} "
+              f"({len(self.entries)} indexed, {self.comparisons} signature comparisons)")
+        return duplicates
+
+    def save(self):
+        """Merge this instance's changes into the file (other cities may have written it) and prune old entries"""
+        if not self.path:
+            return
+        with _save_lock:
+            stored = self._read()
+            for key in self._dirty:
+                if key in self.entries:
+                    stored[key] = self._encode(self.entries[key])
+            oldest = time.time() - self.history_days * 86400
+            stored = {key: entry for key, entry in stored.items() if entry['seen_at'] >= oldest}
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(stored, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self._dirty = set()
+            except Exception as e:
+                print(f"⚠️ Could not save near-duplicate index: {e}")
+
+    def _remove_from_buckets(self, key):
+        for bucket in self._bucket_keys(self.entries[key]['signature']):
+            keys = self.buckets.get(bucket)
+            if keys and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del self.buckets[bucket]
+
+    @staticmethod
+    def _bucket_keys(signature):
+        rows = len(signature) // LSH_BANDS
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(LSH_BANDS)]
+
+    @staticmethod
+    def _encode(entry):
+        """Signature as base64 of its 32-bit array, about half the size of a JSON list of numbers"""
+        return dict(entry, signature=base64.b64encode(entry['signature'].tobytes()).decode("ascii"))
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable near-duplicate index {self.path}: {e}")
+            return {}
+
+    def _load(self):
+        if not self.path:
+            return
+        for key, entry in self._read().items():
+            signature = array('I')
+            signature.frombytes(base64.b64decode(entry['signature']))
+            if len(signature) != MINHASH_PERMUTATIONS:
+                continue  # Written with different settings
+            entry['signature'] = signature
+            self.entries[key] = entry
+            for bucket in self._bucket_keys(signature):
+                self.buckets.setdefault(bucket, []).append(key)
@@ -0,0 +1,142 @@
+"""
+Network Capture Module
+Decodes events from the GraphQL responses Facebook uses to load search results
+"""
+
+import base64
+import json
+
+from utils import ConfigManager
+
+# Facebook prefixes some JSON responses with this to prevent JSON hijacking
+JSON_GUARD_PREFIX = "for (;;);"
+
+class GraphQLEventCapture:
+    """Collects structured event nodes from GraphQL responses seen in the performance log"""
+
+    def __init__(self, browser_manager, enabled=None):
+        self.browser = browser_manager
+        self.enabled = ConfigManager.NETWORK_EXTRACTION if enabled is None else enabled
+        self.events = {}  # event id -> decoded event, in first-seen order
+        self.responses = 0
+        self._new_ids = []  # Ids first seen since the last collect
+        self._pending = set()  # requestIds of GraphQL responses still loading
+        self._capturing = False
+        browser_manager.add_network_listener(self._on_network_event)
+
+    def start(self):
+        """Drop earlier network traffic and start capturing; call before navigating to the search page"""
+        if not self.enabled:
+            return False
+
+        self._capturing = False
+        self.browser.poll_network_events()
+        self.events = {}
+        self.responses = 0
+        self._new_ids = []
+        self._pending = set()
+
+        try:
+            # Larger buffers keep response bodies available until the log is polled after scrolling
+            self.browser.execute_cdp("Network.enable", {
+                "maxTotalBufferSize": ConfigManager.NETWORK_BUFFER_BYTES,
+                "maxResourceBufferSize": ConfigManager.NETWORK_RESOURCE_BUFFER_BYTES
+            })
+            self._capturing = True
+        except Exception as e:
+            print(f"⚠️ Network capture unavailable: {str(e)[:100]}")
+        return self._capturing
+
+    def collect(self):
+        """Read pending network events and return the events first captured since the previous collect"""
+        if self._capturing:
+            self.browser.poll_network_events()
+        new_ids, self._new_ids = self._new_ids, []
+        return [self.events[event_id] for event_id in new_ids]
+
+    def _on_network_event(self, method, params):
+        """Network listener fed by BrowserManager.poll_network_events"""
+        if not self._capturing:
+            return
+
+        request_id = params.get('requestId')
+        if method == 'Network.responseReceived':
+            if ConfigManager.GRAPHQL_URL_FRAGMENT in params.get('response', {}).get('url', ''):
+                self._pending.add(request_id)
+        elif method == 'Network.loadingFinished' and request_id in self._pending:
+            self._pending.discard(request_id)
+            self._read_response(request_id)
+
+    def _read_response(self, request_id):
+        """Fetch one response body over CDP and index the events it contains"""
+        try:
+            body = self.browser.execute_cdp("Network.getResponseBody", {"requestId": request_id}) or {}
+        except Exception:
+            return  # Evicted from Chrome's buffer or the page navigated away
+
+        text = body.get('body') or ''
+        if body.get('base64Encoded'):
+            text = base64.b64decode(text).decode('utf-8', 'replace')
+
+        self.responses += 1
+        for payload in self.iter_payloads(text):
+            for node in self.iter_event_nodes(payload):
+                event = self.decode_event(node)
+                if not event:
+                    continue
+                known = self.events.get(event['id'])
+                if known is None:
+                    self.events[event['id']] = event
+                    self._new_ids.append(event['id'])
+                else:
+                    # The same event appears in several payloads with different field subsets
+                    for key, value in event.items():
+                        if value and not known.get(key):
+                            known[key] = value
+
+    @staticmethod
+    def iter_payloads(text):
+        """GraphQL responses may hold several JSON documents, one per line (streamed results)"""
+        if text.startswith(JSON_GUARD_PREFIX):
+            text = text[len(JSON_GUARD_PREFIX):]
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    @staticmethod
+    def iter_event_nodes(payload):
+        """Walk a payload and yield every object typed as an Event"""
+        stack = [payload]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if node.get('__typename') == 'Event' and node.get('id') and node.get('name'):
+                    yield node
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+
+    @staticmethod
+    def decode_event(node):
+        """Structured fields of an Event node: id, title, url, start time, venue, city"""
+        event_id = str(node.get('id') or '')
+        if not event_id.isdigit():
+            return None
+
+        place = node.get('event_place') or node.get('place') or {}
+        city = place.get('city') or {}
+        return {
+            'id': event_id,
+            'title': (node.get('name') or '').strip(),
+            'url': node.get('url') or node.get('eventUrl') or f"https://www.facebook.com/events/{event_id}/",
+            'start_timestamp': node.get('start_timestamp') or node.get('startTimestamp'),
+            'date_text': node.get('day_time_sentence') or node.get('start_time_formatted') or node.get('date_time_sentence'),
+            'venue': place.get('contextual_name') or place.get('name'),
+            'city': city.get('contextual_name') or city.get('name'),
+            'is_online': bool(node.get('is_online'))
+        }
@@ -2,13 +2,27 @@
 1Password CLI Manager
 Handles all 1Password related operations
 """
+import base64
+import hashlib
+import hmac
+import struct
 import subprocess
 import json
+import time
+from urllib.parse import urlparse, parse_qs
+
+from utils import ConfigManager
 
 class OnePasswordManager:
-    def __init__(self, item_name="Facebook"):
+    def __init__(self, item_name="Facebook", cache_ttl=None):
         self.item_name = item_name
-    
+        self.cache_ttl = ConfigManager.OP_CACHE_TTL if cache_ttl is None else cache_ttl
+        # Cached item fields (plain str): clear_cache drops them, it cannot wipe copies already handed out
+        self._fields = {}  # id/label (lowercase) -> value
+        self._credentials = (None, None)
+        self._otp_secret = None
+        self._cache_expires_at = 0
+
     def check_cli_availability(self):
         """Check if 1Password CLI is available and authenticated"""
         try:
@@ -16,9 +30,14 @@ class OnePasswordManager:
             return True
         except (subprocess.CalledProcessError, FileNotFoundError):
             return False
-    
+
     def get_field(self, field_name):
         """Get a specific field from 1Password item"""
+        if self._load_item():
+            value = self._cached_value(field_name)
+            if value is not None:
+                return value
+
         try:
             result = subprocess.run(
                 ["op", "item", "get", self.item_name, "--field", field_name],
@@ -30,9 +49,15 @@ class OnePasswordManager:
         except subprocess.CalledProcessError as e:
             print(f"Error getting {field_name} from 1Password: {e}")
             return None
-    
+
     def get_otp(self):
-        """Get OTP from 1Password item"""
+        """Get OTP, computed locally from the cached secret when available"""
+        if self._load_item() and self._otp_secret:
+            try:
+                return self.generate_totp(self._otp_secret)
+            except Exception as e:
+                print(f"⚠️ Local TOTP generation failed, asking 1Password: {e}")
+
         try:
             result = subprocess.run(
                 ["op", "item", "get", self.item_name, "--otp"],
@@ -44,31 +69,86 @@ class OnePasswordManager:
         except subprocess.CalledProcessError as e:
             print(f"Error getting OTP from 1Password: {e}")
             return None
-    
+
     def get_credentials(self):
         """Get username and password from 1Password item"""
+        if not self._load_item():
+            return None, None
+
+        return self._credentials
+
+    def clear_cache(self):
+        """Drop all cached secrets so the next call asks 1Password again"""
+        self._fields = {}
+        self._credentials = (None, None)
+        self._otp_secret = None
+        self._cache_expires_at = 0
+
+    def _load_item(self):
+        """Fetch the whole item once as JSON and keep it until the cache expires"""
+        if self._fields and time.monotonic() < self._cache_expires_at:
+            return True
+
+        self.clear_cache()
+
         try:
-            # Get the full item as JSON
             result = subprocess.run(
                 ["op", "item", "get", self.item_name, "--format", "json"],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
             item_data = json.loads(result.stdout)
-            
-            username = None
-            password = None
-            
-            # Look through fields to find username and password
-            for field in item_data.get("fields", []):
-                if field.get("id") == "username" or field.get("label", "").lower() in ["username", "email"]:
-                    username = field.get("value")
-                elif field.get("id") == "password":
-                    password = field.get("value")
-            
-            return username, password
-        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-            print(f"Error getting credentials from 1Password: {e}")
-            return None, None
+        except (subprocess.CalledProcessError, json.JSONDecodeError, FileNotFoundError) as e:
+            print(f"Error getting item from 1Password: {e}")
+            return False
+
+        username = password = None
+        for field in item_data.get("fields", []):
+            value = field.get("value")
+
+            # Same rule as before caching: the last username/email field and the last password field win
+            if field.get("id") == "username" or field.get("label", "").lower() in ["username", "email"]:
+                username = value
+            elif field.get("id") == "password":
+                password = value
+
+            if not value:
+                continue
+            if field.get("type") == "OTP":
+                self._otp_secret = value
+                continue
+            for key in (field.get("id"), field.get("label")):
+                if key and key.lower() not in self._fields:
+                    self._fields[key.lower()] = value
+
+        self._credentials = (username, password)
+        self._cache_expires_at = time.monotonic() + self.cache_ttl
+        return True
+
+    def _cached_value(self, field_name):
+        """Read a cached field by id or label"""
+        return self._fields.get(field_name.lower())
+
+    @staticmethod
+    def generate_totp(secret, for_time=None):
+        """Generate an RFC 6238 TOTP code from a base32 secret or otpauth:// URI"""
+        digits = 6
+        period = 30
+        algorithm = "sha1"
+
+        if secret.startswith("otpauth://"):
+            params = parse_qs(urlparse(secret).query)
+            secret = params["secret"][0]
+            digits = int(params.get("digits", [digits])[0])
+            period = int(params.get("period", [period])[0])
+            algorithm = params.get("algorithm", [algorithm])[0].lower()
+
+        secret = secret.replace(" ", "").upper()
+        key = base64.b32decode(secret + "=" * (-len(secret) % 8))
+
+        counter = int((time.time() if for_time is None else for_time) // period)
+        digest = hmac.new(key, struct.pack(">Q", counter), getattr(hashlib, algorithm)).digest()
+        offset = digest[-1] & 0x0F
+        code = struct.unpack(">I", digest[offset:offset + 4])[0] & 0x7FFFFFFF
+        return str(code % (10 ** digits)).zfill(digits)
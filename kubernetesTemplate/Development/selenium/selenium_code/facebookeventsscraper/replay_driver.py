@@ -0,0 +1,350 @@
+"""
+Replay Driver Module
+Records command responses of a real WebDriver session and replays them offline
+"""
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    from selenium.common.exceptions import NoSuchElementException
+except ImportError:  # Replay works without selenium installed
+    class NoSuchElementException(Exception):
+        pass
+
+# Injected latency must not be counted as scraper sleep time by benchmarks
+_real_sleep = time.sleep
+
+RECORDING_VERSION = 1
+
+# Element attributes that hold typed input (email, password, 2FA code) or page text,
+# replaced while recording a sensitive phase
+REDACTED_ATTRIBUTES = ('value', 'textContent')
+
+# 1x1 transparent PNG returned for replayed screenshots
+REPLAY_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000b4944415478da636000020000050001e9fadcd80000000049454e44ae426082"
+)
+
+# Serializes WebElements in one call while recording
+SERIALIZE_ELEMENTS_SCRIPT = """
+var elements = arguments[0], result = [];
+for (var i = 0; i < elements.length; i++) {
+    var el = elements[i], rect = el.getBoundingClientRect();
+    result.push({
+        tag_name: el.tagName.toLowerCase(),
+        text: el.innerText || '',
+        displayed: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length),
+        enabled: !el.disabled,
+        selected: !!(el.checked || el.selected),
+        location: {x: Math.round(rect.left), y: Math.round(rect.top)},
+        attributes: {
+            href: el.href || el.getAttribute('href'),
+            'aria-label': el.getAttribute('aria-label'),
+            'aria-checked': el.getAttribute('aria-checked'),
+            'class': el.getAttribute('class') || '',
+            id: el.getAttribute('id'),
+            type: el.getAttribute('type'),
+            value: el.value === undefined ? el.getAttribute('value') : el.value,
+            textContent: el.textContent
+        }
+    });
+}
+return result;
+"""
+
+def response_key(command, payload=""):
+    """Stable key for a command and its script/locator"""
+    digest = hashlib.sha1(str(payload).encode("utf-8")).hexdigest()[:12]
+    return f"{command}:{digest}"
+
+
+class RecordingDriver:
+    """Wraps a real driver and records the responses the scraper sees
+
+    Recordings are plaintext JSON of what a logged-in session saw. Inside redacted()
+    (the login and 2FA flow) no page snapshots are kept and typed values are blanked.
+    """
+
+    def __init__(self, driver, path):
+        self._driver = driver
+        self._path = path
+        self._recording = {"version": RECORDING_VERSION, "responses": {}, "snapshots": []}
+        self.sensitive = False
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    @property
+    def unrecorded(self):
+        """The wrapped driver, for calls whose results must never be written to the recording"""
+        return self._driver
+
+    @contextmanager
+    def redacted(self):
+        """Record a sensitive phase: responses needed for replay only, without page HTML or typed values"""
+        previous, self.sensitive = self.sensitive, True
+        try:
+            yield self
+        finally:
+            self.sensitive = previous
+
+    def _record(self, key, value):
+        self._recording["responses"].setdefault(key, []).append(value)
+
+    def _snapshot(self):
+        if not self.sensitive:
+            self._recording["snapshots"].append({"url": self._driver.current_url, "html": self._driver.page_source})
+
+    def _serialize(self, elements):
+        """Capture element state with one extra script call"""
+        if not elements:
+            return []
+        try:
+            serialized = self._driver.execute_script(SERIALIZE_ELEMENTS_SCRIPT, elements) or []
+        except Exception:
+            return []
+        if self.sensitive:
+            for element in serialized:
+                for name in REDACTED_ATTRIBUTES:
+                    if element["attributes"].get(name):
+                        element["attributes"][name] = "[redacted]"
+        return serialized
+
+    def get(self, url):
+        self._driver.get(url)
+        self._record(response_key("get", url), self._driver.current_url)
+        self._snapshot()
+
+    def find_elements(self, by, value=None):
+        elements = self._driver.find_elements(by, value)
+        self._record(response_key("find_elements", (by, value)), self._serialize(elements))
+        return elements
+
+    def find_element(self, by, value=None):
+        try:
+            element = self._driver.find_element(by, value)
+        except Exception:
+            self._record(response_key("find_element", (by, value)), None)
+            raise
+        self._record(response_key("find_element", (by, value)), (self._serialize([element]) or [None])[0])
+        return element
+
+    def execute_script(self, script, *args):
+        result = self._driver.execute_script(script, *args)
+        if not args:
+            # Scripts that take elements act on live nodes and are not replayable
+            self._record(response_key("execute_script", script), self._jsonable(result))
+        return result
+
+    def execute_async_script(self, script, *args):
+        result = self._driver.execute_async_script(script, *args)
+        self._record(response_key("execute_async_script", script), self._jsonable(result))
+        return result
+
+    def save_screenshot(self, filename):
+        self._snapshot()
+        return self._driver.save_screenshot(filename)
+
+    def get_screenshot_as_png(self):
+        self._snapshot()
+        return self._driver.get_screenshot_as_png()
+
+    def save(self):
+        """Write the recording to disk, readable by the owner only"""
+        fd = os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._recording, f, ensure_ascii=False)
+        print(f"🎞️ Saved recording with {sum(len(v) for v in self._recording['responses'].values())} responses to {self._path}")
+
+    @staticmethod
+    def _jsonable(value):
+        """Drop values (such as live elements) that cannot be replayed"""
+        try:
+            json.dumps(value)
+            return value
+        except (TypeError, ValueError):
+            return None
+
+
+class ReplayElement:
+    """WebElement stand-in backed by a recorded element snapshot"""
+
+    def __init__(self, driver, data):
+        self._driver = driver
+        self._data = data or {}
+
+    @property
+    def text(self):
+        self._driver.execute("getElementText")
+        return self._data.get("text", "")
+
+    @property
+    def tag_name(self):
+        self._driver.execute("getElementTagName")
+        return self._data.get("tag_name", "div")
+
+    @property
+    def location(self):
+        self._driver.execute("getElementRect")
+        return self._data.get("location", {"x": 0, "y": 0})
+
+    def get_attribute(self, name):
+        self._driver.execute("getElementAttribute")
+        return self._data.get("attributes", {}).get(name)
+
+    def is_displayed(self):
+        self._driver.execute("isElementDisplayed")
+        return self._data.get("displayed", True)
+
+    def is_enabled(self):
+        self._driver.execute("isElementEnabled")
+        return self._data.get("enabled", True)
+
+    def is_selected(self):
+        self._driver.execute("isElementSelected")
+        return self._data.get("selected", False)
+
+    def click(self):
+        self._driver.execute("clickElement")
+
+    def clear(self):
+        self._driver.execute("clearElement")
+
+    def send_keys(self, *value):
+        self._driver.execute("sendKeysToElement")
+
+    def find_element(self, by, value=None):
+        return self._driver.find_element(by, value)
+
+    def find_elements(self, by, value=None):
+        return self._driver.find_elements(by, value)
+
+
+class ReplayDriver:
+    """Fake WebDriver that replays recorded responses with optional injected latency"""
+
+    def __init__(self, recording, latency=0.0):
+        if isinstance(recording, str):
+            with open(recording, "r", encoding="utf-8") as f:
+                recording = json.load(f)
+        self.responses = recording.get("responses", {})
+        self.snapshots = recording.get("snapshots", [])
+        self.latency = latency
+        self.command_count = 0
+        self.current_url = "about:blank"
+        self.screenshots = []
+        self._positions = {}
+
+    def execute(self, driver_command, params=None):
+        """Single choke point for every command, like the real driver"""
+        self.command_count += 1
+        if self.latency:
+            _real_sleep(self.latency)
+        return {"value": None}
+
+    def _next(self, key, default=None):
+        """Recorded responses are returned in order; the last one repeats"""
+        values = self.responses.get(key)
+        if not values:
+            return default
+        position = self._positions.get(key, 0)
+        self._positions[key] = position + 1
+        return values[min(position, len(values) - 1)]
+
+    def get(self, url):
+        self.execute("get")
+        self.current_url = self._next(response_key("get", url), url)
+
+    @property
+    def page_source(self):
+        self.execute("getPageSource")
+        for snapshot in reversed(self.snapshots):
+            if snapshot.get("url") == self.current_url:
+                return snapshot.get("html", "")
+        return "<html><body></body></html>"
+
+    def find_elements(self, by, value=None):
+        self.execute("findElements")
+        data = self._next(response_key("find_elements", (by, value)), [])
+        return [ReplayElement(self, item) for item in data]
+
+    def find_element(self, by, value=None):
+        self.execute("findElement")
+        data = self._next(response_key("find_element", (by, value)))
+        if data is None:
+            raise NoSuchElementException(f"No recorded element for {by}={value}")
+        return ReplayElement(self, data)
+
+    def execute_script(self, script, *args):
+        self.execute("executeScript")
+        return self._next(response_key("execute_script", script))
+
+    def execute_async_script(self, script, *args):
+        self.execute("executeAsyncScript")
+        return self._next(response_key("execute_async_script", script))
+
+    def set_script_timeout(self, seconds):
+        self.execute("setTimeouts")
+
+    def get_cookies(self):
+        self.execute("getAllCookies")
+        return []
+
+    def add_cookie(self, cookie):
+        self.execute("addCookie")
+
+    def delete_all_cookies(self):
+        self.execute("deleteAllCookies")
+
+    def save_screenshot(self, filename):
+        self.execute("screenshot")
+        self.screenshots.append(filename)
+        return True
+
+    def get_screenshot_as_png(self):
+        self.execute("screenshot")
+        self.screenshots.append(self.current_url)
+        return REPLAY_PNG
+
+    def quit(self):
+        self.execute("quit")
+
+
+class RecordingBuilder:
+    """Builds recordings by hand, e.g. synthetic fixtures for benchmarks"""
+
+    def __init__(self):
+        self.recording = {"version": RECORDING_VERSION, "responses": {}, "snapshots": []}
+
+    def add(self, command, payload, *values):
+        """Append responses for a command key"""
+        self.recording["responses"].setdefault(response_key(command, payload), []).extend(values)
+        return self
+
+    def add_snapshot(self, url, html):
+        self.recording["snapshots"].append({"url": url, "html": html})
+        return self
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.recording, f, ensure_ascii=False)
+        return path
+
+    @staticmethod
+    def element(text="", tag_name="div", displayed=True, enabled=True, **attributes):
+        """Recorded element snapshot"""
+        return {
+            "tag_name": tag_name,
+            "text": text,
+            "displayed": displayed,
+            "enabled": enabled,
+            "selected": False,
+            "location": {"x": 0, "y": 0},
+            "attributes": attributes
+        }
+
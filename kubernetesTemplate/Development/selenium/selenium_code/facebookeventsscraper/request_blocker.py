@@ -0,0 +1,91 @@
+"""
+Request Blocker Module
+Drops images, media, fonts and tracking requests through the Chrome DevTools Protocol
+"""
+
+from utils import ConfigManager
+
+class RequestBlocker:
+    """Blocks heavy resources via Network.setBlockedURLs and tallies what each page loaded and skipped"""
+
+    def __init__(self, browser_manager, patterns=None, enabled=None):
+        self.browser = browser_manager
+        self.patterns = list(ConfigManager.BLOCKED_URL_PATTERNS if patterns is None else patterns)
+        self.enabled = ConfigManager.BLOCK_RESOURCES if enabled is None else enabled
+        self.active = False
+        self._reset()
+        browser_manager.add_network_listener(self._on_network_event)
+
+    def enable(self):
+        """Install the blocked URL patterns on the current tab; returns True if blocking is active"""
+        if not self.enabled or not self.patterns:
+            return False
+
+        try:
+            # Network.setBlockedURLs only applies while the Network domain is enabled
+            self.browser.execute_cdp("Network.enable")
+            self.browser.execute_cdp("Network.setBlockedURLs", {"urls": self.patterns})
+            self.active = True
+            print(f"🚫 Blocking {len(self.patterns)} resource patterns via CDP")
+        except Exception as e:
+            self.active = False
+            print(f"⚠️ Request blocking unavailable: {str(e)[:100]}")
+        return self.active
+
+    def disable(self):
+        """Remove the blocked URL patterns"""
+        try:
+            self.browser.execute_cdp("Network.setBlockedURLs", {"urls": []})
+        except Exception:
+            pass
+        self.active = False
+
+    def report(self, page):
+        """Summarize requests loaded and blocked since the previous report, then start a new tally
+
+        Blocked requests are never downloaded, so their size is unknown: estimated_bytes_saved is the
+        blocked count per type times BLOCKED_BYTES_ESTIMATE. loaded_bytes is measured (encodedDataLength).
+        """
+        self.browser.poll_network_events()
+
+        blocked_requests = sum(self.blocked.values())
+        estimated_bytes = sum(
+            count * ConfigManager.BLOCKED_BYTES_ESTIMATE.get(resource_type, ConfigManager.BLOCKED_BYTES_ESTIMATE['Other'])
+            for resource_type, count in self.blocked.items()
+        )
+        report = {
+            'page': page,
+            'loaded_requests': self.loaded_requests,
+            'loaded_bytes': self.loaded_bytes,
+            'blocked_requests': blocked_requests,
+            'blocked_by_type': dict(self.blocked),
+            'estimated_bytes_saved': estimated_bytes
+        }
+
+        if self.loaded_requests or blocked_requests:
+            by_type = ", ".join(f"{t} {c}" for t, c in sorted(self.blocked.items(), key=lambda item: -item[1]))
+            print(f"🚫 {page}: {blocked_requests} requests blocked ({by_type or 'none'}), "
+                  f"estimated ≈{estimated_bytes / 1024:.0f} KiB saved; "
+                  f"{self.loaded_requests} loaded, {self.loaded_bytes / 1024:.0f} KiB transferred")
+
+        self._reset()
+        return report
+
+    def _reset(self):
+        self._types = {}  # requestId -> resource type
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+        self.blocked = {}  # resource type -> blocked request count
+
+    def _on_network_event(self, method, params):
+        """Network listener fed by BrowserManager.poll_network_events"""
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            self._types[request_id] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            self.loaded_requests += 1
+            self.loaded_bytes += int(params.get('encodedDataLength') or 0)
+        elif method == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+            # 'inspector' is the reason Chrome reports for Network.setBlockedURLs matches
+            resource_type = params.get('type') or self._types.get(request_id, 'Other')
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
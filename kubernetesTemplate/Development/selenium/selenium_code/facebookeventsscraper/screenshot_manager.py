@@ -0,0 +1,134 @@
+"""
+Screenshot Manager Module
+Policy-driven debug screenshots, compressed and written by a background worker
+"""
+
+import io
+import os
+import queue
+import random
+import threading
+from datetime import datetime
+
+from utils import ConfigManager
+
+POLICIES = ('off', 'failure', 'sampled', 'always')
+
+class ScreenshotManager:
+    """Decides which screenshots to take and stores them off the scraping thread"""
+
+    def __init__(self, policy=None, sample_rate=None, directory=None, max_bytes=None):
+        policy = policy or os.environ.get(ConfigManager.SCREENSHOT_POLICY_ENV) or ConfigManager.SCREENSHOT_POLICY
+        if policy not in POLICIES:
+            print(f"⚠️ Unknown screenshot policy '{policy}', using '{ConfigManager.SCREENSHOT_POLICY}'")
+            policy = ConfigManager.SCREENSHOT_POLICY
+
+        self.policy = policy
+        self.sample_rate = ConfigManager.SCREENSHOT_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.directory = directory or ConfigManager.SCREENSHOT_DIR
+        self.max_bytes = max_bytes or ConfigManager.SCREENSHOT_MAX_DIR_BYTES
+        self.captured = 0
+        self.skipped = 0
+        self._queue = queue.Queue(maxsize=ConfigManager.SCREENSHOT_QUEUE_SIZE)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def should_capture(self, failure=False):
+        """Apply the policy: failures are kept unless off, debug shots depend on the policy"""
+        if self.policy == 'off':
+            return False
+        if failure or self.policy == 'always':
+            return True
+        if self.policy == 'sampled':
+            return random.random() < self.sample_rate
+        return False
+
+    def capture(self, driver, filename, failure=False):
+        """Grab the PNG on the calling thread and queue it for writing; returns the target path or None"""
+        if not self.should_capture(failure):
+            self.skipped += 1
+            return None
+
+        # WebDriver is not thread-safe, so the capture itself stays on the caller
+        png = driver.get_screenshot_as_png()
+        if not png:
+            return None
+
+        path = self._target_path(filename)
+        try:
+            self._queue.put_nowait((path, png))
+        except queue.Full:
+            print(f"⚠️ Screenshot queue full, dropping {filename}")
+            return None
+
+        self._ensure_worker()
+        self.captured += 1
+        print(f"📸 Screenshot queued: {path}")
+        return path
+
+    def flush(self, timeout=None):
+        """Wait (up to timeout seconds) until queued screenshots are written"""
+        if not self._worker:
+            return
+        waiter = threading.Thread(target=self._queue.join, daemon=True)
+        waiter.start()
+        waiter.join(timeout)
+        if waiter.is_alive():
+            print(f"⚠️ {self._queue.unfinished_tasks} screenshots still pending after {timeout}s")
+
+    def _target_path(self, filename):
+        """Timestamped name inside the screenshot directory, extension chosen by the writer"""
+        base, _ = os.path.splitext(os.path.basename(filename))
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return os.path.join(self.directory, f"{timestamp}_{base}")
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        """Background loop: compress, write, then evict the oldest files over the size cap"""
+        while True:
+            path, png = self._queue.get()
+            try:
+                data, extension = self._compress(png)
+                os.makedirs(self.directory, exist_ok=True)
+                with open(path + extension, "wb") as f:
+                    f.write(data)
+                self._evict()
+            except Exception as e:
+                print(f"⚠️ Failed to write screenshot {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _compress(png):
+        """Re-encode as JPEG when Pillow is available, otherwise keep the PNG"""
+        try:
+            from PIL import Image
+        except ImportError:
+            return png, ".png"
+
+        image = Image.open(io.BytesIO(png)).convert("RGB")
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=ConfigManager.SCREENSHOT_JPEG_QUALITY, optimize=True)
+        return output.getvalue(), ".jpg"
+
+    def _evict(self):
+        """Delete oldest screenshots until the directory fits in max_bytes"""
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -0,0 +1,71 @@
+"""
+Search URL Module
+Builds events search URLs with date, category and online filters encoded in the query string
+"""
+
+import base64
+import json
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+SEARCH_BASE_URL = "https://www.facebook.com/events/search/"
+
+# Filter keys as used in the base64 "filters" parameter of Facebook's search page:
+# {"rp_events_date:0": "{\"name\":\"filter_events_date\",\"args\":\"2024-10-14~2024-10-20\"}"}
+DATE_FILTER = ("rp_events_date", "filter_events_date")
+CATEGORY_FILTER = ("rp_events_category", "filter_events_category")
+ONLINE_FILTER = ("rp_events_online", "filter_events_online")
+
+class SearchUrlBuilder:
+    """Fluent builder for filtered events search URLs"""
+
+    def __init__(self, query):
+        self.query = query
+        self.filters = {}
+        self.start_date = None
+        self.end_date = None
+
+    def date_range(self, start, end):
+        """Only events between two dates (inclusive)"""
+        self.start_date, self.end_date = start, end
+        return self._add(DATE_FILTER, f"{start:%Y-%m-%d}~{end:%Y-%m-%d}")
+
+    def this_week(self, today=None):
+        """Today through Sunday, the range of the 'This week' option"""
+        today = today or date.today()
+        return self.date_range(today, today + timedelta(days=6 - today.weekday()))
+
+    def category(self, category_id):
+        """Only events in a Facebook event category (numeric id)"""
+        return self._add(CATEGORY_FILTER, str(category_id))
+
+    def online_only(self):
+        """Only online events"""
+        return self._add(ONLINE_FILTER, "")
+
+    def build(self, base_url=SEARCH_BASE_URL):
+        """Search URL with the query and any filters (base_url selects e.g. a lightweight host)"""
+        params = {"q": self.query}
+        if self.filters:
+            params["filters"] = self.encode_filters(self.filters)
+        return f"{base_url}?{urlencode(params)}"
+
+    def verification_labels(self):
+        """Lowercase texts one of which a checked filter option shows once the date filter is applied"""
+        if not self.start_date:
+            return []
+        return ["this week", f"{self.start_date:%b} {self.start_date.day}".lower()]
+
+    @staticmethod
+    def encode_filters(filters):
+        """Base64 of a JSON object whose values are themselves JSON strings"""
+        payload = {
+            f"{key}:0": json.dumps({"name": name, "args": args}, separators=(",", ":"))
+            for key, (name, args) in filters.items()
+        }
+        return base64.b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+    def _add(self, filter_spec, args):
+        key, name = filter_spec
+        self.filters[key] = (name, args)
+        return self
@@ -0,0 +1,141 @@
+"""
+Session Store Module
+Persists authenticated browser sessions (cookies + local storage) encrypted at rest
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from utils import ConfigManager
+
+class SessionStore:
+    def __init__(self, directory=None, max_age_days=None):
+        self.directory = directory or ConfigManager.SESSION_STORE_DIR
+        self.max_age_seconds = (max_age_days or ConfigManager.SESSION_MAX_AGE_DAYS) * 86400
+        self._fernet = None
+
+    def is_available(self):
+        """Sessions are only persisted when they can be encrypted"""
+        return self._get_fernet() is not None
+
+    def save(self, account, session_data):
+        """Encrypt and save session data for an account"""
+        fernet = self._get_fernet()
+        if not fernet:
+            print("⚠️ Session not saved: encryption unavailable (pip install cryptography)")
+            return False
+
+        try:
+            payload = json.dumps({
+                "account": account,
+                "saved_at": time.time(),
+                "cookies": session_data.get("cookies", []),
+                "local_storage": session_data.get("local_storage", {})
+            }).encode("utf-8")
+
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            path = self._session_path(account)
+            # mkstemp creates owner-only files; unique name keeps pooled sessions from clashing
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(fernet.encrypt(payload))
+            os.replace(tmp_path, path)
+
+            print(f"💾 Saved session for '{account}' ({len(session_data.get('cookies', []))} cookies)")
+            return True
+        except Exception as e:
+            print(f"❌ Could not save session: {e}")
+            return False
+
+    def load(self, account):
+        """Load and decrypt session data for an account, or None if missing/expired"""
+        fernet = self._get_fernet()
+        path = self._session_path(account)
+        if not fernet or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(fernet.decrypt(f.read()).decode("utf-8"))
+        except Exception as e:
+            print(f"⚠️ Stored session unreadable, discarding: {str(e)[:80]}")
+            self.delete(account)
+            return None
+
+        age = time.time() - data.get("saved_at", 0)
+        if age > self.max_age_seconds:
+            print(f"⌛ Stored session for '{account}' expired ({age / 86400:.1f} days old)")
+            self.delete(account)
+            return None
+
+        return data
+
+    def delete(self, account):
+        """Remove stored session for an account"""
+        try:
+            os.remove(self._session_path(account))
+        except FileNotFoundError:
+            pass
+
+    def _session_path(self, account):
+        """File path for an account, without exposing the account name on disk"""
+        digest = hashlib.sha256(account.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, f"session_{digest}.bin")
+
+    def _get_fernet(self):
+        """Create the Fernet cipher from the env key or a private key file"""
+        if self._fernet:
+            return self._fernet
+
+        try:
+            from cryptography.fernet import Fernet
+        except ImportError:
+            return None
+
+        key = os.environ.get(ConfigManager.SESSION_KEY_ENV)
+        if not key:
+            key = self._load_or_create_key_file(Fernet)
+        if not key:
+            return None
+
+        try:
+            self._fernet = Fernet(key.encode("utf-8") if isinstance(key, str) else key)
+        except Exception as e:
+            print(f"❌ Invalid session encryption key: {e}")
+            return None
+        return self._fernet
+
+    def _load_or_create_key_file(self, fernet_class):
+        """Read the key file, creating it with owner-only permissions on first use
+
+        A key stored beside the ciphertext only obfuscates the sessions: anyone who can read the
+        directory can decrypt them. Set the key in the environment for real protection at rest.
+        """
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            key_path = os.path.join(self.directory, "session.key")
+            for _ in range(20):
+                try:
+                    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                except FileExistsError:
+                    with open(key_path, "rb") as f:
+                        key = f.read().strip()
+                    if key:
+                        return key
+                    # Another pool worker created the file and has not written the key yet
+                    time.sleep(0.05)
+                    continue
+
+                key = fernet_class.generate_key()
+                with os.fdopen(fd, "wb") as f:
+                    f.write(key)
+                return key
+
+            print(f"❌ Session key file {key_path} stayed empty")
+            return None
+        except Exception as e:
+            print(f"❌ Could not prepare session key: {e}")
+            return None
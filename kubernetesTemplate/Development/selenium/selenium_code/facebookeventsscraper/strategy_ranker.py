@@ -0,0 +1,119 @@
+"""
+Strategy Ranker Module
+Persisted success rates and latencies of selectors/strategies, so historical winners are tried first
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from utils import ConfigManager
+
+class StrategyRanker:
+    """Orders fallback strategies by past success and runs them winners-first with short timeouts"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = path  # None keeps statistics in memory only
+        self.stats = {}  # group -> key -> {success, failure, avg_seconds, last_success}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def shared(cls):
+        """Process-wide ranker backed by ConfigManager.STRATEGY_CACHE_PATH (shared by pooled sessions)"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(ConfigManager.STRATEGY_CACHE_PATH)
+            return cls._shared
+
+    def run(self, group, candidates, attempt, default_timeout):
+        """Try (key, payload) candidates until attempt(payload, timeout) succeeds; returns its result or None
+
+        Historical winners go first with a timeout derived from their usual latency. On a miss the
+        remaining candidates are tried in their original order, then the winners again with the
+        default timeout, so a slow page cannot hide the usual winner.
+        """
+        winners = self.winners(group, [key for key, _ in candidates])
+        payloads = dict(candidates)
+        plan = [(key, self.fast_timeout(group, key, default_timeout)) for key in winners]
+        plan += [(key, default_timeout) for key, _ in candidates if key not in winners]
+        plan += [(key, default_timeout) for key in winners if self.fast_timeout(group, key, default_timeout) < default_timeout]
+
+        try:
+            for key, timeout in plan:
+                start = time.perf_counter()
+                try:
+                    result = attempt(payloads[key], timeout)
+                except Exception:
+                    result = None
+                self.record(group, key, bool(result), time.perf_counter() - start)
+                if result:
+                    if winners and key != winners[0]:
+                        print(f"📈 New best strategy for {group}: {str(key)[:60]}")
+                    return result
+            return None
+        finally:
+            self.save()
+
+    def winners(self, group, keys):
+        """Keys that have succeeded before, best first (success rate, then latency)"""
+        group_stats = self.stats.get(group, {})
+        known = [key for key in keys if group_stats.get(key, {}).get('success')]
+        return sorted(known, key=lambda key: (-self.success_rate(group, key), group_stats[key]['avg_seconds']))
+
+    def success_rate(self, group, key):
+        entry = self.stats.get(group, {}).get(key)
+        if not entry:
+            return 0.0
+        return entry['success'] / max(1, entry['success'] + entry['failure'])
+
+    def fast_timeout(self, group, key, default_timeout):
+        """A few times the usual latency of a winner, within [STRATEGY_MIN_TIMEOUT, default]"""
+        entry = self.stats.get(group, {}).get(key)
+        if not entry or not entry['success']:
+            return default_timeout
+        timeout = entry['avg_seconds'] * ConfigManager.STRATEGY_TIMEOUT_FACTOR
+        return min(default_timeout, max(ConfigManager.STRATEGY_MIN_TIMEOUT, timeout))
+
+    def record(self, group, key, success, seconds):
+        """Update counts; latency is a moving average over successful attempts only"""
+        with self._lock:
+            entry = self.stats.setdefault(group, {}).setdefault(
+                key, {'success': 0, 'failure': 0, 'avg_seconds': 0.0, 'last_success': None})
+            if success:
+                entry['success'] += 1
+                weight = 1.0 / min(entry['success'], ConfigManager.STRATEGY_LATENCY_WINDOW)
+                entry['avg_seconds'] += (seconds - entry['avg_seconds']) * weight
+                entry['last_success'] = datetime.now().isoformat()
+            else:
+                entry['failure'] += 1
+
+    def save(self):
+        """Atomically write the statistics file"""
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.stats, f, indent=1, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"⚠️ Could not save strategy ranking: {e}")
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.stats = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable strategy ranking {self.path}: {e}")
+            self.stats = {}
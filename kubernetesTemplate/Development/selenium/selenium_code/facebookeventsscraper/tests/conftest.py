@@ -0,0 +1,18 @@
+"""
+Test configuration
+Modules import each other flat (from utils import ...), so the package directory goes on sys.path
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """Run every test in a temporary directory: screenshots, traces and caches are written to the cwd"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
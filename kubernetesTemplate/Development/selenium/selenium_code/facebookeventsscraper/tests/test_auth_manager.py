@@ -0,0 +1,58 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from auth_manager import PAGE_STATE_SCRIPT
+
+# Minimal DOM for the classifier: selectors present on the page, body text and button labels
+NODE_HARNESS = """
+var page = JSON.parse(process.argv[1]);
+var document = {
+    readyState: 'complete',
+    body: {innerText: page.text},
+    querySelector: function (selectors) {
+        return selectors.split(',').some(function (s) { return page.selectors.indexOf(s.trim()) !== -1; }) || null;
+    },
+    querySelectorAll: function () {
+        return page.buttons.map(function (label) { return {innerText: label}; });
+    }
+};
+var window = {location: {href: page.url}};
+console.log(JSON.stringify((function () { %s })()));
+"""
+
+
+def classify(url, text="", selectors=(), buttons=()):
+    page = {"url": url, "text": text, "selectors": list(selectors), "buttons": list(buttons)}
+    result = subprocess.run(["node", "-e", NODE_HARNESS % PAGE_STATE_SCRIPT, json.dumps(page)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)["state"]
+
+
+pytestmark = pytest.mark.skipif(not shutil.which("node"), reason="needs node to run the page script")
+
+
+def test_feed_quoting_2fa_phrases_is_logged_in():
+    text = "Anna shared: when Facebook says try another way, just trust this device and save browser"
+    assert classify("https://www.facebook.com/", text, selectors=["[role='feed']"]) == "logged_in"
+
+
+def test_checkpoint_pages_use_phrases():
+    checkpoint = "https://www.facebook.com/checkpoint/?next"
+    assert classify(checkpoint, "Check your notifications on another device. Try another way") == "device_approval"
+    assert classify(checkpoint, "Go to your authentication app and enter the 6-digit code") == "code_entry"
+    assert classify(checkpoint, "Trust this device?", selectors=["[role='feed']"]) == "trust_device"
+
+
+def test_login_form_and_cookie_consent():
+    login = "https://www.facebook.com/login"
+    assert classify(login, selectors=["#email", "#pass"]) == "login_form"
+    assert classify(login, buttons=["Allow all cookies"], selectors=["#email", "#pass"]) == "cookie_consent"
+
+
+def test_plain_home_page_without_markers_still_logged_in():
+    assert classify("https://www.facebook.com/events/") == "logged_in"
@@ -0,0 +1,107 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from browser_manager import BrowserManager
+
+REFUSED = {"ready": False, "answered": False, "free_slots": 0, "error": "Connection refused"}
+
+
+def rank(monkeypatch, probes, last_good=None):
+    manager = BrowserManager([probe["port"] for probe in probes])
+    by_port = {probe["port"]: dict({"ready": True, "answered": True, "free_slots": 1, "latency": 0.01,
+                                    "error": None}, **probe)
+               for probe in probes}
+    monkeypatch.setattr(manager, "_probe_selenium_endpoint", lambda port: by_port[port])
+    monkeypatch.setattr(manager, "_load_last_endpoint", lambda: last_good)
+    return manager._rank_selenium_endpoints()
+
+
+def test_busy_ports_follow_ready_ones_and_dead_ports_are_dropped(monkeypatch):
+    ports = rank(monkeypatch, [dict(REFUSED, port=1),
+                               {"port": 2},
+                               {"port": 3, "ready": False, "free_slots": 0}])
+    assert ports == [2, 3]
+
+
+def test_every_port_tried_when_none_answered(monkeypatch):
+    assert rank(monkeypatch, [dict(REFUSED, port=1), dict(REFUSED, port=2)], last_good=2) == [2, 1]
+
+
+def test_last_good_port_wins_while_it_has_a_free_slot(monkeypatch):
+    probes = [{"port": 1, "free_slots": 4, "latency": 0.001}, {"port": 2, "free_slots": 1, "latency": 0.05}]
+    assert rank(monkeypatch, probes, last_good=2) == [2, 1]
+    probes[1]["free_slots"] = 0
+    assert rank(monkeypatch, probes, last_good=2) == [1, 2]
+
+
+def test_free_slots_then_latency(monkeypatch):
+    probes = [{"port": 1, "free_slots": 1, "latency": 0.001}, {"port": 2, "free_slots": 2, "latency": 0.05},
+              {"port": 3, "free_slots": 2, "latency": 0.01}]
+    assert rank(monkeypatch, probes) == [3, 2, 1]
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Grid /status with one free slot; any other path is a 404"""
+
+    def do_GET(self):
+        if self.path != "/wd/hub/status":
+            self.send_error(404)
+            return
+        body = json.dumps({"value": {"ready": True, "nodes": [{"slots": [{"session": None}]}]}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_probe_tells_answering_from_dead_ports(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with socket.socket() as closed:
+        closed.bind(("127.0.0.1", 0))
+        dead_port = closed.getsockname()[1]
+    try:
+        manager = BrowserManager([])
+        live = manager._probe_selenium_endpoint(server.server_address[1])
+        assert live["ready"] and live["answered"] and live["free_slots"] == 1
+        monkeypatch.setattr(StatusHandler, "do_GET", lambda self: self.send_error(404))
+        missing = manager._probe_selenium_endpoint(server.server_address[1])
+        assert missing["answered"] and not missing["ready"] and missing["error"] == "HTTP 404"
+        dead = manager._probe_selenium_endpoint(dead_port)
+        assert not dead["answered"] and dead["error"]
+    finally:
+        server.shutdown()
+
+
+def test_cookie_consent_tries_the_last_winner_first(monkeypatch):
+    from strategy_ranker import StrategyRanker
+    from utils import ConfigManager
+
+    manager = BrowserManager([])
+    manager.strategy_ranker = StrategyRanker()
+    winner = ConfigManager.COOKIE_CONSENT_SELECTORS[-1]
+    tried = []
+
+    def try_selector(selector, timeout):
+        tried.append(selector)
+        return selector == winner
+
+    monkeypatch.setattr(manager, "take_screenshot", lambda *args, **kwargs: None)
+    monkeypatch.setattr(manager, "_try_cookie_button_text", lambda: tried.append("button_text"))
+    monkeypatch.setattr(manager, "_try_cookie_selector", try_selector)
+    monkeypatch.setattr(manager, "_try_blue_buttons", lambda: tried.append("blue_buttons"))
+
+    assert manager.handle_cookie_consent(settle_seconds=0)
+    assert tried[0] == "button_text" and tried[-1] == winner
+    tried.clear()
+    assert manager.handle_cookie_consent(settle_seconds=0)
+    assert tried == [winner]
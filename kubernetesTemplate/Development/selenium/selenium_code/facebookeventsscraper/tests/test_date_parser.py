@@ -0,0 +1,71 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from date_parser import DateParser
+
+BUCHAREST = ZoneInfo("Europe/Bucharest")
+# Sunday noon: "Sat" is six days ahead, "this week" ends tonight
+REFERENCE = datetime(2026, 10, 18, 12, 0, tzinfo=BUCHAREST)
+
+
+@pytest.fixture
+def parser():
+    return DateParser(REFERENCE, BUCHAREST)
+
+
+def local(*args):
+    return datetime(*args, tzinfo=BUCHAREST)
+
+
+@pytest.mark.parametrize("text, start, end", [
+    ("Sat", local(2026, 10, 24), local(2026, 10, 25)),
+    ("Today at 20:00", local(2026, 10, 18, 20), local(2026, 10, 18, 20)),
+    ("Tomorrow at 8 PM", local(2026, 10, 19, 20), local(2026, 10, 19, 20)),
+    ("SAT, OCT 25 AT 8 PM", local(2026, 10, 25, 20), local(2026, 10, 25, 20)),
+    ("Oct 25 – Oct 27", local(2026, 10, 25), local(2026, 10, 28)),
+    ("Oct 30 - 2", local(2026, 10, 30), local(2026, 11, 3)),
+    ("Fri, 7 PM", local(2026, 10, 23, 19), local(2026, 10, 23, 19)),
+    ("22:00 – 02:00", local(2026, 10, 18, 22), local(2026, 10, 19, 2)),
+    ("Next week", local(2026, 10, 19), local(2026, 10, 26)),
+    ("Jan 3", local(2027, 1, 3), local(2027, 1, 4)),
+    ("2026-10-24T20:00:00+03:00", local(2026, 10, 24, 20), local(2026, 10, 24, 20)),
+    # Romanian
+    ("sâm., 25 oct. la 20:00", local(2026, 10, 25, 20), local(2026, 10, 25, 20)),
+    ("Mâine la 19:30", local(2026, 10, 19, 19, 30), local(2026, 10, 19, 19, 30)),
+    ("Marți, 5 noiembrie", local(2026, 11, 5), local(2026, 11, 6)),
+    ("Săptămâna aceasta", local(2026, 10, 18), local(2026, 10, 19)),
+    ("25 mai 2027", local(2027, 5, 25), local(2027, 5, 26)),
+])
+def test_parse(parser, text, start, end):
+    assert parser.parse(text) == (start, end)
+
+
+@pytest.mark.parametrize("text", ["Club Control", "Feb 30", ""])
+def test_unparseable(parser, text):
+    assert parser.parse(text) is None
+    assert parser.timestamps(text) == (None, None)
+
+
+def test_repeated_strings_are_cached(parser):
+    parser.parse("Sat")
+    parser.parse("Sat")
+    assert parser.cache_hits == 1
+
+
+@pytest.mark.parametrize("text, urgency", [
+    ("Today at 20:00", "Today"),
+    ("Tomorrow", "Tomorrow"),
+    ("Sat", None),
+])
+def test_urgency(parser, text, urgency):
+    assert parser.urgency(parser.timestamps(text)[0]) == urgency
+
+
+def test_this_week_window(parser):
+    window = parser.this_week()
+    assert window == (int(local(2026, 10, 18).timestamp()), int(local(2026, 10, 19).timestamp()))
+    assert DateParser.in_window(*parser.timestamps("Today at 20:00"), window)
+    assert not DateParser.in_window(*parser.timestamps("Sat"), window)
+    assert DateParser.in_window(None, None, window)  # Undated events are kept
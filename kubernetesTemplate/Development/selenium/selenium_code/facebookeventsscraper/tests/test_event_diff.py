@@ -0,0 +1,59 @@
+import json
+
+from event_diff import EventDiff
+
+
+def event(event_id, title, date="Sat", link_suffix=""):
+    return {"Title": title, "Link": f"https://www.facebook.com/events/{event_id}/{link_suffix}", "Date/Time": date}
+
+
+PREVIOUS = [
+    event(1, "Jazz night at Club Control"),
+    event(2, "Rooftop sunset session"),
+    event(3, "Monument walking tour", date="Sun"),
+]
+CURRENT = [
+    event(1, "Jazz night at Club Control", link_suffix="?acontext=ref"),  # Same event, tracking link
+    event(3, "Monument walking tour", date="Mon"),  # Moved
+    event(4, "Techno marathon all night"),  # New
+]
+
+
+def test_compute_counts():
+    result = EventDiff(CURRENT).compute(PREVIOUS)
+    assert [e["Title"] for e in result["added"]] == ["Techno marathon all night"]
+    assert [e["Title"] for e in result["removed"]] == ["Rooftop sunset session"]
+    assert len(result["changed"]) == 1
+    assert result["changed"][0]["fields"] == {"Date/Time": {"old": "Sun", "new": "Mon"}}
+
+
+def test_matches_by_title_when_ids_differ():
+    repost = [event(9, "Jazz night at Club Control")]
+    result = EventDiff(repost).compute(PREVIOUS[:1])
+    assert result == {"added": [], "removed": [], "changed": []}
+
+
+def test_streams_previous_events_from_json(work_dir):
+    path = work_dir / "events.json"
+    path.write_text(json.dumps({"city": "X", "events": PREVIOUS}), encoding="utf-8")
+    streamed = list(EventDiff.iter_events_from_json(str(path), chunk_size=16))
+    assert streamed == PREVIOUS
+
+
+def test_write_delta_from_streamed_file(work_dir):
+    path = work_dir / "events.json"
+    path.write_text(json.dumps({"city": "X", "total_events": 3, "events": PREVIOUS}), encoding="utf-8")
+    diff = EventDiff(CURRENT)
+    delta_file, counts, added = diff.write_delta(EventDiff.iter_events_from_json(str(path)), "X",
+                                                 filename=str(work_dir / "delta.jsonl"))
+    assert counts == {"added": 1, "removed": 1, "changed": 1}
+    assert diff.previous_count == 3
+    assert len((work_dir / "delta.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_exact_match_beats_an_earlier_title_match():
+    previous = [event(1, "Weekly jazz jam session", date="Sat"), event(2, "Weekly jazz jam session", date="Sun")]
+    current = [event(2, "Weekly jazz jam session", date="Sun")]
+    result = EventDiff(current).compute(previous)
+    assert result["removed"] == [previous[0]]
+    assert result["changed"] == [] and result["added"] == []
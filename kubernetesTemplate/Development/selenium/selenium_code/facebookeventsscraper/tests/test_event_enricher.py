@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from event_enricher import EventEnricher
+from utils import Event
+
+
+def test_page_timestamps_use_event_timezone():
+    start = int(datetime.fromisoformat("2026-10-24T17:00:00+00:00").timestamp())
+    details = EventEnricher._details_from_page({'start_timestamp': start, 'venue': "Capitol"})
+    assert details == {'start_time': "2026-10-24T20:00:00+03:00", 'venue': "Capitol"}
+
+
+def test_merge_sets_exact_time():
+    event = Event(title="Jazz Night", link="https://www.facebook.com/events/1234567890/", date_time="Sat, Oct 24", location="Near Timișoara")
+    EventEnricher.merge(event, {'start_time': "2026-10-24T20:00:00+03:00", 'venue': "Capitol"})
+    assert event.date_time == "Sat, Oct 24 at 20:00"
+    assert event.start_timestamp == int(datetime.fromisoformat("2026-10-24T17:00:00+00:00").timestamp())
+    assert event.location == "Capitol"
@@ -0,0 +1,38 @@
+import types
+
+from event_diff import EventDiff
+from event_store import EventStore
+
+
+def event(event_id, title):
+    return {"Title": title, "Link": f"https://www.facebook.com/events/{event_id}/", "Date/Time": "Sat"}
+
+
+def test_latest_run_streams_events(work_dir):
+    store = EventStore(str(work_dir / "events.db"))
+    store.record_run("X", [event(1, "Jazz night"), event(2, "Rooftop session")])
+    latest = store.load_latest_events("X", stream=True)
+    assert latest["total_events"] == 2
+    assert isinstance(latest["events"], types.GeneratorType)
+
+    diff = EventDiff([event(2, "Rooftop session"), event(3, "Techno marathon")])
+    counts = {"added": 0, "removed": 0, "changed": 0}
+    for change, _, _ in diff.iter_changes(latest["events"]):
+        counts[change] += 1
+    assert counts == {"added": 1, "removed": 1, "changed": 0}
+    assert diff.previous_count == 2
+    store.close()
+
+
+def test_events_without_id_are_keyed_by_link(work_dir):
+    store = EventStore(str(work_dir / "events.db"))
+    events = [{"Title": "Jazz night", "Link": "https://www.facebook.com/jazz-night?ref=1"},
+              {"Title": "Rooftop session", "Link": "https://www.facebook.com/rooftop"},
+              {"Title": "No link at all", "Link": ""},
+              event(1, "Techno marathon")]
+    store.record_run("X", events)
+    latest = store.load_latest_events("X")
+    assert latest["total_events"] == 3
+    assert [e["Title"] for e in latest["events"]] == ["Jazz night", "Rooftop session", "Techno marathon"]
+    assert [e["Event_Id"] for e in latest["events"]] == [None, None, 1]
+    store.close()
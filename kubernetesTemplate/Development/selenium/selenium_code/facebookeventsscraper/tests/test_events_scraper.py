@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from date_parser import DateParser
+from events_scraper import EventsScraper
+
+
+def network_item(**overrides):
+    item = {'id': "1234567890", 'title': "Jazz Night", 'url': "https://www.facebook.com/events/1234567890/",
+            'date_text': None, 'start_timestamp': None, 'city': "Timișoara", 'venue': "Capitol",
+            'is_online': False}
+    item.update(overrides)
+    return item
+
+
+@pytest.fixture
+def scraper():
+    # Only the payload mapping is exercised, which needs no browser
+    scraper = EventsScraper.__new__(EventsScraper)
+    scraper.date_parser = DateParser()
+    return scraper
+
+
+def test_network_date_text_uses_event_timezone(scraper):
+    # 2026-10-24 17:00 UTC is 20:00 in Bucharest, whatever the container's TZ
+    timestamp = int(datetime.fromisoformat("2026-10-24T17:00:00+00:00").timestamp())
+    event = scraper._network_event_to_dict(network_item(start_timestamp=timestamp), "Timișoara", 1)
+    assert event['Date/Time'] == "Sat, Oct 24 at 20:00"
+    assert event['Start_Timestamp'] == timestamp
+    assert event['Event_Id'] == 1234567890
+
+
+class StubCapture:
+    enabled = True
+    responses = 1
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def collect(self):
+        return self.batches.pop(0) if self.batches else []
+
+
+def test_anchors_parsed_for_first_page_and_when_capture_is_empty(scraper, monkeypatch):
+    scraper.network_capture = StubCapture([[network_item()], [network_item(id="222")], []])
+    parsed = []
+
+    def parse_anchors(city_name, approach_num, incremental=False):
+        parsed.append(list(scraper.new_anchors))
+        scraper.new_anchors = []
+        return []
+
+    monkeypatch.setattr(scraper, "_extract_events_enhanced", parse_anchors)
+    scraper.new_anchors = ["first page"]
+    assert len(scraper._extract_new_events("Timișoara", 1, first_page=True)) == 1
+    scraper.new_anchors = ["covered by capture"]
+    assert len(scraper._extract_new_events("Timișoara", 1)) == 1
+    scraper.new_anchors = ["capture missed these"]
+    scraper._extract_new_events("Timișoara", 1)
+    assert parsed == [["first page"], ["capture missed these"]]
@@ -0,0 +1,75 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("selenium")  # benchmark.py holds the recorded-page server and imports the scraper
+
+from benchmark import RecordedSearchHandler, build_recorded_search_pages
+from http_fetcher import FetchBlocked, HttpEventFetcher, HttpFetcher
+
+SESSION_COOKIES = [{"name": "c_user", "value": "1000", "domain": "127.0.0.1"}]
+LOGIN_PAGE = ('<html><body><form id="login_form" action="/login/device-based/regular/login/">'
+              '<input name="email"><input name="pass" type="password"></form></body></html>')
+EMPTY_PAGE = '<html><body><a href="/events/">Events</a><a href="/events/discovery/">Discover</a></body></html>'
+
+
+@pytest.fixture
+def serve():
+    """Start the recorded search host with the given pages; returns its search URL"""
+    servers = []
+
+    def start(pages):
+        handler = type("Handler", (RecordedSearchHandler,), {"pages": pages})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/events/search/?q=Timisoara"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_follows_more_links_over_one_connection(serve):
+    url = serve(build_recorded_search_pages("Timișoara", 60, page_size=20))
+    client = HttpFetcher(SESSION_COOKIES)
+    pages = list(HttpEventFetcher(client).iter_pages(url))
+    assert [len([a for a in page.anchors if "/events/1" in a["href"]]) for page in pages] == [20, 20, 20]
+    assert pages[0].anchors[2]["href"].startswith("https://www.facebook.com/events/100000/")
+    assert "Today at 18:00" in pages[0].anchors[2]["text"]
+    assert client.requests == 3 and len(client._connections) == 1
+    client.close()
+
+
+def test_max_pages_limits_pagination(serve):
+    url = serve(build_recorded_search_pages("Timișoara", 60, page_size=20))
+    assert len(list(HttpEventFetcher(HttpFetcher(SESSION_COOKIES)).iter_pages(url, max_pages=2))) == 2
+
+
+def test_rotated_cookies_are_kept(serve):
+    url = serve(build_recorded_search_pages("Timișoara", 20))
+    client = HttpFetcher(SESSION_COOKIES + [{"name": "fr", "value": "original", "domain": ".127.0.0.1"}])
+    client.get(url)
+    assert client.cookies["fr"] == ("127.0.0.1", "rotated")
+    assert "fr=rotated" in client._cookie_header("127.0.0.1")
+    assert "c_user=1000" in client._cookie_header("127.0.0.1")
+
+
+def test_checkpoint_redirect_is_blocked(serve):
+    url = serve(build_recorded_search_pages("Timișoara", 20))
+    with pytest.raises(FetchBlocked, match="checkpoint"):
+        next(HttpEventFetcher(HttpFetcher([])).iter_pages(url))
+
+
+@pytest.mark.parametrize("page, reason", [(LOGIN_PAGE, "logged out"), (EMPTY_PAGE, "empty page")])
+def test_unusable_first_page_is_blocked(serve, page, reason):
+    url = serve([page])
+    with pytest.raises(FetchBlocked, match=reason):
+        next(HttpEventFetcher(HttpFetcher(SESSION_COOKIES)).iter_pages(url))
+
+
+def test_unusable_later_page_ends_pagination(serve):
+    first = build_recorded_search_pages("Timișoara", 40, page_size=20)[0]
+    url = serve([first, EMPTY_PAGE])
+    assert len(list(HttpEventFetcher(HttpFetcher(SESSION_COOKIES)).iter_pages(url))) == 1
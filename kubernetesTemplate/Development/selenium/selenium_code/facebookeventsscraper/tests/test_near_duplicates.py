@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("selenium")  # benchmark.py builds the corpus and imports the scraper
+
+from benchmark import build_near_duplicate_corpus
+from near_duplicates import NearDuplicateIndex
+from utils import Event
+
+START = 1792800000
+
+
+def jazz(event_id, venue="Club Control", start=START, title="Jazz Night with Simon Trio"):
+    return Event(title=title, link=f"https://www.facebook.com/events/{event_id}/", venue=venue,
+                 start_timestamp=start, event_id=event_id)
+
+
+def test_corpus_recall_without_false_matches():
+    events, copies = build_near_duplicate_corpus(2000)
+    index = NearDuplicateIndex()
+    index.annotate(events, "Benchmark")
+    flagged = {event.event_id for event in events if event.duplicate_of}
+    assert flagged == copies
+    assert index.comparisons < 2000 * 10  # Candidates come from LSH buckets, not all pairs
+
+
+def test_copies_and_recurring_instances_cluster_but_tours_do_not():
+    events = [
+        jazz(1),
+        jazz(2, title="Jazz night with Simon trio!"),  # Co-hosted copy
+        jazz(3, start=START + 7 * 86400),  # Next week's instance
+        jazz(4, venue="Form Space Cluj"),  # Same show, other city
+    ]
+    NearDuplicateIndex().annotate(events, "Timișoara")
+    assert [event.duplicate_of for event in events] == [
+        None, "https://www.facebook.com/events/1/", "https://www.facebook.com/events/1/", None]
+
+
+def test_history_persists_across_instances(work_dir):
+    path = str(work_dir / "index.json")
+    first = NearDuplicateIndex(path)
+    first.annotate([jazz(1)], "Timișoara")
+    first.save()
+
+    repost = jazz(7, title="JAZZ NIGHT with Simon Trio")
+    NearDuplicateIndex(path).annotate([repost], "Cluj")
+    assert repost.duplicate_of == "https://www.facebook.com/events/1/"
+
+
+def test_changed_event_is_fingerprinted_again(work_dir):
+    path = str(work_dir / "index.json")
+    first = NearDuplicateIndex(path)
+    first.annotate([jazz(1, venue="Near Timișoara"), jazz(2, title="Rooftop Sunset Session", venue="Scârț")],
+                   "Timișoara")
+    first.save()
+
+    # Enrichment later renamed event 2 into a copy of event 1
+    index = NearDuplicateIndex(path)
+    changed = jazz(2, venue="Near Timișoara")
+    index.annotate([changed], "Timișoara")
+    assert changed.duplicate_of == "https://www.facebook.com/events/1/"
+    assert sum(keys.count("2") for keys in index.buckets.values()) == 16  # Old buckets dropped
+
+    unchanged = jazz(2, venue="Near Timișoara")
+    index.annotate([unchanged], "Timișoara")
+    assert index.comparisons == 1
@@ -0,0 +1,47 @@
+import json
+
+from network_capture import GraphQLEventCapture
+
+
+class FakeBrowser:
+    """Serves GraphQL response bodies over a fake CDP and replays queued Network events"""
+
+    def __init__(self):
+        self.listeners = []
+        self.queued = []
+        self.bodies = {}
+
+    def add_network_listener(self, listener):
+        self.listeners.append(listener)
+
+    def execute_cdp(self, cmd, params=None):
+        if cmd == "Network.getResponseBody":
+            return {"body": self.bodies[params["requestId"]]}
+        return {}
+
+    def poll_network_events(self):
+        queued, self.queued = self.queued, []
+        for method, params in queued:
+            for listener in self.listeners:
+                listener(method, params)
+
+    def respond(self, request_id, event_ids):
+        nodes = [{"__typename": "Event", "id": str(event_id), "name": f"Event {event_id}"} for event_id in event_ids]
+        self.bodies[request_id] = "for (;;);" + json.dumps({"data": {"results": {"edges": nodes}}})
+        self.queued += [("Network.responseReceived", {"requestId": request_id,
+                                                       "response": {"url": "https://www.facebook.com/api/graphql/"}}),
+                        ("Network.loadingFinished", {"requestId": request_id})]
+
+
+def test_collect_returns_only_events_new_since_the_last_call():
+    browser = FakeBrowser()
+    capture = GraphQLEventCapture(browser, enabled=True)
+    assert capture.start()
+
+    browser.respond("1", [101, 102])
+    assert [event["id"] for event in capture.collect()] == ["101", "102"]
+
+    browser.respond("2", [102, 103])  # Pages overlap
+    assert [event["id"] for event in capture.collect()] == ["103"]
+    assert capture.collect() == []
+    assert len(capture.events) == 3 and capture.responses == 2
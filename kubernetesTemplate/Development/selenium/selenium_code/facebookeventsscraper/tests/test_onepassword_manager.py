@@ -0,0 +1,101 @@
+import base64
+import json
+import os
+
+import pytest
+
+from onepassword_manager import OnePasswordManager
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin")
+# RFC 6238 Appendix B seeds (ASCII), one per HMAC algorithm
+RFC_SEEDS = {"SHA1": b"12345678901234567890", "SHA256": b"12345678901234567890123456789012",
+             "SHA512": b"1234567890123456789012345678901234567890123456789012345678901234"}
+SECRET = base64.b32encode(RFC_SEEDS["SHA1"]).decode("ascii")
+
+ITEM = {
+    "id": "abc123",
+    "title": "Facebook",
+    "fields": [
+        {"id": "notes", "label": "email", "value": "old@example.com"},
+        {"id": "username", "label": "username", "value": "scraper@example.com"},
+        {"id": "password", "label": "password", "value": "s3cret"},
+        {"id": "totp", "label": "one-time password", "type": "OTP", "value": f"otpauth://totp/Facebook?secret={SECRET}"},
+    ],
+}
+
+
+@pytest.fixture
+def fake_op(monkeypatch, tmp_path):
+    """Put tests/bin/op first on PATH serving ITEM; returns a function listing the calls made so far"""
+    item_path = tmp_path / "item.json"
+    log_path = tmp_path / "op.log"
+    item_path.write_text(json.dumps(ITEM), encoding="utf-8")
+    monkeypatch.setenv("PATH", BIN_DIR + os.pathsep + os.environ.get("PATH", ""))
+    monkeypatch.setenv("FAKE_OP_ITEM", str(item_path))
+    monkeypatch.setenv("FAKE_OP_LOG", str(log_path))
+
+    def calls():
+        return log_path.read_text(encoding="utf-8").splitlines() if log_path.exists() else []
+    return calls
+
+
+def test_cli_available(fake_op):
+    assert OnePasswordManager().check_cli_availability()
+
+
+def test_credentials_last_matching_field_wins(fake_op):
+    manager = OnePasswordManager()
+    assert manager.get_credentials() == ("scraper@example.com", "s3cret")
+    assert fake_op() == ["item get Facebook --format json"]
+
+
+def test_email_label_used_when_no_username(fake_op, tmp_path):
+    item = dict(ITEM, fields=[field for field in ITEM["fields"] if field["id"] != "username"])
+    (tmp_path / "item.json").write_text(json.dumps(item), encoding="utf-8")
+    assert OnePasswordManager().get_credentials() == ("old@example.com", "s3cret")
+
+
+def test_otp_generated_from_cached_item(fake_op, monkeypatch):
+    manager = OnePasswordManager()
+    manager.get_credentials()
+    monkeypatch.setattr("onepassword_manager.time.time", lambda: 59)
+    assert manager.get_otp() == "287082"  # Last 6 digits of the RFC 6238 SHA1 vector for T=59
+    assert fake_op() == ["item get Facebook --format json"]
+
+
+def test_otp_falls_back_to_cli(fake_op, tmp_path, monkeypatch):
+    item = dict(ITEM, fields=[field for field in ITEM["fields"] if field.get("type") != "OTP"])
+    (tmp_path / "item.json").write_text(json.dumps(item), encoding="utf-8")
+    monkeypatch.setenv("FAKE_OP_OTP", "654321")
+    assert OnePasswordManager().get_otp() == "654321"
+    assert fake_op()[-1] == "item get Facebook --otp"
+
+
+def test_clear_cache_refetches(fake_op):
+    manager = OnePasswordManager()
+    manager.get_credentials()
+    manager.clear_cache()
+    assert manager.get_credentials() == ("scraper@example.com", "s3cret")
+    assert len(fake_op()) == 2
+
+
+def test_cache_expiry_refetches(fake_op):
+    manager = OnePasswordManager(cache_ttl=0)
+    manager.get_credentials()
+    manager.get_field("password")
+    assert len(fake_op()) == 2
+
+
+@pytest.mark.parametrize("for_time, sha1, sha256, sha512", [
+    (59, "94287082", "46119246", "90693936"),
+    (1111111109, "07081804", "68084774", "25091201"),
+    (1111111111, "14050471", "67062674", "99943326"),
+    (1234567890, "89005924", "91819424", "93441116"),
+    (2000000000, "69279037", "90698825", "38618901"),
+    (20000000000, "65353130", "77737706", "47863826"),
+])
+def test_rfc6238_vectors(for_time, sha1, sha256, sha512):
+    for algorithm, expected in (("SHA1", sha1), ("SHA256", sha256), ("SHA512", sha512)):
+        secret = base64.b32encode(RFC_SEEDS[algorithm]).decode("ascii")
+        uri = f"otpauth://totp/RFC?secret={secret}&digits=8&algorithm={algorithm}"
+        assert OnePasswordManager.generate_totp(uri, for_time) == expected
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from benchmark import benchmark_http_fetch, build_synthetic_recording, run_benchmark
+from replay_driver import RecordingDriver
+
+
+def test_replay_command_counts():
+    result = run_benchmark(build_synthetic_recording("Timișoara", 60), "Timișoara")
+    commands = {phase["phase"]: phase["commands"] for phase in result["phases"]}
+    assert result["events"] == 60
+    assert commands == {"authenticate": 23, "search": 1, "date_filter": 1, "scroll": 19, "extract": 0, "dedup": 0}
+    assert result["total"]["commands"] == 44
+
+
+def test_http_fetch_and_checkpoint_fallback():
+    results = benchmark_http_fetch("Timișoara", 60, page_size=20)
+    http, fallback = results["http"], results["checkpoint_fallback"]
+    assert http["events"] == 60
+    assert http["http_requests"] == 3
+    assert http["webdriver_commands"] == 0  # The browser is never touched
+    # Without the session cookie the host redirects to a checkpoint and the browser takes over
+    assert fallback["events"] == 60
+    assert fallback["webdriver_commands"] > 0
+
+
+class FakeDriver:
+    current_url = "https://www.facebook.com/login"
+    page_source = "<html><form id='login_form'>...</form></html>"
+
+    def get(self, url):
+        self.current_url = url
+
+    def find_elements(self, by, value=None):
+        return ["element"]
+
+    def execute_script(self, script, *args):
+        if args:
+            return [{"tag_name": "input", "attributes": {"value": "hunter2", "type": "password"}}]
+        return {"state": "login_form"}
+
+
+def test_recording_redacts_login(work_dir):
+    path = str(work_dir / "recording.json")
+    driver = RecordingDriver(FakeDriver(), path)
+    with driver.redacted():
+        driver.get("https://www.facebook.com/login")
+        driver.find_elements("css selector", "input")
+    driver.get("https://www.facebook.com/events/search/")
+    driver.save()
+
+    with open(path, encoding="utf-8") as f:
+        recording = json.load(f)
+    assert "hunter2" not in json.dumps(recording)
+    assert [snapshot["url"] for snapshot in recording["snapshots"]] == ["https://www.facebook.com/events/search/"]
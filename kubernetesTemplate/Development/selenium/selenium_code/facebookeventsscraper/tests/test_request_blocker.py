@@ -0,0 +1,82 @@
+import shutil
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from request_blocker import RequestBlocker
+from utils import ConfigManager
+
+
+class FakeBrowser:
+    """Feeds queued CDP Network events to listeners, like BrowserManager.poll_network_events"""
+
+    def __init__(self):
+        self.listeners = []
+        self.cdp_calls = []
+        self.queued = []
+
+    def add_network_listener(self, listener):
+        self.listeners.append(listener)
+
+    def execute_cdp(self, cmd, params=None):
+        self.cdp_calls.append((cmd, params))
+
+    def poll_network_events(self):
+        for method, params in self.queued:
+            for listener in self.listeners:
+                listener(method, params)
+        self.queued = []
+
+
+def test_enable_installs_patterns():
+    browser = FakeBrowser()
+    blocker = RequestBlocker(browser, patterns=["*.jpg*"], enabled=True)
+    assert blocker.enable()
+    assert browser.cdp_calls == [("Network.enable", None), ("Network.setBlockedURLs", {"urls": ["*.jpg*"]})]
+
+
+def test_report_measures_loaded_and_estimates_blocked():
+    browser = FakeBrowser()
+    blocker = RequestBlocker(browser, patterns=["*.jpg*"], enabled=True)
+    browser.queued = [
+        ('Network.requestWillBeSent', {'requestId': "1", 'type': "Document"}),
+        ('Network.loadingFinished', {'requestId': "1", 'encodedDataLength': 5000}),
+        ('Network.requestWillBeSent', {'requestId': "2", 'type': "Image"}),
+        ('Network.loadingFailed', {'requestId': "2", 'blockedReason': "inspector"}),
+        ('Network.loadingFailed', {'requestId': "3", 'type': "Media", 'blockedReason': "inspector"}),
+        ('Network.loadingFailed', {'requestId': "4", 'type': "Script", 'errorText': "net::ERR_FAILED"}),
+    ]
+    report = blocker.report("search")
+    assert report['loaded_requests'] == 1 and report['loaded_bytes'] == 5000
+    assert report['blocked_by_type'] == {'Image': 1, 'Media': 1}
+    estimate = ConfigManager.BLOCKED_BYTES_ESTIMATE
+    assert report['estimated_bytes_saved'] == estimate['Image'] + estimate['Media']
+    assert blocker.report("next")['blocked_requests'] == 0
+
+
+def test_fixture_server_serves_heavy_assets():
+    benchmark = pytest.importorskip("benchmark")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), benchmark.HeavyAssetsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        page = urllib.request.urlopen(base + "/").read().decode("utf-8")
+        for path, _, size in benchmark.FIXTURE_ASSETS:
+            assert path in page
+            assert len(urllib.request.urlopen(base + path).read()) == size
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.skipif(not shutil.which("chromedriver"), reason="needs a local chromedriver")
+def test_blocking_fixture_on_live_chrome():
+    benchmark = pytest.importorskip("benchmark")
+    results = benchmark.benchmark_request_blocking([])
+    if results is None:
+        pytest.skip("Chrome did not start")
+    unblocked, blocked = results["unblocked"], results["blocked"]
+    assert unblocked['blocked_requests'] == 0
+    assert blocked['blocked_requests'] >= len(benchmark.FIXTURE_ASSETS) - 1
+    assert blocked['loaded_bytes'] < unblocked['loaded_bytes'] / 4
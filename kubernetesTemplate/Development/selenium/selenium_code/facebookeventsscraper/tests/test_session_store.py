@@ -0,0 +1,43 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from session_store import SessionStore
+
+
+class FakeFernet:
+    @staticmethod
+    def generate_key():
+        return os.urandom(16).hex().encode("ascii")
+
+
+def test_workers_starting_together_share_one_key(work_dir):
+    barrier = threading.Barrier(8)
+
+    def load():
+        barrier.wait()
+        return SessionStore(str(work_dir / "sessions"))._load_or_create_key_file(FakeFernet)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        keys = list(executor.map(lambda _: load(), range(8)))
+    assert len(set(keys)) == 1 and keys[0]
+    assert oct(os.stat(work_dir / "sessions" / "session.key").st_mode & 0o777) == "0o600"
+
+
+def test_waits_for_key_being_written(work_dir):
+    directory = work_dir / "sessions"
+    directory.mkdir()
+    key_path = directory / "session.key"
+    key_path.write_bytes(b"")
+
+    def write_later():
+        time.sleep(0.2)
+        key_path.write_bytes(b"written-by-another-worker\n")
+
+    writer = threading.Thread(target=write_later)
+    writer.start()
+    try:
+        assert SessionStore(str(directory))._load_or_create_key_file(FakeFernet) == b"written-by-another-worker"
+    finally:
+        writer.join()
@@ -0,0 +1,161 @@
+"""
+Tracer Module
+Timed spans per scraping phase with WebDriver command and sleep counts, exported as Chrome trace JSON
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils import ConfigManager, FileManager
+
+# Scraper sleeps go through sleep() below instead of patching time.sleep for the whole
+# process; totals are kept per thread so that parallel sessions (ScraperPool) do not see
+# each other's sleeps
+_sleep_totals = threading.local()
+
+def sleep(seconds):
+    """time.sleep that spans can attribute to the calling thread"""
+    _sleep_totals.seconds = getattr(_sleep_totals, "seconds", 0.0) + seconds
+    time.sleep(seconds)
+
+
+def slept_seconds():
+    """Total seconds the current thread has spent in sleep()"""
+    return getattr(_sleep_totals, "seconds", 0.0)
+
+
+class Tracer:
+    """Collects nested timed spans for one scraper run"""
+
+    def __init__(self, browser=None, trace_dir=None, profile=False):
+        self.browser = browser
+        self.trace_dir = trace_dir or ConfigManager.TRACE_DIR
+        # cProfile each top-level phase (adds noticeable overhead)
+        self.profile = profile or os.environ.get(ConfigManager.TRACE_PROFILE_ENV) == "1"
+        self.label = "run"
+        self.events = []  # Chrome trace "complete" events, one per span
+        self.phases = []  # Top-level spans, used for the summary line
+        self._depth = 0
+        self._profilers = {}
+        self._started_at = datetime.now()
+        self._origin = time.perf_counter()
+
+    def begin_run(self, label):
+        """Reset collected spans and start timing a new run"""
+        self.label = label
+        self.events = []
+        self.phases = []
+        self._profilers = {}
+        self._started_at = datetime.now()
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time a block; yields a dict the block may add trace arguments to"""
+        depth = self._depth
+        profiler = self._start_profiler(name) if self.profile and depth == 0 else None
+        commands_before = self._command_count()
+        sleep_before = slept_seconds()
+        start = time.perf_counter()
+        status = "ok"
+        self._depth += 1
+
+        try:
+            yield args
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self._depth = depth
+            if profiler:
+                profiler.disable()
+
+            commands = self._command_count() - commands_before
+            sleep_seconds = slept_seconds() - sleep_before
+            self.events.append({
+                "name": name,
+                "cat": "phase" if depth == 0 else "step",
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6),
+                "dur": round(duration * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": dict(args, commands=commands, sleep_seconds=round(sleep_seconds, 3), status=status)
+            })
+            if depth == 0:
+                self.phases.append({
+                    "phase": name,
+                    "seconds": round(duration, 3),
+                    "commands": commands,
+                    "sleep_seconds": round(sleep_seconds, 2),
+                    "status": status
+                })
+
+    def get_summary(self):
+        """Per-run totals and per-phase metrics"""
+        return {
+            "label": self.label,
+            "started_at": self._started_at.isoformat(),
+            "total_seconds": round(time.perf_counter() - self._origin, 3),
+            "commands": sum(p["commands"] for p in self.phases),
+            "sleep_seconds": round(sum(p["sleep_seconds"] for p in self.phases), 2),
+            "phases": self.phases
+        }
+
+    def summary_line(self):
+        """Compact one-line summary: total, then seconds/commands/sleep per phase"""
+        summary = self.get_summary()
+        parts = [f"{summary['label']} {summary['total_seconds']:.1f}s, {summary['commands']} cmd, "
+                 f"{summary['sleep_seconds']:.1f}s sleep"]
+        for phase in self.phases:
+            failed = " ✗" if phase["status"] != "ok" else ""
+            parts.append(f"{phase['phase']} {phase['seconds']:.1f}s/{phase['commands']}cmd/"
+                         f"{phase['sleep_seconds']:.1f}s{failed}")
+        return " | ".join(parts)
+
+    def export(self, filename=None):
+        """Write the Chrome trace (chrome://tracing, Perfetto) and any phase profiles; return the trace path"""
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            if not filename:
+                clean_label = FileManager._clean_city_name_for_filename(self.label)
+                timestamp = self._started_at.strftime("%Y%m%d_%H%M%S")
+                filename = os.path.join(self.trace_dir, f"trace_{clean_label}_{timestamp}.json")
+
+            trace = {
+                "traceEvents": sorted(self.events, key=lambda event: event["ts"]),
+                "displayTimeUnit": "ms",
+                "otherData": self.get_summary()
+            }
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(trace, f, ensure_ascii=False)
+
+            base, _ = os.path.splitext(filename)
+            for phase, profiler in self._profilers.items():
+                profiler.dump_stats(f"{base}_{phase}.prof")
+
+            return filename
+
+        except Exception as e:
+            print(f"⚠️ Could not export trace: {e}")
+            return None
+
+    def _start_profiler(self, name):
+        """Enable the profiler for a phase; repeated phases accumulate into one profile"""
+        profiler = self._profilers.get(name) or cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can be active at a time (e.g. parallel sessions)
+            return None
+        self._profilers[name] = profiler
+        return profiler
+
+    def _command_count(self):
+        return getattr(self.browser, "command_count", 0)
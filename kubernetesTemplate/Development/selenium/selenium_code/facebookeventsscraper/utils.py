@@ -4,7 +4,9 @@ Contains utility functions and helpers
 """
 
 import json
+import re
 import time
+from collections import deque
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
@@ -19,6 +21,19 @@ class Event:
     city_match: bool = False
     source_approach: int = 1
     urgency: Optional[str] = None
+    # Numeric Facebook event id parsed from the link; the identity used by dedup, diff and storage
+    event_id: Optional[int] = None
+    # Details from the event page (see event_enricher.py); times are ISO 8601
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    venue: Optional[str] = None
+    address: Optional[str] = None
+    organizer: Optional[str] = None
+    # Parsed date bounds in epoch seconds (see date_parser.py), for cheap sorting and window filters
+    start_timestamp: Optional[int] = None
+    end_timestamp: Optional[int] = None
+    # Link of the first event seen with a near-identical title, date and venue (see near_duplicates.py)
+    duplicate_of: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary"""
@@ -29,7 +44,16 @@ class Event:
             'Location': self.location,
             'City_Match': self.city_match,
             'Source_Approach': self.source_approach,
-            'Urgency': self.urgency
+            'Urgency': self.urgency,
+            'Event_Id': self.event_id,
+            'Start': self.start_time,
+            'End': self.end_time,
+            'Venue': self.venue,
+            'Address': self.address,
+            'Organizer': self.organizer,
+            'Start_Timestamp': self.start_timestamp,
+            'End_Timestamp': self.end_timestamp,
+            'Duplicate_Of': self.duplicate_of
         }
 
 class FileManager:
@@ -85,8 +109,6 @@ class FileManager:
     @staticmethod
     def _clean_city_name_for_filename(city_name: str) -> str:
         """Clean city name for use in filename"""
-        import re
-        
         # Replace special characters and spaces
         clean_name = re.sub(r'[^\w\s-]', '', city_name)  # Remove special chars except spaces and hyphens
         clean_name = re.sub(r'\s+', '_', clean_name)      # Replace spaces with underscores
@@ -140,14 +162,19 @@ class EventDisplayer:
             print("=" * 60)
             
             for i, event in enumerate(events, 1):
-                if isinstance(event, Event):
-                    EventDisplayer._display_single_event(event, i)
-                else:
-                    EventDisplayer._display_dict_event(event, i)
+                EventDisplayer.display_event(event, i)
         else:
             print(f"😕 No events found in {city_name}")
             print("📸 Check the screenshots for debugging")
     
+    @staticmethod
+    def display_event(event, index: int) -> None:
+        """Display one Event or event dictionary"""
+        if isinstance(event, Event):
+            EventDisplayer._display_single_event(event, index)
+        else:
+            EventDisplayer._display_dict_event(event, index)
+    
     @staticmethod
     def _display_single_event(event: Event, index: int) -> None:
         """Display a single Event object"""
@@ -157,10 +184,14 @@ class EventDisplayer:
             print(f"   Date: {event.date_time}")
         if event.location:
             print(f"   Location: {event.location}")
+        if event.organizer:
+            print(f"   Organizer: {event.organizer}")
         if event.city_match:
             print(f"   ✅ City match confirmed")
         if event.urgency:
             print(f"   ⚡ Urgency: {event.urgency}")
+        if event.duplicate_of:
+            print(f"   🧬 Possible duplicate of: {event.duplicate_of}")
         print(f"   Link: {event.link}")
     
     @staticmethod
@@ -220,37 +251,136 @@ class EventValidator:
         
         return title_lower not in invalid_titles
 
+# Date words matched at word boundaries, so "mon" matches "Mon"/"Monday" but not "Simon"
+# and "sun" matches "Sun"/"Sunday" but not "Sunset". Search lowercased text: a case
+# sensitive pattern is several times faster than re.IGNORECASE.
+DATE_KEYWORD_PATTERN = re.compile(
+    r"\b(?:mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:r|rs|rsday)?|fri(?:day)?|"
+    r"sat(?:urday)?|sun(?:day)?|"
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t|tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?|"
+    r"today|tomorrow|tonight|this week|next week)\b"
+)
+
+# Keywords reported as-is; weekday and month names are reported by their 3-letter form
+WHOLE_DATE_KEYWORDS = {'today', 'tomorrow', 'tonight', 'this week', 'next week'}
+
+URGENCY_PATTERN = re.compile(r"\b(?:(tonight|today)|(tomorrow)|(this week))\b")
+
+# Numeric id in any event URL form: /events/123/, /events/123/?acontext=..., m./mbasic. hosts
+EVENT_ID_PATTERN = re.compile(r"/events/(\d+)")
+# Everything that is not a letter or digit, removed from title keys in one C-level pass
+NON_ALNUM_PATTERN = re.compile(r"[\W_]+")
+
+class EventDeduplicator:
+    """Incremental duplicate check by integer event id (link without query string otherwise) or normalized title"""
+    
+    def __init__(self):
+        self.seen_ids = set()  # ints: far smaller and faster to hash than URL strings
+        self.seen_links = set()  # Only links without a numeric id
+        self.seen_titles = set()
+    
+    @staticmethod
+    def parse_event_id(link: str) -> Optional[int]:
+        """Numeric Facebook event id in a link, or None"""
+        match = EVENT_ID_PATTERN.search(link or '')
+        return int(match.group(1)) if match else None
+    
+    @staticmethod
+    def event_id(event: dict) -> Optional[int]:
+        """The event's Event_Id, parsed from its link for dictionaries created before ids existed"""
+        event_id = event.get('Event_Id')
+        if event_id is None:
+            return EventDeduplicator.parse_event_id(event.get('Link'))
+        return int(event_id)
+    
+    @staticmethod
+    def event_key(event: dict):
+        """Integer event id, else the link without tracking parameters (None without either)"""
+        event_id = EventDeduplicator.event_id(event)
+        if event_id is not None:
+            return event_id
+        return EventDeduplicator.link_key(event.get('Link', '')) or None
+    
+    @staticmethod
+    def link_key(link: str) -> str:
+        """Link without tracking parameters, so DOM and network links of an event match"""
+        return (link or '').strip().split('?')[0].rstrip('/')
+    
+    @staticmethod
+    def title_key(title: str) -> str:
+        """First 70 chars, lowercase, alphanumeric only; only used when longer than 10 chars"""
+        key = NON_ALNUM_PATTERN.sub('', (title or '').strip()[:70].lower())
+        return key if len(key) > 10 else ''
+    
+    def add(self, event: dict) -> bool:
+        """Record the event and return True if it was not seen before"""
+        key = self.event_key(event)
+        seen = self.seen_ids if isinstance(key, int) else self.seen_links
+        if key is not None and key in seen:
+            return False  # Repeats are rejected before a title key is built
+        
+        title = self.title_key(event.get('Title', ''))
+        if title and title in self.seen_titles:
+            return False
+        
+        if key is not None:
+            seen.add(key)
+        if title:
+            self.seen_titles.add(title)
+        return True
+
 class TextParser:
     """Handles text parsing utilities"""
     
+    @staticmethod
+    def match_date_keyword(text: str) -> Optional[str]:
+        """Return the canonical date keyword ('sat', 'oct', 'today', ...) found in text"""
+        match = DATE_KEYWORD_PATTERN.search(text.lower())
+        if not match:
+            return None
+        keyword = match.group(0)
+        return keyword if keyword in WHOLE_DATE_KEYWORDS else keyword[:3]
+    
+    @staticmethod
+    def is_date_line(text: str) -> bool:
+        """Check if a line contains a date keyword"""
+        return DATE_KEYWORD_PATTERN.search(text.lower()) is not None
+    
+    @staticmethod
+    def classify_lines(lines: List[str]) -> List[tuple]:
+        """Classify each line once as a 'date', 'location' or 'title' candidate"""
+        classified = []
+        for line in lines:
+            line = line.strip()
+            if DATE_KEYWORD_PATTERN.search(line.lower()):
+                kind = 'date'
+            elif len(line) > 5 and len(line.split()) > 1:
+                kind = 'location'  # Multi-word line: plausible venue/location
+            else:
+                kind = 'title'
+            classified.append((line, kind))
+        return classified
+    
     @staticmethod
     def extract_date_from_text(text: str) -> Optional[str]:
         """Extract date information from text"""
-        date_keywords = [
-            'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
-            'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-            'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
-            'today', 'tomorrow', 'tonight'
-        ]
-        
-        text_lower = text.lower()
-        for keyword in date_keywords:
-            if keyword in text_lower:
-                return keyword.title()
-        
-        return None
+        keyword = TextParser.match_date_keyword(text)
+        return keyword.title() if keyword else None
     
     @staticmethod
     def extract_urgency_from_text(text: str) -> Optional[str]:
-        """Extract urgency information from text"""
-        text_lower = text.lower()
+        """Extract urgency information from text ('Today', 'Tomorrow' or 'This Week')"""
+        match = URGENCY_PATTERN.search(text.lower())
+        if not match:
+            return None
         
-        if 'tonight' in text_lower or 'today' in text_lower:
+        today, tomorrow, _ = match.groups()
+        if today:
             return 'Today'
-        elif 'tomorrow' in text_lower:
+        if tomorrow:
             return 'Tomorrow'
-        
-        return None
+        return 'This Week'
     
     @staticmethod
     def clean_title(title: str, max_length: int = 120) -> str:
@@ -272,25 +402,17 @@ class TextParser:
         event_location = ""
         
         if len(lines) >= 2:
-            potential_date = lines[0].strip()
-            # Check for date patterns
-            if any(word in potential_date.lower() for word in [
-                'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
-                'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
-                'today', 'tomorrow', 'tonight'
-            ]):
-                event_date = potential_date
-                event_title = lines[1].strip() if len(lines) > 1 else ""
-                event_location = lines[2].strip() if len(lines) > 2 else ""
+            classified = TextParser.classify_lines(lines[:3])
+            if classified[0][1] == 'date':
+                event_date = classified[0][0]
+                event_title = classified[1][0]
+                event_location = classified[2][0] if len(classified) > 2 else ""
             else:
-                event_title = potential_date
+                event_title = classified[0][0]
                 # Check if second line contains date
-                if len(lines) > 1:
-                    second_line = lines[1].strip().lower()
-                    if any(word in second_line for word in ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']):
-                        event_date = lines[1].strip()
-                        event_location = lines[2].strip() if len(lines) > 2 else ""
+                if classified[1][1] == 'date':
+                    event_date = classified[1][0]
+                    event_location = classified[2][0] if len(classified) > 2 else ""
         
         return event_title, event_date, event_location
 
@@ -335,7 +457,16 @@ class EventConverter:
             location=event_dict.get('Location'),
             city_match=event_dict.get('City_Match', False),
             source_approach=event_dict.get('Source_Approach', 1),
-            urgency=event_dict.get('Urgency')
+            urgency=event_dict.get('Urgency'),
+            event_id=EventDeduplicator.event_id(event_dict),
+            start_time=event_dict.get('Start'),
+            end_time=event_dict.get('End'),
+            venue=event_dict.get('Venue'),
+            address=event_dict.get('Address'),
+            organizer=event_dict.get('Organizer'),
+            start_timestamp=event_dict.get('Start_Timestamp'),
+            end_timestamp=event_dict.get('End_Timestamp'),
+            duplicate_of=event_dict.get('Duplicate_Of')
         )
     
     @staticmethod
@@ -343,12 +474,38 @@ class EventConverter:
         """Convert list of Event objects to list of dictionaries"""
         return [event.to_dict() if isinstance(event, Event) else event for event in events]
 
+class AdaptiveTimeout:
+    """Timeout learned from recently observed load latencies"""
+    
+    def __init__(self, minimum: float, maximum: float, history: int = 10, factor: float = 2.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.latencies = deque(maxlen=history)
+    
+    def record(self, seconds: float) -> None:
+        """Record how long a successful load took"""
+        self.latencies.append(seconds)
+    
+    def current(self) -> float:
+        """Timeout to use for the next wait (starts at the maximum until samples exist)"""
+        if not self.latencies:
+            return self.maximum
+        
+        ordered = sorted(self.latencies)
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        return max(self.minimum, min(self.maximum, p90 * self.factor))
+
 class ConfigManager:
     """Manages configuration and constants"""
     
     # Selenium ports to try
     DEFAULT_SELENIUM_PORTS = [30479, 30444, 4444]
     
+    # Selenium endpoint probing
+    SELENIUM_PROBE_TIMEOUT = 1.5  # Seconds per /status probe, all ports probed at once
+    SELENIUM_ENDPOINT_CACHE = ".selenium_endpoint.json"  # Last known-good port
+    
     # Timeout settings
     DEFAULT_TIMEOUT = 10
     ELEMENT_WAIT_TIMEOUT = 5
@@ -356,17 +513,133 @@ class ConfigManager:
     
     # Enhanced scrolling settings
     MAX_SCROLLS = 20
-    SCROLL_PAUSE_TIME = 5  # 5 seconds as requested
+    SCROLL_PAUSE_TIME = 5  # Fallback fixed wait when the in-page watcher is unavailable
+    SCROLL_MIN_WAIT = 1.5  # Lower bound for the adaptive per-scroll timeout
+    SCROLL_MAX_WAIT = 8  # Upper bound for the adaptive per-scroll timeout
+    SCROLL_QUIET_PERIOD = 0.4  # Seconds without new anchors before a batch counts as loaded
     STABLE_SCROLL_COUNT = 3
     ADVANCED_LOADING_ATTEMPTS = 4
     
+    # "Load more" controls to skip (texts are in LOAD_MORE_TEXTS below), matched case-insensitively
+    LOAD_MORE_SKIP_PHRASES = ["see more on facebook", "view on facebook", "go to facebook"]
+    
+    # Login state machine
+    AUTH_STATE_TIMEOUT = 15  # Max seconds to wait for the page to leave a state
+    AUTH_POLL_INITIAL = 0.2  # First poll delay, doubled up to AUTH_POLL_MAX
+    AUTH_POLL_MAX = 2.0
+    AUTH_MAX_STEPS = 12
+    AUTH_MAX_STATE_VISITS = {'login_form': 1, 'cookie_consent': 2, 'device_approval': 2, 'method_selection': 2,
+                             'code_entry': 2, 'legacy_code': 2, 'trust_device': 2}
+    
+    # 1Password item cache (seconds before cached secrets are dropped and refetched)
+    OP_CACHE_TTL = 300
+    
+    # Persistent session store
+    SESSION_STORE_DIR = ".sessions"
+    SESSION_MAX_AGE_DAYS = 30
+    SESSION_KEY_ENV = "FB_SCRAPER_SESSION_KEY"  # Fernet key; otherwise a key file beside the sessions (obfuscation only)
+    
+    # Resource blocking over CDP (Network.setBlockedURLs wildcard patterns)
+    BLOCK_RESOURCES = True
+    BLOCKED_URL_PATTERNS = [
+        # Images and video served from Facebook's content CDN, plus generic image/media/font files
+        "*scontent*.fbcdn.net/*", "*video*.fbcdn.net/*",
+        "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+        "*.mp4*", "*.webm*", "*.m3u8*", "*.mpd*",
+        "*.woff*", "*.ttf*", "*.otf*",
+        # Third-party analytics and ads
+        "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*", "*connect.facebook.net/*"
+    ]
+    # Typical transfer size per blocked resource type, used to estimate bytes saved
+    BLOCKED_BYTES_ESTIMATE = {'Image': 40 * 1024, 'Media': 512 * 1024, 'Font': 30 * 1024,
+                              'Script': 60 * 1024, 'Other': 10 * 1024}
+    
+    # Event extraction from captured GraphQL responses (DOM extraction is the fallback)
+    NETWORK_EXTRACTION = True
+    GRAPHQL_URL_FRAGMENT = "/api/graphql"
+    NETWORK_BUFFER_BYTES = 64 * 1024 * 1024  # Chrome-side buffer for response bodies
+    NETWORK_RESOURCE_BUFFER_BYTES = 8 * 1024 * 1024
+    
+    # Debug screenshots: off | failure | sampled | always
+    SCREENSHOT_POLICY = "failure"
+    SCREENSHOT_POLICY_ENV = "FB_SCRAPER_SCREENSHOTS"
+    SCREENSHOT_SAMPLE_RATE = 0.1  # Fraction of debug screenshots kept by the sampled policy
+    SCREENSHOT_DIR = "screenshots"
+    SCREENSHOT_MAX_DIR_BYTES = 50 * 1024 * 1024  # Oldest screenshots are evicted above this
+    SCREENSHOT_QUEUE_SIZE = 8  # Pending writes; further captures are dropped
+    SCREENSHOT_JPEG_QUALITY = 70
+    SCREENSHOT_FLUSH_TIMEOUT = 10  # Seconds quit() waits for pending writes
+    
+    # Phase tracing (Chrome trace JSON per run, optional cProfile stats per phase)
+    TRACE_DIR = "traces"
+    TRACE_PROFILE_ENV = "FB_SCRAPER_PROFILE"  # Set to 1 to profile every run
+    
+    # Incremental SQLite event history (JSON files are exported from it)
+    EVENT_STORE_PATH = "facebook_events.db"
+    
+    # Strategy ranking (historical winners first, see strategy_ranker.py)
+    STRATEGY_CACHE_PATH = ".strategy_ranking.json"
+    STRATEGY_DEFAULT_TIMEOUT = 2  # Wait per selector when it has no history
+    STRATEGY_MIN_TIMEOUT = 0.5  # Lower bound for the short timeout given to historical winners
+    STRATEGY_TIMEOUT_FACTOR = 3  # Short timeout = factor x average successful latency
+    STRATEGY_LATENCY_WINDOW = 20  # Successful attempts averaged into the latency estimate
+    
+    # Cookie consent buttons, tried after matching button texts
+    COOKIE_CONSENT_SELECTORS = [
+        "button[data-cookiebanner*='accept']",
+        "button[data-testid*='accept']",
+        "button[data-testid*='cookie']",
+        "div[data-testid*='cookie'] button",
+        "div[role='dialog'] button[type='submit']",
+        "[aria-label*='cookie'] button",
+        "button[style*='rgb(24, 119, 242)']",
+        "button[style*='#1877f2']",
+        "div[role='dialog'] button:last-child",
+        "div[role='dialog'] button[class*='primary']",
+        "button[class*='_42ft']",
+        "button[class*='_4jy0']",
+    ]
+    
+    # Date parsing: event times are interpreted in this timezone, relative to the scrape time
+    EVENT_TIMEZONE = "Europe/Bucharest"
+    PYTHON_DATE_FILTER = True  # Filter 'This week' by parsed timestamps instead of clicking the filter UI
+    
+    # Detail page enrichment in extra tabs of the logged-in session
+    ENRICH_EVENTS = True
+    ENRICHMENT_MAX_TABS = 2  # Each tab is another renderer; the Chrome pod is limited to 1Gi and 500m CPU
+    ENRICHMENT_MAX_EVENTS = 40  # Detail pages fetched per city; cached events do not count
+    ENRICHMENT_PAGE_TIMEOUT = 20  # Seconds before a detail page counts as failed
+    ENRICHMENT_POLL_INTERVAL = 0.5
+    ENRICHMENT_CACHE_PATH = ".event_details.json"
+    ENRICHMENT_CACHE_TTL = 24 * 3600  # Seconds before an event's details are fetched again
+    
+    # Near-duplicate detection (MinHash/LSH) across runs and cities
+    NEAR_DUPLICATE_DETECTION = True
+    NEAR_DUPLICATE_THRESHOLD = 0.7  # Estimated Jaccard similarity of title/venue trigrams and day
+    NEAR_DUPLICATE_HISTORY_DAYS = 180  # Events not seen for this long are dropped from the index
+    NEAR_DUPLICATE_INDEX_PATH = ".near_duplicates.json"
+    
     # Event extraction limits
-    MAX_EVENTS_TO_PROCESS = 100  # Increased for better coverage
+    MAX_EVENTS_TO_PROCESS = 100  # Only caps per-element fallback; bulk extraction is uncapped
     
     # Text limits
     MAX_TITLE_LENGTH = 120
     MIN_TITLE_LENGTH = 3
     
+    # Encode the 'This week' range in the search URL; the UI click is only a fallback
+    URL_DATE_FILTER = True
+    
+    # Plain HTTP fetch of search pages with the browser's cookies after login (browser is the fallback).
+    # Off by default: mbasic.facebook.com, the lightweight HTML host it was written for, has been retired,
+    # so every city would pay a failed round trip first. Enable it with a base URL that still serves
+    # server-rendered search results (benchmark.py --http-fixture points it at a local stand-in).
+    HTTP_FETCH_MODE = False
+    HTTP_SEARCH_BASE_URL = "https://mbasic.facebook.com/events/search/"
+    HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    HTTP_TIMEOUT = 15
+    HTTP_MAX_REDIRECTS = 5
+    HTTP_MAX_PAGES = 10  # 'See more' pages followed per search
+    
     # Date filter patterns
     THIS_WEEK_PATTERNS = [
         "//input[@type='checkbox'][following-sibling::*[contains(text(), 'This week')] or preceding-sibling::*[contains(text(), 'This week')]]",
@@ -385,12 +658,12 @@ class ConfigManager:
         "//*[contains(text(), 'This week') and (@role='checkbox' or @type='checkbox' or ancestor::label)]"
     ]
     
-    # Enhanced load more button texts
+    # "Load more" texts, substring-matched against every button/div/span text on the results page.
+    # Only result-pagination phrases: "expand" or "continue reading" would open description toggles.
     LOAD_MORE_TEXTS = [
         "see more", "load more", "show more", "more events", 
         "view more", "see all", "show all", "meer weergeven",
-        "load more events", "show more events", "view all events",
-        "continue reading", "expand", "more results"
+        "load more events", "show more events", "view all events"
     ]
     
     # Browser optimization flags
@@ -400,8 +673,6 @@ class ConfigManager:
         "--disable-dev-shm-usage",
         "--disable-gpu",
         "--disable-extensions",
-        "--disable-plugins",
-        "--disable-images",  # Speed up by not loading images
         "--disable-background-timer-throttling",
         "--disable-backgrounding-occluded-windows",
         "--disable-renderer-backgrounding"